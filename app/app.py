@@ -1,10 +1,82 @@
 import os
 import asyncio
-from flask import Flask, render_template
-from services.database import get_db_connection, fetch_all_challenger_players
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, render_template, request, jsonify, abort
+from services.database import (
+    fetch_challenger_players_page, fetch_cache_generation,
+    DB_POOL_SIZE, LEADERBOARD_CACHE, PARTICIPANTS_CACHE,
+)
+from services.cache import GenerationCache
+from services.stats import fetch_meta_aggregates, STAT_KINDS, DEFAULT_MIN_PLAY_COUNT
+from services.regions import PLATFORM_REGIONS, DEFAULT_PLATFORM
+from services.player import player_profiles
+from services.metrics import metrics
+from services.logs import configure_logging
 
 app = Flask(__name__)
 
+# 블로킹 DB 호출을 실행할 스레드 풀. 연결 풀 크기만큼만 동시에 실행합니다.
+db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix='db')
+
+async def run_db(func, *args):
+    """
+    블로킹 DB 함수를 db_executor에서 실행하고, 끝날 때까지 이벤트 루프를 막지 않고 기다립니다.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, func, *args)
+
+LEADERBOARD_PAGE_SIZE = 50
+LEADERBOARD_MAX_PAGE_SIZE = 200
+
+def parse_leaderboard_cursor(cursor: str):
+    """
+    "순위:LP:puuid" 형태의 커서를 (rank, league_points, puuid)로 변환합니다. 없으면 첫 페이지입니다.
+    """
+    if not cursor:
+        return 0, None, None
+    try:
+        rank, league_points, puuid = cursor.split(':', 2)
+        return int(rank), int(league_points), puuid
+    except ValueError:
+        abort(400, description="invalid cursor")
+
+def parse_leaderboard_limit(limit: str):
+    try:
+        limit = int(limit) if limit else LEADERBOARD_PAGE_SIZE
+    except ValueError:
+        abort(400, description="invalid limit")
+    return max(1, min(limit, LEADERBOARD_MAX_PAGE_SIZE))
+
+def parse_platform(platform: str):
+    platform = (platform or DEFAULT_PLATFORM).lower()
+    if platform not in PLATFORM_REGIONS:
+        abort(404)
+    return platform
+
+def load_leaderboard_page(platform: str, rank: int, league_points: int, puuid: str, limit: int):
+    """
+    해당 서버에서 커서 다음의 플레이어 limit명과 다음 페이지 커서를 반환합니다. DB 오류면 None.
+    """
+    players = fetch_challenger_players_page(limit + 1, league_points, puuid, platform)
+    if players is None:
+        return None
+    has_more = len(players) > limit
+    players = players[:limit]
+    for i, player in enumerate(players):
+        player['rank'] = rank + i + 1
+
+    next_cursor = None
+    if has_more:
+        last = players[-1]
+        next_cursor = f"{rank + len(players)}:{last['league_points']}:{last['puuid']}"
+    return {'players': players, 'next_cursor': next_cursor}
+
+# 챌린저 리더보드 페이지 캐시: 수집기가 플레이어를 저장하면 세대 번호가 바뀌어 다시 읽습니다.
+leaderboard_cache = GenerationCache(
+    load_leaderboard_page,
+    lambda: fetch_cache_generation(LEADERBOARD_CACHE),
+)
+
 @app.route('/')
 async def main():
     return render_template('test.html')
@@ -14,19 +86,107 @@ async def index():
     """
     메인 페이지를 렌더링하고 챌린저 플레이어 목록을 표시합니다.
     """    
-    # 모든 챌린저 플레이어 데이터를 가져옵니다.
-    players = await fetch_all_challenger_players_async()
+    platform = parse_platform(request.args.get('platform'))
+    cursor = parse_leaderboard_cursor(request.args.get('cursor'))
+    limit = parse_leaderboard_limit(request.args.get('limit'))
+
+    # 캐시된 챌린저 플레이어 페이지를 가져옵니다. (만료 시에만 DB 조회)
+    entry = await run_db(leaderboard_cache.get_entry, platform, *cursor, limit)
+    if entry is None:
+        abort(503, description="database unavailable")
     
-    # index.html 템플릿에 데이터를 전달하여 렌더링합니다.
-    return render_template('test_rank.html', players=players)
+    # 같은 세대의 데이터는 렌더링된 HTML을 재사용합니다.
+    return entry.render('test_rank', lambda page: render_template(
+        'test_rank.html', players=page['players'], next_cursor=page['next_cursor'], limit=limit, platform=platform,
+    ))
+
+@app.route('/api/leaderboard')
+async def leaderboard_api():
+    """
+    챌린저 리더보드를 JSON으로 반환합니다. next_cursor를 cursor로 넘기면 다음 페이지를 받습니다.
+    """
+    platform = parse_platform(request.args.get('platform'))
+    cursor = parse_leaderboard_cursor(request.args.get('cursor'))
+    limit = parse_leaderboard_limit(request.args.get('limit'))
+    entry = await run_db(leaderboard_cache.get_entry, platform, *cursor, limit)
+    if entry is None:
+        abort(503, description="database unavailable")
+    return jsonify(entry.value)
 
-async def fetch_all_challenger_players_async():
-    return fetch_all_challenger_players()
+# 메타 통계 캐시: 미리 집계된 테이블에서 읽고, 새 매치 참가자가 저장되면 다시 읽습니다.
+meta_stats_cache = GenerationCache(
+    fetch_meta_aggregates,
+    lambda: fetch_cache_generation(PARTICIPANTS_CACHE),
+)
+
+def parse_meta_filters():
+    """
+    game_version, set, min_count 쿼리 파라미터를 fetch_meta_aggregates 인자로 변환합니다.
+    """
+    try:
+        tft_set_number = int(request.args['set']) if request.args.get('set') else None
+        min_play_count = int(request.args.get('min_count', DEFAULT_MIN_PLAY_COUNT))
+    except ValueError:
+        abort(400, description="invalid set or min_count")
+    return request.args.get('game_version') or None, tft_set_number, min_play_count
+
+@app.route('/meta')
+async def meta():
+    """
+    유닛 / 특성 / 아이템 / 유닛+아이템 / 특성 조합(comp)별 평균 등수, top 4 비율, 픽률을 표시합니다.
+    """
+    kind = request.args.get('kind', 'units')
+    if kind not in STAT_KINDS:
+        abort(404)
+    filters = parse_meta_filters()
+    stats = await run_db(meta_stats_cache.get, *filters)
+    if stats is None:
+        abort(503, description="database unavailable")
+    return render_template('meta.html', stats=stats[kind], kind=kind, kinds=STAT_KINDS, total_boards=stats['total_boards'])
+
+@app.route('/api/meta')
+async def meta_api():
+    filters = parse_meta_filters()
+    stats = await run_db(meta_stats_cache.get, *filters)
+    if stats is None:
+        abort(503, description="database unavailable")
+    return jsonify(stats)
+
+@app.route('/player/<game_name>/<tag_line>')
+async def player(game_name, tag_line):
+    """
+    Riot ID로 플레이어를 찾아 최근 매치 기록을 표시합니다.
+    DB에 저장된 매치는 그대로 사용하고, 없는 매치만 API로 가져옵니다.
+    """
+    platform = parse_platform(request.args.get('platform'))
+    profile = await player_profiles.get(game_name, tag_line, platform)
+    if profile is None:
+        abort(404)
+    return render_template('player.html', **profile)
+
+@app.route('/api/player/<game_name>/<tag_line>')
+async def player_api(game_name, tag_line):
+    platform = parse_platform(request.args.get('platform'))
+    profile = await player_profiles.get(game_name, tag_line, platform)
+    if profile is None:
+        abort(404)
+    return jsonify(profile)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Riot API 요청 수 / 지연 시간 / 429, rate limit 여유분, DB 배치 시간 등의 지표를
+    Prometheus 텍스트 형식으로 반환합니다. ?format=json이면 백분위수를 포함한 JSON 스냅샷을 반환합니다.
+    """
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.snapshot())
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 
 if __name__ == '__main__':
     # Windows에서 asyncio 오류 방지
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        
+
+    configure_logging()
     app.run(debug=True) # 개발 모드 실행
\ No newline at end of file
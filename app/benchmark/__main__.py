@@ -0,0 +1,180 @@
+# tft/app/benchmark/__main__.py
+"""
+실제 API 키 없이 수집기 성능을 측정하는 벤치마크.
+
+    python -m app.benchmark --players 300 --latency-ms 30 --throttle-rate 0.01 --error-rate 0.01
+
+로컬 목 Riot API 서버를 별도 프로세스로 띄우고, 수집기의 DB 함수를 SQLite 저장소로 바꾼 뒤
+collect_challenger_* 단계(또는 전체 파이프라인)를 실행해 처리량, API 지연 백분위수, 최대 메모리를 출력합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing
+
+from .mock_riot import MockConfig, serve_forever
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없습니다.
+    resource = None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.benchmark', description='Offline collector benchmark')
+    parser.add_argument('--mode', choices=('pipeline', 'stages'), default='pipeline',
+                        help='pipeline: collect_challenger_pipeline, stages: collect_challenger_* 단계를 차례로 실행')
+    parser.add_argument('--players', type=int, default=300, help='티어별 리그 인원')
+    parser.add_argument('--match-count', type=int, default=10, help='플레이어별 조회할 매치 수')
+    parser.add_argument('--latency-ms', type=float, default=30.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--app-rate-limit', default='500:1,30000:600')
+    parser.add_argument('--method-rate-limit', default='300:1')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='무작위 503 비율')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='무작위 429 비율')
+    parser.add_argument('--max-in-flight', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=100, help='DB 쓰기 배치 크기 (매치 수)')
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--sqlite', default=':memory:', help='SQLite 파일 경로 (기본: 메모리)')
+    parser.add_argument('--tracemalloc', action='store_true', help='Python 할당 기준 최대 메모리도 측정 (느려짐)')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로도 저장')
+    return parser.parse_args(argv)
+
+
+def start_server(config: MockConfig):
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_forever, args=(config, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=30)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+async def run(args, sink, stage_times):
+    from .. import data_collector
+    from ..services.http_client import shared_session
+
+    async with shared_session():
+        if args.mode == 'pipeline':
+            started_at = time.perf_counter()
+            await data_collector.collect_challenger_pipeline(
+                max_in_flight=args.max_in_flight, batch_size=args.batch_size,
+                archive_enabled=False, resume=False, parse_workers=args.parse_workers)
+            stage_times['pipeline'] = time.perf_counter() - started_at
+            return
+
+        started_at = time.perf_counter()
+        summoners = await data_collector.collect_challenger_summoner_names(args.max_in_flight)
+        stage_times['summoner_names'] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        match_ids = await data_collector.collect_challenger_match_id(summoners, args.max_in_flight)
+        stage_times['match_ids'] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        await data_collector.collect_challenger_match_details(
+            match_ids, args.max_in_flight, parse_workers=args.parse_workers)
+        stage_times['match_details'] = time.perf_counter() - started_at
+
+
+def summarize(snapshot: dict, sink, stage_times: dict, elapsed: float, args):
+    requests = sum(sample['value'] for sample in snapshot.get('riot_requests_total', []))
+    statuses = {}
+    for sample in snapshot.get('riot_requests_total', []):
+        status = sample['labels']['status']
+        statuses[status] = statuses.get(status, 0) + sample['value']
+    matches = sink.count('challenger_match_details')
+    return {
+        'mode': args.mode,
+        'elapsed_seconds': round(elapsed, 3),
+        'stage_seconds': {name: round(seconds, 3) for name, seconds in stage_times.items()},
+        'matches_saved': matches,
+        'participants_saved': sink.count('challenger_match_participants'),
+        'matches_per_second': round(matches / elapsed, 2) if elapsed else None,
+        'requests': requests,
+        'requests_per_second': round(requests / elapsed, 2) if elapsed else None,
+        'responses_by_status': statuses,
+        'latency': {
+            sample['labels']['method']: {
+                'count': sample['count'],
+                'p50_ms': round(sample['p50'] * 1000, 1) if sample['p50'] is not None else None,
+                'p99_ms': round(sample['p99'] * 1000, 1) if sample['p99'] is not None else None,
+            }
+            for sample in snapshot.get('riot_request_seconds', [])
+        },
+        'db_batches': {
+            sample['labels']['label']: {'count': sample['count'], 'p50_ms': round((sample['p50'] or 0) * 1000, 2),
+                                        'p99_ms': round((sample['p99'] or 0) * 1000, 2)}
+            for sample in snapshot.get('db_batch_seconds', [])
+        },
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = MockConfig(
+        players_per_tier=args.players, match_count=args.match_count,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        app_rate_limit=args.app_rate_limit, method_rate_limit=args.method_rate_limit,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+    )
+    server, port = start_server(config)
+
+    # 수집기 모듈은 import 시점에 환경 변수를 읽으므로 설정을 먼저 한 뒤 가져옵니다.
+    os.environ['RIOT_API_URL'] = f"http://127.0.0.1:{port}/{{host}}"
+    os.environ.setdefault('RIOT_API_KEY', 'benchmark')
+    os.environ['RIOT_APP_RATE_LIMIT'] = args.app_rate_limit
+    os.environ['COLLECTOR_MATCH_COUNT'] = str(args.match_count)
+    # 작업 상태 / 지표 파일이 실제 수집 데이터와 섞이지 않도록 임시 폴더에서 실행합니다.
+    workdir = tempfile.mkdtemp(prefix='tft-bench-')
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    os.chdir(workdir)
+
+    from .. import data_collector
+    from ..services import account_cache
+    from ..services.logs import configure_logging
+    from ..services.metrics import metrics
+    from .sqlite_sink import SqliteSink
+
+    configure_logging(level=os.getenv('LOG_LEVEL', 'WARNING'))
+    sink = SqliteSink(args.sqlite)
+    sink.install(data_collector, account_cache)
+    sink.ensure_schema()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    stage_times = {}
+    started_at = time.perf_counter()
+    try:
+        asyncio.run(run(args, sink, stage_times))
+    finally:
+        server.terminate()
+    elapsed = time.perf_counter() - started_at
+
+    result = summarize(metrics.snapshot(), sink, stage_times, elapsed, args)
+    if args.tracemalloc:
+        result['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+# tft/app/benchmark/mock_riot.py
+
+import json
+import time
+import random
+import asyncio
+import hashlib
+from collections import deque
+from dataclasses import dataclass
+
+from aiohttp import web
+
+# 목 매치 상세에 사용할 이름들
+TRAIT_NAMES = [f"TFT13_Trait{i}" for i in range(28)]
+UNIT_NAMES = [f"TFT13_Unit{i}" for i in range(60)]
+ITEM_NAMES = [f"TFT_Item_{i}" for i in range(45)]
+
+
+@dataclass
+class MockConfig:
+    """
+    목 Riot API 서버 설정.
+    - latency_ms / jitter_ms: 응답 지연 (평균, 균등 분포 폭)
+    - app_rate_limit: 응답 헤더로 알려주고 실제로도 적용하는 호스트별 앱 한도
+    - method_rate_limit: 메서드별 한도 (헤더 + 적용)
+    - error_rate: 무작위 503 비율, throttle_rate: 무작위 429 비율 (한도와 별개로 주입)
+    """
+    players_per_tier: int = 300
+    match_count: int = 10
+    players_per_match: int = 8
+    latency_ms: float = 30.0
+    jitter_ms: float = 10.0
+    app_rate_limit: str = '500:1,30000:600'
+    method_rate_limit: str = '300:1'
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+
+
+class _Windows:
+    """
+    "limit:seconds,..." 한도를 슬라이딩 로그로 적용하고 사용량 헤더 값을 만듭니다.
+    """
+
+    def __init__(self, spec: str):
+        self.windows = []
+        for part in spec.split(','):
+            limit, seconds = part.split(':')
+            self.windows.append((int(limit), int(seconds), deque()))
+
+    def hit(self, now: float):
+        # 한도를 넘으면 False. 넘지 않으면 기록하고 True.
+        for limit, seconds, log in self.windows:
+            while log and log[0] <= now - seconds:
+                log.popleft()
+            if len(log) >= limit:
+                return False
+        for _, _, log in self.windows:
+            log.append(now)
+        return True
+
+    def counts(self):
+        return ','.join(f"{len(log)}:{seconds}" for _, seconds, log in self.windows)
+
+
+class MockRiotServer:
+    """
+    리그 / 계정 / 매치 ID / 매치 상세 엔드포인트를 흉내 내는 aiohttp 서버.
+    경로는 /{host}/tft/... 형식이며 RIOT_API_URL="http://127.0.0.1:<port>/{host}"로 연결합니다.
+    데이터는 seed로 결정되므로 같은 설정이면 실행마다 같은 응답을 돌려줍니다.
+    """
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.app_windows = {}
+        self.method_windows = {}
+        self.match_bodies = {}
+        # 플레이어 수 * 조회 개수 / 매치당 인원 만큼의 매치를 만들어 플레이어끼리 매치가 겹치게 합니다.
+        self.match_pool_size = max(1, config.players_per_tier * config.match_count // config.players_per_match)
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/{host}/tft/league/v1/{tier}', self.league)
+        app.router.add_get('/{host}/riot/account/v1/accounts/by-puuid/{puuid}', self.account)
+        app.router.add_get('/{host}/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}', self.riot_id)
+        app.router.add_get('/{host}/tft/match/v1/matches/by-puuid/{puuid}/ids', self.match_ids)
+        app.router.add_get('/{host}/tft/match/v1/matches/{match_id}', self.match_detail)
+        return app
+
+    async def _respond(self, request, method: str, payload):
+        """
+        지연 / 한도 / 오류 주입을 거친 뒤 JSON 응답을 보냅니다. payload는 bytes 또는 호출 가능한 객체입니다.
+        """
+        config = self.config
+        host = request.match_info['host']
+        await asyncio.sleep(max(0.0, config.latency_ms + self.random.uniform(-config.jitter_ms, config.jitter_ms)) / 1000)
+
+        now = time.monotonic()
+        app_windows = self.app_windows.setdefault(host, _Windows(config.app_rate_limit))
+        method_windows = self.method_windows.setdefault((host, method), _Windows(config.method_rate_limit))
+        headers = {
+            'X-App-Rate-Limit': config.app_rate_limit,
+            'X-Method-Rate-Limit': config.method_rate_limit,
+        }
+        if not app_windows.hit(now):
+            limit_type = 'application'
+        elif not method_windows.hit(now):
+            limit_type = 'method'
+        elif self.random.random() < config.throttle_rate:
+            limit_type = 'service'
+        else:
+            limit_type = None
+        headers['X-App-Rate-Limit-Count'] = app_windows.counts()
+        headers['X-Method-Rate-Limit-Count'] = method_windows.counts()
+
+        if limit_type is not None:
+            headers.update({'Retry-After': str(config.retry_after), 'X-Rate-Limit-Type': limit_type})
+            return web.json_response({'status': {'status_code': 429}}, status=429, headers=headers)
+        if self.random.random() < config.error_rate:
+            return web.json_response({'status': {'status_code': 503}}, status=503, headers=headers)
+
+        body = payload() if callable(payload) else payload
+        return web.Response(body=body, content_type='application/json', headers=headers)
+
+    @staticmethod
+    def _puuid(host: str, tier: str, index: int):
+        return hashlib.sha1(f"{host}:{tier}:{index}".encode()).hexdigest() * 2
+
+    async def league(self, request):
+        host = request.match_info['host']
+        tier = request.match_info['tier']
+        rng = random.Random(f"{self.config.seed}:{host}:{tier}")
+
+        def payload():
+            entries = [
+                {'puuid': self._puuid(host, tier, i), 'leaguePoints': rng.randint(0, 2000),
+                 'wins': rng.randint(10, 300), 'losses': rng.randint(10, 300)}
+                for i in range(self.config.players_per_tier)
+            ]
+            return json.dumps({'tier': tier.upper(), 'entries': entries}).encode()
+
+        return await self._respond(request, f'league-v1.{tier}', payload)
+
+    async def account(self, request):
+        puuid = request.match_info['puuid']
+        return await self._respond(request, 'account-v1.getByPuuid', lambda: json.dumps(
+            {'puuid': puuid, 'gameName': f"bench{puuid[:8]}", 'tagLine': 'KR1'}).encode())
+
+    async def riot_id(self, request):
+        game_name = request.match_info['game_name']
+        return await self._respond(request, 'account-v1.getByRiotId', lambda: json.dumps(
+            {'puuid': hashlib.sha1(game_name.encode()).hexdigest() * 2, 'gameName': game_name,
+             'tagLine': request.match_info['tag_line']}).encode())
+
+    async def match_ids(self, request):
+        puuid = request.match_info['puuid']
+        count = int(request.query.get('count', self.config.match_count))
+        rng = random.Random(f"{self.config.seed}:{puuid}")
+        platform = 'KR' if request.match_info['host'] == 'asia' else request.match_info['host'].upper()
+        ids = [f"{platform}_{7000000000 + i}" for i in rng.sample(range(self.match_pool_size), min(count, self.match_pool_size))]
+        return await self._respond(request, 'match-v1.getMatchIdsByPUUID', lambda: json.dumps(ids).encode())
+
+    def _match_body(self, match_id: str):
+        body = self.match_bodies.get(match_id)
+        if body is None:
+            body = self.match_bodies[match_id] = json.dumps(synthesize_match(match_id, self.config)).encode()
+        return body
+
+    async def match_detail(self, request):
+        match_id = request.match_info['match_id']
+        return await self._respond(request, 'match-v1.getMatch', lambda: self._match_body(match_id))
+
+
+def synthesize_match(match_id: str, config: MockConfig):
+    """
+    실제 응답과 같은 구조의 매치 상세를 만듭니다. (참가자마다 특성 ~9개, 유닛 ~9개, 아이템 0~3개)
+    """
+    rng = random.Random(f"{config.seed}:{match_id}")
+    participants = []
+    for placement in range(1, config.players_per_match + 1):
+        participants.append({
+            'puuid': hashlib.sha1(f"{match_id}:{placement}".encode()).hexdigest() * 2,
+            'placement': placement,
+            'level': rng.randint(6, 10),
+            'gold_left': rng.randint(0, 60),
+            'last_round': rng.randint(20, 40),
+            'players_eliminated': rng.randint(0, 3),
+            'total_damage_to_players': rng.randint(0, 200),
+            'traits': [
+                {'name': name, 'num_units': rng.randint(1, 6), 'style': rng.randint(0, 4),
+                 'tier_current': rng.randint(0, 3), 'tier_total': 4}
+                for name in rng.sample(TRAIT_NAMES, rng.randint(6, 12))
+            ],
+            'units': [
+                {'character_id': name, 'itemNames': rng.sample(ITEM_NAMES, rng.randint(0, 3)),
+                 'name': '', 'rarity': rng.randint(0, 6), 'tier': rng.randint(1, 3)}
+                for name in rng.sample(UNIT_NAMES, rng.randint(7, 10))
+            ],
+        })
+    return {
+        'metadata': {'match_id': match_id, 'participants': [p['puuid'] for p in participants]},
+        'info': {
+            'game_datetime': 1730000000000 + int(match_id.rsplit('_', 1)[-1]) % 10000000 * 1000,
+            'game_length': rng.uniform(1500, 2300),
+            'game_version': 'Version 14.23.636.7002 (Nov 22 2024/17:08:39) [PUBLIC] ',
+            'queue_id': 1100,
+            'tft_set_number': 13,
+            'tft_set_core_name': 'TFTSet13',
+            'participants': participants,
+        },
+    }
+
+
+async def start_mock_server(config: MockConfig, host: str = '127.0.0.1', port: int = 0):
+    """
+    서버를 시작하고 (runner, 실제 포트)를 반환합니다. port=0이면 빈 포트를 사용합니다.
+    """
+    runner = web.AppRunner(MockRiotServer(config).app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+def serve_forever(config: MockConfig, ready=None, host: str = '127.0.0.1', port: int = 0):
+    """
+    별도 프로세스에서 실행하는 진입점. 시작되면 ready 큐에 포트를 넣습니다.
+    """
+    async def main():
+        _, actual_port = await start_mock_server(config, host, port)
+        if ready is not None:
+            ready.put(actual_port)
+        else:
+            print(f"Mock Riot API listening on http://{host}:{actual_port}/{{host}}")
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+# tft/app/benchmark/sqlite_sink.py
+
+import time
+import sqlite3
+import threading
+
+from ..services.metrics import DB_BATCH_SECONDS, DB_ROWS_WRITTEN
+from ..services.records import participant_db_row
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS challenger_players (
+        puuid TEXT PRIMARY KEY, summoner_name TEXT, league_points INTEGER, wins INTEGER, losses INTEGER,
+        platform TEXT, tier TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS challenger_match_details (
+        match_id TEXT PRIMARY KEY, game_datetime TEXT, game_length REAL, game_version TEXT,
+        queue_id INTEGER, tft_set_number INTEGER, tft_set_core_name TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS challenger_match_participants (
+        match_id TEXT, puuid TEXT, placement INTEGER, level INTEGER, gold_left INTEGER, last_round INTEGER,
+        players_eliminated INTEGER, total_damage_to_players INTEGER, traits TEXT, units TEXT,
+        PRIMARY KEY (match_id, puuid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+        puuid TEXT PRIMARY KEY, last_match_id TEXT, last_game_datetime TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS riot_accounts (
+        puuid TEXT PRIMARY KEY, game_name TEXT, tag_line TEXT, fetched_at TEXT
+    )
+    """,
+]
+
+
+class SqliteSink:
+    """
+    벤치마크용 저장소. database.py의 수집기 저장 / 조회 함수와 같은 시그니처를 SQLite로 구현해
+    MySQL 없이도 배치 저장 경로(행 변환 + 배치 INSERT + 커밋)의 비용을 포함해 측정할 수 있게 합니다.
+    (정규화 테이블 participant_trait 등은 만들지 않습니다.)
+    """
+
+    def __init__(self, path: str = ':memory:', batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def install(self, *modules):
+        """
+        주어진 모듈(data_collector, account_cache 등)이 가져다 쓰는 DB 함수를 이 저장소의 함수로 바꿉니다.
+        """
+        functions = {
+            'ensure_schema': self.ensure_schema,
+            'save_challenger_players': self.save_challenger_players,
+            'save_match_details_to_db': self.save_match_details_to_db,
+            'save_participant_details_to_db': self.save_participant_details_to_db,
+            'save_matches_to_db': self.save_matches_to_db,
+            'fetch_known_match_ids': self.fetch_known_match_ids,
+            'fetch_crawl_checkpoints': self.fetch_crawl_checkpoints,
+            'save_crawl_checkpoints': self.save_crawl_checkpoints,
+            'fetch_riot_accounts': self.fetch_riot_accounts,
+            'save_riot_accounts': self.save_riot_accounts,
+        }
+        for module in modules:
+            for name, function in functions.items():
+                if hasattr(module, name):
+                    setattr(module, name, function)
+
+    def _insert(self, sql: str, rows, label: str):
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(sql, batch, label)
+                batch = []
+        if batch:
+            written += self._write_batch(sql, batch, label)
+        return written
+
+    def _write_batch(self, sql: str, batch, label: str):
+        started_at = time.perf_counter()
+        with self.lock:
+            self.conn.executemany(sql, batch)
+            self.conn.commit()
+        DB_BATCH_SECONDS.observe(time.perf_counter() - started_at, label)
+        DB_ROWS_WRITTEN.inc(label, amount=len(batch))
+        return len(batch)
+
+    def ensure_schema(self):
+        with self.lock:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+            self.conn.commit()
+        return True
+
+    def save_challenger_players(self, players, batch_size: int = None):
+        rows = (
+            (p.get('puuid'), p.get('summonerName'), p.get('leaguePoints'), p.get('wins'), p.get('losses'),
+             p.get('platform'), p.get('tier'))
+            for p in players
+        )
+        return self._insert("INSERT OR REPLACE INTO challenger_players VALUES (?, ?, ?, ?, ?, ?, ?)", rows, 'player data')
+
+    def save_match_details_to_db(self, match_details, batch_size: int = None):
+        rows = (
+            (m.match_id, m.game_datetime.isoformat(), m.game_length.total_seconds(), m.game_version,
+             m.queue_id, m.tft_set_number, m.tft_set_core_name)
+            for m in match_details
+        )
+        return self._insert("INSERT OR REPLACE INTO challenger_match_details VALUES (?, ?, ?, ?, ?, ?, ?)", rows, 'match details')
+
+    def save_participant_details_to_db(self, participant_details, batch_size: int = None):
+        rows = (participant_db_row(p) for p in participant_details)
+        return self._insert(
+            "INSERT OR REPLACE INTO challenger_match_participants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows, 'participant details')
+
+    def save_matches_to_db(self, match_details, participant_details, batch_size: int = None):
+        # database.save_matches_to_db와 같이 참가자를 먼저, 매치를 마지막에 저장합니다. (정규화 / 집계 테이블은 없음)
+        match_details = list(match_details)
+        participant_details = list(participant_details)
+        if self.save_participant_details_to_db(participant_details) != len(participant_details):
+            return 0
+        written = self.save_match_details_to_db(match_details)
+        return written if written == len(match_details) else 0
+
+    def fetch_known_match_ids(self, match_ids=None):
+        with self.lock:
+            known = {row[0] for row in self.conn.execute("SELECT match_id FROM challenger_match_details")}
+        return known if match_ids is None else known & set(match_ids)
+
+    def fetch_crawl_checkpoints(self):
+        return {}
+
+    def save_crawl_checkpoints(self, checkpoints: dict, batch_size: int = None):
+        rows = ((puuid, c['last_match_id'], c['last_game_datetime'].isoformat()) for puuid, c in checkpoints.items())
+        return self._insert("INSERT OR REPLACE INTO crawl_checkpoints VALUES (?, ?, ?)", rows, 'crawl checkpoints')
+
+    def fetch_riot_accounts(self, puuids):
+        # 벤치마크는 매번 Account API 경로까지 측정하도록 저장된 계정을 돌려주지 않습니다.
+        return {}
+
+    def save_riot_accounts(self, accounts, batch_size: int = None):
+        rows = ((a['puuid'], a.get('gameName', ''), a.get('tagLine', ''), a['fetched_at'].isoformat()) for a in accounts)
+        return self._insert("INSERT OR REPLACE INTO riot_accounts VALUES (?, ?, ?, ?)", rows, 'riot accounts')
+
+    def count(self, table: str) -> int:
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
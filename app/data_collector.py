@@ -1,184 +1,923 @@
 # tft/app/data_collector.py
 
 import os
+import time
+import heapq
 import asyncio
+import logging
 import aiohttp
 import datetime
 import sys # sys 모듈 임포트
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 
-from .services.database import save_challenger_player, save_match_details_to_db, save_participant_details_to_db
-from .services.riot_api import fetch_challenger_data, fetch_account_info_by_puuid, fetch_summoner_details_by_puuid, fetch_match_ids, fetch_match_detail
+from .services.database import (
+    ensure_schema, save_challenger_players, save_matches_to_db,
+    fetch_known_match_ids, fetch_crawl_checkpoints, save_crawl_checkpoints, rebuild_meta_aggregates,
+)
+from .services.http_client import shared_session
+from .services.account_cache import account_cache
+from .services.job_state import CrawlJobState, JOB_FLUSH_INTERVAL
+from .services.archive import MatchArchiveWriter, iter_archived_matches, recover_partial_segments, partition_for, ARCHIVE_ENABLED, ARCHIVE_DIR
+from .services.logs import configure_logging
+from .services.metrics import metrics, MetricsDumper, QUEUE_DEPTH, COLLECTOR_ITEMS, METRICS_DUMP_INTERVAL
+from .services.match_parser import parse_match_detail, decode_match_batch, PARSE_BATCH_SIZE
+from .services.regions import DEFAULT_PLATFORM, DEFAULT_TIER, TIERS, region_of, account_region_of, platform_of_match, parse_list_env
+from .services.riot_api import fetch_league_data, fetch_account_info_by_puuid, fetch_summoner_details_by_puuid, fetch_match_ids, fetch_match_detail_raw
 
 load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 호스트(kr, asia 등)별로 동시에 진행 중인 API 요청 수 상한 (전체 단계 합산)
+MAX_IN_FLIGHT = int(os.getenv('COLLECTOR_MAX_IN_FLIGHT', 20))
+# 수집할 서버와 티어 (예: COLLECTOR_PLATFORMS=kr,jp1,na1,euw1 COLLECTOR_TIERS=challenger,grandmaster,master)
+COLLECTOR_PLATFORMS = parse_list_env('COLLECTOR_PLATFORMS', DEFAULT_PLATFORM)
+COLLECTOR_TIERS = parse_list_env('COLLECTOR_TIERS', DEFAULT_TIER)
+# 플레이어마다 조회할 최근 매치 ID 수
+MATCH_ID_COUNT = int(os.getenv('COLLECTOR_MATCH_COUNT', 10))
+# 단계 사이 큐의 최대 길이 (가득 차면 앞 단계가 대기 -> 메모리 상한)
+QUEUE_MAXSIZE = int(os.getenv('COLLECTOR_QUEUE_MAXSIZE', 200))
+# 한 번에 DB에 저장할 매치 수
+DB_WRITE_BATCH = int(os.getenv('COLLECTOR_DB_WRITE_BATCH', 100))
+# 진행률 출력 간격
+PROGRESS_EVERY = 50
+# 큐 길이를 지표에 기록하는 간격 (초)
+METRICS_SAMPLE_INTERVAL = float(os.getenv('COLLECTOR_METRICS_SAMPLE_INTERVAL', 1))
+# 체크포인트 시각에서 이만큼(초) 앞당겨 조회합니다. 겹치는 매치는 이미 저장된 ID로 걸러집니다.
+CHECKPOINT_OVERLAP = int(os.getenv('COLLECTOR_CHECKPOINT_OVERLAP', 3600))
+# 매치 응답 디코딩 + 변환에 쓸 프로세스 수. 0이면 이벤트 루프에서 바로 처리합니다.
+PARSE_WORKERS = int(os.getenv('COLLECTOR_PARSE_WORKERS', 0))
+
+# 데몬 모드 (python -m app.data_collector --daemon) 주기 설정 (초)
+# 리그 목록(LP, 신규 / 탈락 플레이어) 갱신 간격
+LEAGUE_REFRESH_INTERVAL = float(os.getenv('COLLECTOR_LEAGUE_REFRESH_INTERVAL', 1800))
+# 플레이어별 매치 ID 조회 기본 간격. LP 순위가 낮을수록 최대 두 배까지 늘어납니다.
+POLL_INTERVAL = float(os.getenv('COLLECTOR_POLL_INTERVAL', 600))
+# 새 매치가 없을 때마다 간격을 두 배로 늘리되 이 값을 넘지 않습니다.
+POLL_MAX_INTERVAL = float(os.getenv('COLLECTOR_POLL_MAX_INTERVAL', 7200))
+# 지역별 매치 ID 조회 worker 수. 나머지 요청 한도는 매치 상세 조회가 씁니다.
+POLL_WORKERS = int(os.getenv('COLLECTOR_POLL_WORKERS', 4))
+# 배치가 차지 않아도 이 시간 동안 새 매치가 없으면 DB에 저장합니다. 체크포인트 저장 간격도 같습니다.
+DAEMON_FLUSH_INTERVAL = float(os.getenv('COLLECTOR_FLUSH_INTERVAL', 30))
+
+
+class Progress:
+    """
+    단계별 처리 개수를 세어 지표에 기록하고 일정 간격마다 진행률을 로그로 남깁니다.
+    """
+
+    def __init__(self, label: str, total: int = None, stage: str = None):
+        self.label = label
+        self.stage = stage or label
+        self.total = total
+        self.count = 0
+
+    def step(self):
+        self.count += 1
+        COLLECTOR_ITEMS.inc(self.stage)
+        if self.count % PROGRESS_EVERY == 0 or self.count == self.total:
+            logger.info("progress", extra={'stage': self.label, 'done': self.count, 'total': self.total})
+
+
+class InFlightLimits:
+    """
+    호스트별 동시 요청 수 제한. Riot API의 rate limit은 지역(호스트)마다 따로 적용되므로
+    한 지역이 느려져도 다른 지역의 요청은 막히지 않도록 세마포어를 호스트별로 나눕니다.
+    """
+
+    def __init__(self, limit: int = MAX_IN_FLIGHT):
+        self.limit = limit
+        self.semaphores = {}
+
+    def __call__(self, host: str) -> asyncio.Semaphore:
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.limit)
+        return self.semaphores[host]
+
+
+class PollSchedule:
+    """
+    데몬 모드에서 플레이어별 다음 매치 ID 조회 시각을 관리합니다.
+    - 서버 안에서 LP 순위가 높을수록 조회 간격이 짧습니다. (1위: interval, 꼴찌: interval * 2)
+    - 조회에서 새 매치가 나오면 기본 간격으로 돌아가고, 없으면 간격을 두 배씩 늘립니다. (max_interval까지)
+    - 처음 추가된 플레이어는 순위에 따라 첫 조회를 interval 안에 나눠 배치해 요청이 한꺼번에 몰리지 않게 합니다.
+    같은 시각에 차례가 된 플레이어는 LP가 높은 순서로 꺼냅니다.
+    """
+
+    def __init__(self, interval: float = POLL_INTERVAL, max_interval: float = POLL_MAX_INTERVAL):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.players = {}  # puuid -> {platform, tier, league_points, rank, idle, due}
+        self.heap = []     # (조회 시각, -LP, puuid). 다시 예약되거나 빠진 플레이어의 항목은 꺼낼 때 버립니다.
+
+    def __len__(self):
+        return len(self.players)
+
+    def update_league(self, platform: str, tier: str, summoners: list, now: float) -> int:
+        """
+        platform 서버 tier 리그의 최신 목록으로 플레이어를 추가 / 갱신 / 제거하고 추가된 수를 반환합니다.
+        """
+        current = {summoner['puuid']: summoner for summoner in summoners}
+        for puuid, player in list(self.players.items()):
+            if player['platform'] == platform and player['tier'] == tier and puuid not in current:
+                del self.players[puuid]
+        added = []
+        for puuid, summoner in current.items():
+            player = self.players.get(puuid)
+            if player is None:
+                player = self.players[puuid] = {'rank': 1.0, 'idle': 0, 'due': None}
+                added.append(puuid)
+            player.update(platform=platform, tier=tier, league_points=summoner.get('leaguePoints') or 0)
+        self._rank(platform)
+        for puuid in added:
+            self._push(puuid, now + self.players[puuid]['rank'] * self.interval)
+        return len(added)
+
+    def _rank(self, platform: str):
+        # 서버 안 LP 순위를 0(1위) ~ 1(꼴찌) 사이 값으로 기록합니다.
+        ranked = sorted(
+            (player for player in self.players.values() if player['platform'] == platform),
+            key=lambda player: player['league_points'], reverse=True,
+        )
+        for index, player in enumerate(ranked):
+            player['rank'] = index / len(ranked)
+
+    def _push(self, puuid: str, due: float):
+        player = self.players[puuid]
+        player['due'] = due
+        heapq.heappush(self.heap, (due, -player['league_points'], puuid))
+
+    def pop_due(self, now: float):
+        """
+        조회할 차례가 된 플레이어의 (puuid, platform)을 꺼냅니다. 없으면 None.
+        꺼낸 플레이어는 reschedule을 호출할 때까지 다시 나오지 않습니다.
+        """
+        while self.heap and self.heap[0][0] <= now:
+            due, _, puuid = heapq.heappop(self.heap)
+            player = self.players.get(puuid)
+            if player is None or player['due'] != due:
+                continue
+            player['due'] = None
+            return puuid, player['platform']
+        return None
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def reschedule(self, puuid: str, new_matches: int, now: float):
+        player = self.players.get(puuid)
+        if player is None:  # 조회하는 동안 리그에서 빠진 플레이어
+            return
+        player['idle'] = 0 if new_matches else min(player['idle'] + 1, 16)
+        interval = self.interval * (1 + player['rank']) * 2 ** player['idle']
+        self._push(puuid, now + min(interval, self.max_interval))
+
+
+async def _worker(queue: asyncio.Queue, handler, label: str):
+    # 큐에서 항목을 하나씩 꺼내 처리합니다. 한 항목의 실패가 다른 항목을 막지 않습니다.
+    while True:
+        item = await queue.get()
+        try:
+            await handler(item)
+        except Exception as e:
+            logger.warning(f"Error in {label} worker", extra={'item': item, 'error': str(e)})
+        finally:
+            queue.task_done()
+
+
+def _start_workers(queue: asyncio.Queue, handler, count: int, label: str):
+    return [asyncio.create_task(_worker(queue, handler, label)) for _ in range(count)]
+
+
+async def _drain(queue: asyncio.Queue, workers: list):
+    # 큐가 모두 처리될 때까지 기다린 뒤 worker를 정리합니다.
+    await queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _match_writer(write_queue: asyncio.Queue, batch_size: int = DB_WRITE_BATCH, on_flush=None, archive: MatchArchiveWriter = None,
+                        flush_interval: float = None):
+    """
+    (MatchRow, ParticipantRow 리스트, 응답 본문 bytes) 항목을 모아 batch_size 단위로 DB에 저장합니다.
+    archive가 주어지면 원본 응답 본문도 아카이브에 함께 기록합니다.
+    DB 저장은 스레드에서 실행되어 네트워크 요청과 겹쳐서 진행됩니다.
+    flush_interval(초)이 주어지면 배치의 가장 오래된 항목이 그만큼 기다렸을 때 배치가 차지 않아도 저장합니다.
+    저장이 끝날 때마다 on_flush(match_batch, participant_batch, 성공 여부)를 호출합니다.
+    큐에 None이 들어오면 남은 항목을 저장하고 종료합니다.
+    """
+    match_batch = []
+    participant_batch = []
+    raw_batch = []
+    saved = 0
+    oldest_at = 0.0  # 배치의 첫 항목이 들어온 시각
+
+    async def flush():
+        nonlocal saved
+        if not match_batch:
+            return
+        if archive is not None:
+            await asyncio.to_thread(archive.append_raw_many, list(raw_batch))
+            raw_batch.clear()
+        written = await asyncio.to_thread(save_matches_to_db, list(match_batch), list(participant_batch))
+        ok = written == len(match_batch)
+        if ok:
+            saved += len(match_batch)
+            COLLECTOR_ITEMS.inc('saved', amount=len(match_batch))
+        if on_flush is not None:
+            on_flush(match_batch, participant_batch, ok)
+        match_batch.clear()
+        participant_batch.clear()
+
+    while True:
+        if flush_interval is not None and match_batch:
+            # 항목이 조금씩 계속 들어와도 가장 오래된 항목이 flush_interval을 넘기지 않게 남은 시간만 기다립니다.
+            remaining = oldest_at + flush_interval - time.monotonic()
+            if remaining <= 0:
+                await flush()
+                continue
+            try:
+                item = await asyncio.wait_for(write_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+        else:
+            item = await write_queue.get()
+        try:
+            if item is None:
+                await flush()
+                return saved
+            match_info, participant_infos, body = item
+            if not match_batch:
+                oldest_at = time.monotonic()
+            match_batch.append(match_info)
+            participant_batch.extend(participant_infos)
+            if archive is not None:
+                raw_batch.append((body, partition_for(match_info.tft_set_number, match_info.game_version)))
+            if len(match_batch) >= batch_size:
+                await flush()
+        finally:
+            write_queue.task_done()
+
+
+def _parse_executor(workers: int = PARSE_WORKERS):
+    # workers가 0이면 None (이벤트 루프에서 직접 파싱)
+    return ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+
+async def _decode(executor: ProcessPoolExecutor, items):
+    # executor가 있으면 프로세스 풀에서, 없으면 현재 스레드에서 decode_match_batch를 실행합니다.
+    if executor is None:
+        return decode_match_batch(items)
+    return await asyncio.get_running_loop().run_in_executor(executor, decode_match_batch, items)
+
+
+async def _match_parser(parse_queue: asyncio.Queue, write_queue: asyncio.Queue, executor: ProcessPoolExecutor = None,
+                        batch_size: int = PARSE_BATCH_SIZE, on_error=None):
+    """
+    (match_id, 응답 본문) 항목을 batch_size개까지 모아 디코딩 + 변환한 뒤 write_queue로 넘깁니다.
+    큐에 쌓인 만큼만 모으므로 응답이 드문드문 올 때도 기다리지 않고 바로 처리합니다.
+    실패한 매치는 on_error(match_id)로 알립니다. 큐에 None이 들어오면 종료합니다.
+    """
+    finished = False
+    while not finished:
+        batch = [await parse_queue.get()]
+        while len(batch) < batch_size and not parse_queue.empty():
+            batch.append(parse_queue.get_nowait())
+        taken = len(batch)
+        if batch[-1] is None:
+            finished = True
+            batch.pop()
+        try:
+            parsed = await _decode(executor, batch) if batch else []
+            for (match_id, body), result in zip(batch, parsed):
+                if result is None:
+                    if on_error is not None:
+                        on_error(match_id)
+                    continue
+                match_info, participant_infos = result
+                await write_queue.put((match_info, participant_infos, body))
+        except Exception as e:
+            logger.error(f"Error parsing {len(batch)} matches: {e}")
+            if on_error is not None:
+                for match_id, _ in batch:
+                    on_error(match_id)
+        finally:
+            for _ in range(taken):
+                parse_queue.task_done()
+
+
+async def _fetch_summoners(session: aiohttp.ClientSession, in_flight: InFlightLimits, puuid_queue: asyncio.Queue = None,
+                           platform: str = DEFAULT_PLATFORM, tier: str = DEFAULT_TIER):
+    """
+    platform 서버의 tier 리그 엔트리를 가져와 계정 정보(Riot ID)를 조회하고 한 번에 DB에 저장합니다.
+    puuid_queue가 주어지면 엔트리를 읽는 즉시 (puuid, platform)을 다음 단계로 흘려보냅니다.
+    """
+    label = f"{platform} {tier}"
+    logger.info(f"1. Fetching {label} league data...")
+    async with in_flight(platform):
+        league = await fetch_league_data(session, tier, platform)
+
+    if not league or not league.get('entries'):
+        logger.warning(f"Failed to fetch {label} league data or no entries found.")
+        return []
+
+    entries_to_process = [entry for entry in league['entries'] if entry.get('puuid')]
+    total_entries = len(entries_to_process) # 전체 엔트리 수
+    logger.info(f"Successfully fetched {total_entries} {label} entries.")
+    logger.info(f"2. Fetching account details and saving {total_entries} {label} entries...")
+
+    # 캐시에 유효한 Riot ID가 있는 puuid는 Account API를 호출하지 않습니다.
+    cached_accounts = await asyncio.to_thread(account_cache.get_many, [entry['puuid'] for entry in entries_to_process])
+    logger.info(f"{len(cached_accounts)} accounts found in cache.")
+
+    challenger_summoners = []
+    fetched_accounts = []
+    progress = Progress(f'Account {label}', total_entries, stage='Account')
+    account_host = account_region_of(platform)
+    entry_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+
+    async def handle_entry(entry):
+        account_info = cached_accounts.get(entry['puuid'])
+        if account_info is None:
+            async with in_flight(account_host):
+                account_info = await fetch_account_info_by_puuid(session, entry['puuid'], platform)
+            if account_info is not None:
+                fetched_accounts.append(account_info)
+        progress.step()
+        if account_info is None:
+            return
+        player_data = {
+            "puuid": entry.get('puuid'),
+            "summonerName": account_info.get('gameName', '') + '#' + account_info.get('tagLine', ''),
+            "leaguePoints": entry.get('leaguePoints'),
+            "wins": entry.get('wins'),
+            "losses": entry.get('losses'),
+            "platform": platform,
+            "tier": tier,
+        }
+        challenger_summoners.append(player_data)
+
+    workers = _start_workers(entry_queue, handle_entry, MAX_IN_FLIGHT, 'Account')
+    for entry in entries_to_process:
+        await entry_queue.put(entry)
+        if puuid_queue is not None:
+            await puuid_queue.put((entry['puuid'], platform))
+    await _drain(entry_queue, workers)
+
+    await asyncio.to_thread(account_cache.put_many, fetched_accounts)
+    saved = await asyncio.to_thread(save_challenger_players, challenger_summoners)
+    logger.info(f"3. Collected {len(challenger_summoners)} {label} summoner names with details, saved {saved}.")
+    return challenger_summoners
+
 
 """
 Riot API에서 챌린저 리그 데이터를 가져와
 각 플레이어의 상세 정보를 수집하고 데이터베이스에 저장하는 비동기 함수입니다.
 진행률을 표시합니다.
 """
-async def collect_challenger_summoner_names():
-    async with aiohttp.ClientSession() as session:
-        print("1. Fetching Challenger League data...")
-        challenger_league = await fetch_challenger_data(session)
-
-        if not challenger_league or not challenger_league.get('entries'):
-            print("Failed to fetch challenger league data or no entries found.")
-            return []
-
-        print(f"   Successfully fetched {len(challenger_league['entries'])} challenger entries.")
-        entries_to_process = challenger_league['entries'] 
-        total_entries = len(entries_to_process) # 전체 엔트리 수
-        
-        print(f"2. Fetching summoner and account details for {total_entries} entries...")
-        
-        account_tasks = []
-        for entry in entries_to_process:
-            puuid = entry.get('puuid')
-            if puuid:
-                account_tasks.append(fetch_account_info_by_puuid(session, puuid))
-        
-        chunk_size = 50
-        account_results = []
-        for i in range(0, len(account_tasks), chunk_size):
-            chunk = account_tasks[i:i+chunk_size]
-            chunk_results = await asyncio.gather(*chunk, return_exceptions=True)
-            account_results.extend(chunk_results)
-            print(f"   [Account] 진행률: {min(i+chunk_size, total_entries)}/{total_entries}")
-            # API 요청 제한을 위한 대기 (0.5초)
-            await asyncio.sleep(0.5)
-
-        challenger_summoners = []        
-        print(f"3. Saving to DB...")
-        for i, entry in enumerate(entries_to_process):
-            account_info = account_results[i]
-            if isinstance(account_info, Exception) or account_info is None:
-                pass
-            else:
-                player_data = {
-                    "puuid": entry.get('puuid'),
-                    "summonerName": account_info.get('gameName', '') + '#' + account_info.get('tagLine', ''),
-                    "leaguePoints": entry.get('leaguePoints'),
-                    "wins": entry.get('wins'),
-                    "losses": entry.get('losses'),
-                }
-                challenger_summoners.append(player_data)
-                save_challenger_player(player_data)
-            if (i+1) % 10 == 0 or (i+1) == total_entries:
-                print(f"   [DB] 진행률: {i+1}/{total_entries}")
-
-    print(f"3. Collected {len(challenger_summoners)} summoner names with details.")
-    return challenger_summoners
+async def collect_challenger_summoner_names(max_in_flight: int = MAX_IN_FLIGHT, platform: str = DEFAULT_PLATFORM, tier: str = DEFAULT_TIER):
+    async with shared_session() as session:
+        return await _fetch_summoners(session, InFlightLimits(max_in_flight), platform=platform, tier=tier)
 
-async def collect_challenger_match_id(challenger_summoners: list):
-    async with aiohttp.ClientSession() as session:
-        print("\n1. Fetching Challenger Summoner Match ID...")
-        match_id_tasks = []
-        for summoner in challenger_summoners:
-            puuid = summoner.get('puuid')
-            if puuid:
-                match_id_tasks.append(fetch_match_ids(session, puuid))
-
-        chunk_size = 50
-        match_id_results = []
-        for i in range(0, len(match_id_tasks), chunk_size):
-            chunk = match_id_tasks[i:i+chunk_size]
-            chunk_results = await asyncio.gather(*chunk, return_exceptions=True)
-            match_id_results.extend(chunk_results)
-            print(f"   [MatchID] 진행률: {min(i+chunk_size, len(match_id_tasks))}/{len(match_id_tasks)}")
-            await asyncio.sleep(0.5)  # API 제한을 고려한 대기
-        
-        match_ids = []
-        for match_id in match_id_results:
-            if isinstance(match_id, Exception):
-                print(f"Error fetching matches: {str(match_id)}")
-                continue
-            if isinstance(match_id, list):
-                match_ids.extend(match_id)
+async def collect_challenger_match_id(challenger_summoners: list, max_in_flight: int = MAX_IN_FLIGHT):
+    async with shared_session() as session:
+        logger.info("1. Fetching Challenger Summoner Match ID...")
+        in_flight = InFlightLimits(max_in_flight)
+        puuids = [
+            (summoner['puuid'], summoner.get('platform', DEFAULT_PLATFORM))
+            for summoner in challenger_summoners if summoner.get('puuid')
+        ]
+        progress = Progress('MatchID', len(puuids))
+        unique_match_ids = set()
+
+        async def handle_puuid(item):
+            puuid, platform = item
+            async with in_flight(region_of(platform)):
+                match_ids = await fetch_match_ids(session, puuid, count=MATCH_ID_COUNT, platform=platform)
+            progress.step()
+            if isinstance(match_ids, list):
+                unique_match_ids.update(match_ids)
             else:
-                print(f"Unexpected result type: {type(match_id)}")
-                
-        unique_match_ids = list(set(match_ids))
-        print(f"Collected {len(unique_match_ids)} match ids.")
-        
-        '''
-        print(f"2. Saving to DB...")
-        save_match_ids_to_db(unique_match_ids)
-        '''
-        return unique_match_ids
-
-async def collect_challenger_match_details(match_ids: list):
-    async with aiohttp.ClientSession() as session:
-        print("\n1. Fetching Challenger Match Details...")
-
-        chunk_size = 50
-        detail_tasks = []
+                logger.warning(f"Unexpected result type: {type(match_ids)}")
+
+        puuid_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        workers = _start_workers(puuid_queue, handle_puuid, max_in_flight, 'MatchID')
+        for puuid in puuids:
+            await puuid_queue.put(puuid)
+        await _drain(puuid_queue, workers)
+
+        logger.info(f"Collected {len(unique_match_ids)} match ids.")
+        return list(unique_match_ids)
+
+async def collect_challenger_match_details(match_ids: list, max_in_flight: int = MAX_IN_FLIGHT, skip_known: bool = True, parse_workers: int = PARSE_WORKERS):
+    if skip_known:
+        known_match_ids = await asyncio.to_thread(fetch_known_match_ids, match_ids)
+        match_ids = [match_id for match_id in match_ids if match_id not in known_match_ids]
+        logger.info(f"Skipping {len(known_match_ids)} match ids already stored.")
+
+    async with shared_session() as session:
+        logger.info("1. Fetching Challenger Match Details...")
+        in_flight = InFlightLimits(max_in_flight)
+        progress = Progress('MatchDetail', len(match_ids))
+        bodies = []
+
+        async def handle_match(match_id):
+            async with in_flight(region_of(platform_of_match(match_id))):
+                body = await fetch_match_detail_raw(session, match_id)
+            progress.step()
+            if body is None:
+                raise RuntimeError("match detail not available")
+            bodies.append((match_id, body))
+
+        match_id_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        workers = _start_workers(match_id_queue, handle_match, max_in_flight, 'MatchDetail')
         for match_id in match_ids:
-            detail_tasks.append(fetch_match_detail(session, match_id))
+            await match_id_queue.put(match_id)
+        await _drain(match_id_queue, workers)
 
+        logger.info(f"2. Parsing {len(bodies)} match details...")
         match_details = []
         participant_details = []
-        for i in range(0,len(detail_tasks),chunk_size):
-            chunk = detail_tasks[i:i + chunk_size]
-            chunk_results = await asyncio.gather(*chunk,return_exceptions=True)
-            print(f"   [MatchDetail] 진행률: {min(i+chunk_size, len(detail_tasks))}/{len(detail_tasks)}")
-            await asyncio.sleep(0.5)  # API 제한을 고려한 대기
-
-            for match_id, result in zip(match_ids[i:i + chunk_size], chunk_results):
-                if isinstance(result, Exception):
-                    print(f"Error fetching match details for match_id {match_id}: {str(result)}")
-                    continue
-                else:
-                    match_detail = result
-                    match_info = {
-                        'match_id': match_id,
-                        'game_datetime': datetime.datetime.fromtimestamp(match_detail['info']['game_datetime'] / 1000),
-                        'game_length': datetime.timedelta(seconds = match_detail['info']['game_length']),
-                        'game_version': match_detail['info']['game_version'],
-                        'queue_id': match_detail['info']['queue_id'],
-                        'tft_set_number': match_detail['info']['tft_set_number'],
-                        'tft_set_core_name': match_detail['info']['tft_set_core_name']
-                    }
+        executor = _parse_executor(parse_workers)
+        try:
+            batches = [bodies[i:i + PARSE_BATCH_SIZE] for i in range(0, len(bodies), PARSE_BATCH_SIZE)]
+            for parsed in await asyncio.gather(*(_decode(executor, batch) for batch in batches)):
+                for result in parsed:
+                    if result is None:
+                        continue
+                    match_info, participant_infos = result
                     match_details.append(match_info)
+                    participant_details.extend(participant_infos)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-                for participant in match_detail['info']['participants']:
-                    participant_info = {
-                            'match_id': match_id,
-                            'puuid': participant['puuid'],
-                            'placement': participant['placement'],
-                            'level': participant['level'],
-                            'gold_left': participant['gold_left'],
-                            'last_round': participant['last_round'],
-                            'players_eliminated': participant['players_eliminated'],
-                            'total_damage_to_players': participant['total_damage_to_players'],
-                            'traits': participant['traits'],
-                            'units': participant['units']
-                        }
-                    participant_details.append(participant_info)            
-        
-        print(f"3. Saving to DB...")
-
-        save_match_details_to_db(match_details)
-        #print("match_details가 DB에 저장되었습니다.")
-        save_participant_details_to_db(participant_details)
+        logger.info(f"3. Saving to DB...")
+
+        await asyncio.to_thread(save_matches_to_db, match_details, participant_details)
 
         return match_details, participant_details
 
+async def _report_metrics(queues: dict, dumper: MetricsDumper = None):
+    # 큐 길이를 주기적으로 지표에 기록하고, dumper가 있으면 METRICS_DUMP_INTERVAL마다 JSON 스냅샷을 남깁니다.
+    dumped_at = time.monotonic()
+    while True:
+        for name, queue in queues.items():
+            QUEUE_DEPTH.set(queue.qsize(), name)
+        if dumper is not None and time.monotonic() - dumped_at >= METRICS_DUMP_INTERVAL:
+            await asyncio.to_thread(dumper.dump)
+            dumped_at = time.monotonic()
+        await asyncio.sleep(METRICS_SAMPLE_INTERVAL)
+
+async def _flush_job_state(job: CrawlJobState):
+    # 작업 상태를 주기적으로 파일에 저장합니다. 스냅샷은 루프에서 만들고 쓰기만 스레드에서 합니다.
+    while True:
+        await asyncio.sleep(JOB_FLUSH_INTERVAL)
+        if job.should_flush():
+            await asyncio.to_thread(job.write, job.begin_flush())
+
+async def _save_checkpoints(checkpoints: dict) -> bool:
+    """
+    체크포인트를 저장하고 모두 저장되었는지 반환합니다.
+    실패하면 경고만 남깁니다. 다음 실행이 이전 체크포인트부터 다시 조회할 뿐 매치를 놓치지는 않습니다.
+    """
+    if not checkpoints:
+        return True
+    saved = await asyncio.to_thread(save_crawl_checkpoints, checkpoints)
+    if saved == len(checkpoints):
+        return True
+    logger.warning("Failed to save crawl checkpoints", extra={'saved': saved, 'total': len(checkpoints)})
+    return False
+
+async def collect_challenger_pipeline(max_in_flight: int = MAX_IN_FLIGHT, batch_size: int = DB_WRITE_BATCH, archive_enabled: bool = ARCHIVE_ENABLED, resume: bool = True,
+                                      platforms=None, tiers=None, parse_workers: int = PARSE_WORKERS):
+    """
+    리그 엔트리 -> 매치 ID -> 매치 상세 -> DB 저장을 큐로 연결해 스트림으로 처리합니다.
+    각 단계는 worker pool로 동작하고, 큐 길이 제한으로 앞 단계가 너무 앞서가지 않도록 막습니다.
+    platforms x tiers의 리그 엔트리를 동시에 가져오며, 호스트(kr, asia 등)마다
+    동시에 진행되는 API 요청 수는 max_in_flight를 넘지 않습니다.
+
+    이미 DB에 있는 매치는 상세 조회를 건너뛰고, puuid별 체크포인트(마지막 저장 매치 시각)를
+    startTime으로 넘겨 새 매치 ID만 조회합니다.
+    archive_enabled이면 원본 매치 응답을 로컬 아카이브에도 남깁니다.
+    parse_workers > 0이면 매치 응답 디코딩 + 변환을 프로세스 풀에서 처리해 이벤트 루프는 I/O만 담당합니다.
+
+    진행 상황(매치 ID 조회를 마친 puuid, 저장 대기 중인 match_id)은 주기적으로 파일에 기록되며,
+    resume이면 이전 실행이 중간에 멈춘 지점부터 이어서 처리합니다.
+    """
+    platforms = platforms or COLLECTOR_PLATFORMS
+    tiers = tiers or COLLECTOR_TIERS
+    for platform in platforms:
+        region_of(platform)  # 알 수 없는 서버면 여기서 ValueError
+    unknown_tiers = set(tiers) - set(TIERS)
+    if unknown_tiers:
+        raise ValueError(f"unknown tiers: {sorted(unknown_tiers)}")
+
+    await asyncio.to_thread(ensure_schema)
+    seen_match_ids = await asyncio.to_thread(fetch_known_match_ids)
+    checkpoints = await asyncio.to_thread(fetch_crawl_checkpoints)
+    logger.info(f"Loaded {len(seen_match_ids)} known match ids and {len(checkpoints)} checkpoints.")
+
+    job = await asyncio.to_thread(CrawlJobState.load) if resume else CrawlJobState()
+    # challenger_match_details에는 참가자 / 집계까지 모두 저장된 매치만 있으므로 (save_matches_to_db 참고)
+    # 여기에 있는 대기 매치는 끝난 것으로, 나머지는 다시 받을 매치로 봅니다.
+    resumed_matches = [match_id for match_id in job.pending_matches if match_id not in seen_match_ids]
+    job.mark_matches_done([match_id for match_id in job.pending_matches if match_id in seen_match_ids])
+    if job.resumed:
+        logger.info(f"Resuming job {job.job_id}: {len(job.done_puuids)} puuids done, {len(resumed_matches)} matches pending.")
+    seen_match_ids.update(resumed_matches)
+
+    async with shared_session() as session:
+        in_flight = InFlightLimits(max_in_flight)
+        # 지역마다 max_in_flight개를 채울 수 있도록 worker 수를 지역 수만큼 늘립니다.
+        worker_count = max_in_flight * len({region_of(platform) for platform in platforms})
+        puuid_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        match_id_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        parse_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        write_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+
+        new_match_count = 0
+        match_owner = {}        # match_id -> 해당 매치를 큐에 넣은 puuid
+        crawled_puuids = set()  # 이번 실행에서 매치 ID를 조회한 puuid
+        failed_puuids = set()   # 매치 상세 조회에 실패한 매치가 있는 puuid (체크포인트 갱신 제외)
+        new_checkpoints = {}
+        match_id_progress = Progress('MatchID')
+        detail_progress = Progress('MatchDetail')
+
+        async def handle_puuid(item):
+            nonlocal new_match_count
+            puuid, platform = item
+            if puuid in job.done_puuids:
+                return
+            start_time = None
+            if puuid in checkpoints:
+                start_time = int(checkpoints[puuid]['last_game_datetime'].timestamp()) - CHECKPOINT_OVERLAP
+            async with in_flight(region_of(platform)):
+                match_ids = await fetch_match_ids(session, puuid, count=MATCH_ID_COUNT, start_time=start_time, platform=platform)
+            match_id_progress.step()
+            if not isinstance(match_ids, list):
+                logger.warning(f"Unexpected result type: {type(match_ids)}")
+                return
+            crawled_puuids.add(puuid)
+            queued = []
+            for match_id in match_ids:
+                if match_id not in seen_match_ids:
+                    seen_match_ids.add(match_id)
+                    match_owner[match_id] = puuid
+                    new_match_count += 1
+                    await match_id_queue.put(match_id)
+                    queued.append(match_id)
+            job.mark_puuid_done(puuid, queued)
+
+        def mark_failed(match_id):
+            failed_puuids.add(match_owner.get(match_id))
+
+        async def handle_match(match_id):
+            try:
+                async with in_flight(region_of(platform_of_match(match_id))):
+                    body = await fetch_match_detail_raw(session, match_id)
+                detail_progress.step()
+                if body is None:
+                    raise RuntimeError("match detail not available")
+                await parse_queue.put((match_id, body))
+            except Exception:
+                mark_failed(match_id)
+                raise
+
+        def update_checkpoints(match_batch, participant_batch, ok):
+            if not ok:
+                failed_puuids.update(participant.puuid for participant in participant_batch)
+                return
+            job.mark_matches_done(match.match_id for match in match_batch)
+            game_datetimes = {match.match_id: match.game_datetime for match in match_batch}
+            for participant in participant_batch:
+                puuid = participant.puuid
+                if puuid not in crawled_puuids:
+                    continue
+                game_datetime = game_datetimes[participant.match_id]
+                current = new_checkpoints.get(puuid)
+                if current is None or game_datetime > current['last_game_datetime']:
+                    new_checkpoints[puuid] = {'last_match_id': participant.match_id, 'last_game_datetime': game_datetime}
+
+        archive = MatchArchiveWriter() if archive_enabled else None
+        executor = _parse_executor(parse_workers)
+        writer = asyncio.create_task(_match_writer(write_queue, batch_size, update_checkpoints, archive))
+        parser = asyncio.create_task(_match_parser(parse_queue, write_queue, executor, on_error=mark_failed))
+        puuid_workers = _start_workers(puuid_queue, handle_puuid, worker_count, 'MatchID')
+        detail_workers = _start_workers(match_id_queue, handle_match, worker_count, 'MatchDetail')
+        job_flusher = asyncio.create_task(_flush_job_state(job))
+        dumper = MetricsDumper(metrics)
+        reporter = asyncio.create_task(_report_metrics({
+            'puuid': puuid_queue, 'match_id': match_id_queue, 'parse': parse_queue, 'write': write_queue,
+        }, dumper))
+
+        try:
+            # 이전 실행에서 발견했지만 저장하지 못한 매치부터 처리합니다.
+            for match_id in resumed_matches:
+                await match_id_queue.put(match_id)
+
+            leagues = await asyncio.gather(*(
+                _fetch_summoners(session, in_flight, puuid_queue, platform, tier)
+                for platform in platforms for tier in tiers
+            ))
+            challenger_summoners = [summoner for league in leagues for summoner in league]
+            await _drain(puuid_queue, puuid_workers)
+            await _drain(match_id_queue, detail_workers)
+            await parse_queue.put(None)
+            await parser
+            await write_queue.put(None)
+            saved = await writer
+        except BaseException:
+            # 중간에 멈추면 지금까지의 진행 상황을 남겨 다음 실행에서 이어서 처리합니다.
+            job_flusher.cancel()
+            job.flush()
+            raise
+        finally:
+            reporter.cancel()
+            await asyncio.to_thread(dumper.dump)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if archive is not None:
+                await asyncio.to_thread(archive.close)
+
+        await _save_checkpoints({
+            puuid: checkpoint for puuid, checkpoint in new_checkpoints.items()
+            if puuid not in failed_puuids
+        })
+
+        # 매치 ID 단계는 끝났으므로 다음 실행은 목록을 새로 조회합니다.
+        # 저장하지 못한 매치가 남아 있으면 상태 파일에 남겨 다음 실행에서 다시 시도합니다.
+        job_flusher.cancel()
+        job.done_puuids.clear()
+        if job.pending_matches:
+            await asyncio.to_thread(job.flush)
+        else:
+            await asyncio.to_thread(job.complete)
+
+        logger.info(f"Collected {len(challenger_summoners)} summoners, {new_match_count} new match ids, saved {saved} matches.")
+        return challenger_summoners, saved
+
+async def _refresh_leagues(session: aiohttp.ClientSession, in_flight: InFlightLimits, schedule: PollSchedule, platforms, tiers,
+                           interval: float = LEAGUE_REFRESH_INTERVAL):
+    # interval마다 리그 목록을 다시 가져와 DB와 조회 일정에 반영합니다. 실패한 리그는 기존 일정을 유지합니다.
+    while True:
+        for platform in platforms:
+            for tier in tiers:
+                try:
+                    summoners = await _fetch_summoners(session, in_flight, None, platform, tier)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh {platform} {tier} league", extra={'error': str(e)})
+                    continue
+                if summoners:
+                    added = schedule.update_league(platform, tier, summoners, time.monotonic())
+                    logger.info(f"Refreshed {platform} {tier} league", extra={'players': len(schedule), 'added': added})
+        await asyncio.sleep(interval)
+
+async def _schedule_polls(schedule: PollSchedule, puuid_queue: asyncio.Queue, idle_sleep: float = 1.0):
+    # 조회할 차례가 된 플레이어를 puuid_queue로 넘깁니다. 큐가 가득 차면 poll worker가 따라올 때까지 기다립니다.
+    while True:
+        now = time.monotonic()
+        item = schedule.pop_due(now)
+        if item is not None:
+            await puuid_queue.put(item)
+            continue
+        next_due = schedule.next_due()
+        await asyncio.sleep(idle_sleep if next_due is None else min(max(next_due - now, 0.0), idle_sleep))
+
+async def run_collector_daemon(max_in_flight: int = MAX_IN_FLIGHT, batch_size: int = DB_WRITE_BATCH, archive_enabled: bool = ARCHIVE_ENABLED,
+                               platforms=None, tiers=None, parse_workers: int = PARSE_WORKERS, poll_workers: int = POLL_WORKERS,
+                               league_interval: float = LEAGUE_REFRESH_INTERVAL, flush_interval: float = DAEMON_FLUSH_INTERVAL,
+                               schedule: PollSchedule = None):
+    """
+    종료할 때까지 계속 실행되는 수집 모드. 한 번에 몰아서 수집하는 대신 요청 한도를 고르게 나눠 씁니다.
+    - 리그 목록은 league_interval마다 갱신합니다.
+    - 매치 ID는 PollSchedule 일정에 따라 플레이어마다 따로 조회합니다. (상위 LP, 최근에 게임한 플레이어일수록 자주)
+    - 매치 상세는 지역별 worker가 대기 목록을 계속 비우고, 배치가 차거나 flush_interval이 지나면 DB에 저장합니다.
+    매치 ID 조회 worker는 지역별 poll_workers개로 제한하고, 매치 상세 큐가 가득 차면 조회를 멈추므로
+    남은 요청 한도는 대기 중인 매치 상세 조회에 돌아갑니다.
+    체크포인트는 flush_interval마다 저장되며, 재시작하면 체크포인트 이후의 매치부터 다시 조회합니다.
+    """
+    platforms = platforms or COLLECTOR_PLATFORMS
+    tiers = tiers or COLLECTOR_TIERS
+    for platform in platforms:
+        region_of(platform)  # 알 수 없는 서버면 여기서 ValueError
+    unknown_tiers = set(tiers) - set(TIERS)
+    if unknown_tiers:
+        raise ValueError(f"unknown tiers: {sorted(unknown_tiers)}")
+
+    await asyncio.to_thread(ensure_schema)
+    seen_match_ids = await asyncio.to_thread(fetch_known_match_ids)
+    checkpoints = await asyncio.to_thread(fetch_crawl_checkpoints)
+    logger.info(f"Loaded {len(seen_match_ids)} known match ids and {len(checkpoints)} checkpoints.")
+    if schedule is None:
+        schedule = PollSchedule()
+
+    async with shared_session() as session:
+        in_flight = InFlightLimits(max_in_flight)
+        region_count = len({region_of(platform) for platform in platforms})
+        puuid_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        match_id_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        parse_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        write_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+
+        match_owner = {}        # 저장 대기 중인 match_id -> 해당 매치를 큐에 넣은 puuid
+        outstanding = {}        # puuid -> 큐에 넣었지만 아직 저장 / 실패가 정해지지 않은 match_id 집합
+        failed_puuids = set()   # 매치 상세 조회나 저장에 실패한 매치가 있는 puuid
+        retried_puuids = set()  # 마지막 실패 이후 매치 ID 조회를 다시 마친 puuid
+        candidates = {}         # puuid -> 조건이 갖춰지면 반영할 체크포인트 (저장된 매치 중 가장 최근)
+        new_checkpoints = {}    # 아직 DB에 저장하지 않은 체크포인트
+        match_id_progress = Progress('MatchID')
+        detail_progress = Progress('MatchDetail')
+
+        def settle(puuid):
+            """
+            체크포인트는 조회한 매치가 모두 저장되었을 때만 올립니다.
+            실패한 매치가 있으면 그 뒤에 다시 조회를 마치고 (실패한 매치를 다시 큐에 넣고)
+            그 매치들까지 모두 저장될 때까지 기다립니다. 그 전에 올리면 다음 조회의 startTime이
+            실패한 매치를 지나쳐 다시는 가져오지 못합니다.
+            """
+            if outstanding.get(puuid):
+                return
+            if puuid in failed_puuids:
+                if puuid not in retried_puuids:
+                    return
+                failed_puuids.discard(puuid)
+                retried_puuids.discard(puuid)
+            candidate = candidates.pop(puuid, None)
+            if candidate is not None:
+                checkpoints[puuid] = new_checkpoints[puuid] = candidate
+
+        async def handle_puuid(item):
+            puuid, platform = item
+            queued = 0
+            try:
+                start_time = None
+                if puuid in checkpoints:
+                    start_time = int(checkpoints[puuid]['last_game_datetime'].timestamp()) - CHECKPOINT_OVERLAP
+                async with in_flight(region_of(platform)):
+                    match_ids = await fetch_match_ids(session, puuid, count=MATCH_ID_COUNT, start_time=start_time, platform=platform)
+                match_id_progress.step()
+                if not isinstance(match_ids, list):
+                    logger.warning(f"Unexpected result type: {type(match_ids)}")
+                    return
+                new_match_ids = [match_id for match_id in match_ids if match_id not in seen_match_ids]
+                for match_id in new_match_ids:
+                    seen_match_ids.add(match_id)
+                    match_owner[match_id] = puuid
+                if new_match_ids:
+                    outstanding.setdefault(puuid, set()).update(new_match_ids)
+                if puuid in failed_puuids:
+                    retried_puuids.add(puuid)
+                for match_id in new_match_ids:
+                    queued += 1
+                    await match_id_queue.put(match_id)
+                settle(puuid)
+            finally:
+                schedule.reschedule(puuid, queued, time.monotonic())
+
+        def resolve(match_id):
+            # 저장 / 실패가 정해진 매치를 주인 puuid의 대기 목록에서 빼고 주인을 반환합니다.
+            owner = match_owner.pop(match_id, None)
+            pending = outstanding.get(owner)
+            if pending is not None:
+                pending.discard(match_id)
+                if not pending:
+                    del outstanding[owner]
+            return owner
+
+        def mark_failed(match_id):
+            # 다음 조회에서 다시 발견되면 큐에 넣을 수 있도록 본 목록에서 뺍니다.
+            seen_match_ids.discard(match_id)
+            owner = resolve(match_id)
+            if owner is not None:
+                failed_puuids.add(owner)
+                retried_puuids.discard(owner)
+
+        async def handle_match(match_id):
+            try:
+                async with in_flight(region_of(platform_of_match(match_id))):
+                    body = await fetch_match_detail_raw(session, match_id)
+                detail_progress.step()
+                if body is None:
+                    raise RuntimeError("match detail not available")
+                await parse_queue.put((match_id, body))
+            except Exception:
+                mark_failed(match_id)
+                raise
+
+        def update_checkpoints(match_batch, participant_batch, ok):
+            if not ok:
+                for match in match_batch:
+                    mark_failed(match.match_id)
+                return
+            game_datetimes = {match.match_id: match.game_datetime for match in match_batch}
+            touched = {resolve(match_id) for match_id in game_datetimes}
+            for participant in participant_batch:
+                puuid = participant.puuid
+                if puuid not in schedule.players:
+                    continue
+                game_datetime = game_datetimes[participant.match_id]
+                current = candidates.get(puuid) or checkpoints.get(puuid)
+                if current is None or game_datetime > current['last_game_datetime']:
+                    candidates[puuid] = {'last_match_id': participant.match_id, 'last_game_datetime': game_datetime}
+                touched.add(puuid)
+            for puuid in touched:
+                if puuid is not None:
+                    settle(puuid)
+
+        async def save_checkpoints():
+            # 저장에 실패하면 메모리에 남겨 두고 다음 주기에 다시 저장합니다.
+            ready = dict(new_checkpoints)
+            if ready and await _save_checkpoints(ready):
+                for puuid, checkpoint in ready.items():
+                    if new_checkpoints.get(puuid) is checkpoint:
+                        del new_checkpoints[puuid]
+
+        async def flush_checkpoints():
+            while True:
+                await asyncio.sleep(flush_interval)
+                await save_checkpoints()
+
+        archive = MatchArchiveWriter() if archive_enabled else None
+        executor = _parse_executor(parse_workers)
+        writer = asyncio.create_task(_match_writer(write_queue, batch_size, update_checkpoints, archive, flush_interval))
+        parser = asyncio.create_task(_match_parser(parse_queue, write_queue, executor, on_error=mark_failed))
+        workers = (
+            _start_workers(puuid_queue, handle_puuid, poll_workers * region_count, 'MatchID')
+            + _start_workers(match_id_queue, handle_match, max_in_flight * region_count, 'MatchDetail')
+        )
+        dumper = MetricsDumper(metrics)
+        background = [
+            asyncio.create_task(_refresh_leagues(session, in_flight, schedule, platforms, tiers, league_interval)),
+            asyncio.create_task(_schedule_polls(schedule, puuid_queue)),
+            asyncio.create_task(flush_checkpoints()),
+            asyncio.create_task(_report_metrics({
+                'puuid': puuid_queue, 'match_id': match_id_queue, 'parse': parse_queue, 'write': write_queue,
+            }, dumper)),
+        ]
+        logger.info("Collector daemon started", extra={'platforms': ','.join(platforms), 'tiers': ','.join(tiers)})
+
+        try:
+            await asyncio.gather(*background)
+        finally:
+            # 조회를 멈추고, 이미 받아 둔 응답은 저장한 뒤 체크포인트를 남기고 종료합니다.
+            for task in background + workers:
+                task.cancel()
+            await asyncio.gather(*background, *workers, return_exceptions=True)
+            await parse_queue.put(None)
+            await parser
+            await write_queue.put(None)
+            saved = await writer
+            await save_checkpoints()
+            await asyncio.to_thread(dumper.dump)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if archive is not None:
+                await asyncio.to_thread(archive.close)
+            logger.info(f"Collector daemon stopped, saved {saved} matches.")
+
+def backfill_from_archive(root: str = ARCHIVE_DIR, tft_set_number: int = None, patch: str = None, batch_size: int = DB_WRITE_BATCH):
+    """
+    API를 호출하지 않고 root 아카이브의 원본 응답으로 매치/참가자 테이블을 다시 채웁니다.
+    """
+    recover_partial_segments(root)
+    match_batch = []
+    participant_batch = []
+    saved = 0
+    for match_id, match_detail in iter_archived_matches(root, tft_set_number=tft_set_number, patch=patch):
+        match_info, participant_infos = parse_match_detail(match_id, match_detail)
+        match_batch.append(match_info)
+        participant_batch.extend(participant_infos)
+        if len(match_batch) >= batch_size:
+            saved += save_matches_to_db(match_batch, participant_batch)
+            match_batch.clear()
+            participant_batch.clear()
+    if match_batch:
+        saved += save_matches_to_db(match_batch, participant_batch)
+    logger.info(f"Backfilled {saved} matches from archive.")
+    return saved
+
 if __name__ == "__main__":
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        
-    collected_data = asyncio.run(collect_challenger_summoner_names())
-    
-    collected_unique_match_ids = asyncio.run(collect_challenger_match_id(collected_data))
-    
-    collected_challenger_match_details = asyncio.run(collect_challenger_match_details(collected_unique_match_ids))
-    # print("\n--- Collected Challenger Summoner Data ---")
-    # # 모든 데이터를 출력하는 것은 너무 길 수 있으므로, 상위 10명만 예시로 출력
-    # for i, summoner in enumerate(collected_data[:10]):
-    #     name_to_display = summoner.get('summonerName', '이름 없음')
-    #     lp_to_display = summoner.get('leaguePoints', 'N/A')
-    #     puuid_to_display = summoner.get('puuid', 'N/A')
-    #     print(f"  {i+1}. Name: {name_to_display}, LP: {lp_to_display}, PUUID: {puuid_to_display[:10]}...")
-    # if len(collected_data) > 10:
-    #     print(f"  ... and {len(collected_data) - 10} more players.")
\ No newline at end of file
+
+    configure_logging()
+    args = sys.argv[1:]
+    if '--backfill' in args:
+        # --backfill [아카이브 폴더]: API 없이 아카이브의 원본 응답으로 테이블을 다시 채웁니다.
+        index = args.index('--backfill') + 1
+        ensure_schema()
+        backfill_from_archive(args[index] if index < len(args) and not args[index].startswith('--') else ARCHIVE_DIR)
+    elif '--rebuild-aggregates' in args:
+        # 메타 통계 집계 테이블을 정규화 테이블에서 다시 계산합니다. (복구용)
+        ensure_schema()
+        rebuild_meta_aggregates()
+    elif '--daemon' in args:
+        try:
+            asyncio.run(run_collector_daemon())
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(collect_challenger_pipeline())
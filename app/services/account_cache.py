@@ -0,0 +1,82 @@
+# tft/app/services/account_cache.py
+
+import os
+import datetime
+import threading
+from collections import OrderedDict
+
+from .database import fetch_riot_accounts, save_riot_accounts
+
+# 저장된 Riot ID를 다시 조회하지 않고 사용하는 기간 (시간)
+ACCOUNT_CACHE_TTL_HOURS = float(os.getenv('ACCOUNT_CACHE_TTL_HOURS', 24 * 7))
+# 메모리 LRU에 보관할 최대 계정 수
+ACCOUNT_CACHE_MAX_SIZE = int(os.getenv('ACCOUNT_CACHE_MAX_SIZE', 10000))
+
+
+class AccountCache:
+    """
+    PUUID -> Riot ID 계정 정보 캐시.
+    메모리 LRU를 먼저 보고, 없으면 riot_accounts 테이블에서 한 번에 읽습니다.
+    TTL이 지난 계정은 없는 것으로 취급해 API로 다시 조회하게 합니다.
+    """
+
+    def __init__(self, ttl_hours: float = ACCOUNT_CACHE_TTL_HOURS, max_size: int = ACCOUNT_CACHE_MAX_SIZE):
+        self.ttl = datetime.timedelta(hours=ttl_hours)
+        self.max_size = max_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _fresh(self, account: dict, now: datetime.datetime):
+        return now - account['fetched_at'] < self.ttl
+
+    def _remember(self, account: dict):
+        self.memory[account['puuid']] = account
+        self.memory.move_to_end(account['puuid'])
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def get_many(self, puuids):
+        """
+        아직 유효한 계정 정보를 {puuid: account}로 반환합니다. 결과에 없는 puuid만 API로 조회하면 됩니다.
+        """
+        now = datetime.datetime.now()
+        found = {}
+        missing = []
+        with self.lock:
+            for puuid in puuids:
+                account = self.memory.get(puuid)
+                if account is not None and self._fresh(account, now):
+                    self.memory.move_to_end(puuid)
+                    found[puuid] = account
+                else:
+                    missing.append(puuid)
+
+        if missing:
+            stored = fetch_riot_accounts(missing)
+            with self.lock:
+                for puuid, account in stored.items():
+                    if self._fresh(account, now):
+                        self._remember(account)
+                        found[puuid] = account
+        return found
+
+    def get(self, puuid: str):
+        return self.get_many([puuid]).get(puuid)
+
+    def put_many(self, accounts):
+        """
+        API로 새로 받은 계정 정보들을 메모리와 DB에 저장합니다.
+        """
+        now = datetime.datetime.now()
+        accounts = [
+            {'puuid': account['puuid'], 'gameName': account.get('gameName', ''), 'tagLine': account.get('tagLine', ''), 'fetched_at': now}
+            for account in accounts if account and account.get('puuid')
+        ]
+        with self.lock:
+            for account in accounts:
+                self._remember(account)
+        return save_riot_accounts(accounts)
+
+
+# 프로세스 전체가 공유하는 계정 캐시
+account_cache = AccountCache()
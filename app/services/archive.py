@@ -0,0 +1,231 @@
+# tft/app/services/archive.py
+
+import io
+import os
+import re
+import gzip
+import json
+import time
+import logging
+import threading
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 gzip으로 압축합니다.
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 원본 매치 응답을 저장할 폴더
+ARCHIVE_DIR = os.getenv('MATCH_ARCHIVE_DIR', 'data/match_archive')
+# 수집기에서 아카이브 저장을 할지 여부
+ARCHIVE_ENABLED = os.getenv('MATCH_ARCHIVE_ENABLED', '1') == '1'
+# 세그먼트 파일 하나에 담을 최대 매치 수
+SEGMENT_MAX_RECORDS = int(os.getenv('MATCH_ARCHIVE_SEGMENT_RECORDS', 5000))
+ZSTD_LEVEL = int(os.getenv('MATCH_ARCHIVE_ZSTD_LEVEL', 3))
+
+SEGMENT_SUFFIX = '.jsonl.zst' if zstandard else '.jsonl.gz'
+# 쓰는 중인 세그먼트. 닫힐 때 최종 이름으로 바뀌므로 읽는 쪽은 완성된 세그먼트만 봅니다.
+PARTIAL_SUFFIX = '.part'
+
+_PATCH_PATTERN = re.compile(r'(\d+\.\d+)')
+
+
+def patch_of(game_version: str):
+    """
+    "Version 14.23.636.7002 (...)" 같은 game_version에서 "14.23" 패치 번호를 뽑습니다.
+    """
+    match = _PATCH_PATTERN.search(game_version or '')
+    return match.group(1) if match else 'unknown'
+
+
+def partition_for(tft_set_number, game_version: str):
+    # set=<세트 번호>/patch=<패치> 형태의 파티션 경로
+    return os.path.join(f"set={tft_set_number}", f"patch={patch_of(game_version)}")
+
+
+class _Segment:
+    """
+    하나의 압축 JSONL 세그먼트 파일. 한 줄에 매치 응답 하나를 씁니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = path + PARTIAL_SUFFIX
+        self.file = open(self.partial_path, 'wb')
+        if zstandard:
+            self.stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(self.file, closefd=False)
+        else:
+            self.stream = gzip.GzipFile(fileobj=self.file, mode='wb')
+        self.records = 0
+
+    def write(self, line: bytes):
+        self.stream.write(line)
+        self.records += 1
+
+    def close(self):
+        self.stream.close()
+        self.file.close()
+        os.replace(self.partial_path, self.path)
+
+    def discard(self):
+        self.stream.close()
+        self.file.close()
+        os.remove(self.partial_path)
+
+
+class MatchArchiveWriter:
+    """
+    원본 매치 응답을 파티션(set/patch)별 append-only 압축 세그먼트로 저장합니다.
+    세그먼트가 SEGMENT_MAX_RECORDS개를 채우거나 close()가 호출되면 파일을 닫습니다.
+    시작할 때 이전 실행이 닫지 못하고 남긴 세그먼트(.part)를 먼저 정리합니다.
+    """
+
+    def __init__(self, root: str = ARCHIVE_DIR, segment_max_records: int = SEGMENT_MAX_RECORDS):
+        self.root = root
+        self.segment_max_records = segment_max_records
+        self.segments = {}
+        self.lock = threading.Lock()
+        recover_partial_segments(root)
+
+    def _segment_for(self, partition: str):
+        segment = self.segments.get(partition)
+        if segment is None:
+            directory = os.path.join(self.root, partition)
+            os.makedirs(directory, exist_ok=True)
+            name = f"segment-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{len(os.listdir(directory))}{SEGMENT_SUFFIX}"
+            segment = _Segment(os.path.join(directory, name))
+            self.segments[partition] = segment
+        return segment
+
+    def append_raw(self, body: bytes, partition: str):
+        """
+        API 응답 본문을 다시 직렬화하지 않고 그대로 한 줄로 씁니다.
+        JSON에서 문자열 밖의 줄바꿈은 공백과 같으므로 공백으로 바꿔 한 줄을 유지합니다.
+        """
+        line = body.strip().replace(b'\n', b' ') + b'\n'
+        with self.lock:
+            segment = self._segment_for(partition)
+            segment.write(line)
+            if segment.records >= self.segment_max_records:
+                segment.close()
+                del self.segments[partition]
+
+    def append_raw_many(self, records):
+        # records: [(응답 본문 bytes, 파티션), ...]
+        for body, partition in records:
+            self.append_raw(body, partition)
+
+    def close(self):
+        with self.lock:
+            for segment in self.segments.values():
+                segment.close()
+            self.segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_segment(path: str):
+    if path.removesuffix(PARTIAL_SUFFIX).endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    return gzip.open(path, 'rb')
+
+
+def _writer_alive(partial_path: str) -> bool:
+    # 세그먼트 이름(segment-<시각>-<pid>-<번호>)의 pid 프로세스가 아직 쓰고 있는지 확인합니다.
+    try:
+        pid = int(os.path.basename(partial_path).split('-')[2])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':  # Windows에서는 os.kill(pid, 0)으로 확인할 수 없으므로 끝난 것으로 봅니다.
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _finalize_partial(partial_path: str):
+    """
+    비정상 종료로 남은 세그먼트에서 끝까지 쓰인 줄만 읽어 새 세그먼트(-recovered)로 저장하고 .part 파일을 지웁니다.
+    압축 스트림이 중간에 잘려 있으므로 읽을 수 있는 데까지만 읽습니다.
+    """
+    path = partial_path[:-len(PARTIAL_SUFFIX)]
+    base = path[:-len('.jsonl.zst')] if path.endswith('.jsonl.zst') else path[:-len('.jsonl.gz')]
+    segment = _Segment(base + '-recovered' + SEGMENT_SUFFIX)
+    try:
+        with _open_segment(partial_path) as reader:
+            for line in reader:
+                if line.endswith(b'\n') and line.strip():
+                    segment.write(line)
+    except Exception as e:  # 잘린 압축 스트림의 끝 (EOFError, ZstdError 등)
+        logger.debug(f"Stopped reading partial segment {partial_path}: {e}")
+    if segment.records:
+        segment.close()
+    else:
+        segment.discard()
+    os.remove(partial_path)
+    return segment.records
+
+
+def recover_partial_segments(root: str = ARCHIVE_DIR):
+    """
+    쓰던 프로세스가 끝난 .part 세그먼트를 완성된 세그먼트로 바꾸고, 되살린 매치 수를 반환합니다.
+    아카이브 쓰기 / 읽기를 시작하기 전에 호출합니다.
+    """
+    recovered = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            partial_path = os.path.join(directory, name)
+            if not name.endswith(PARTIAL_SUFFIX) or _writer_alive(partial_path):
+                continue
+            try:
+                records = _finalize_partial(partial_path)
+            except OSError as e:
+                logger.warning(f"Failed to recover partial segment {partial_path}: {e}")
+                continue
+            recovered += records
+            logger.info(f"Recovered {records} matches from partial segment {partial_path}")
+    return recovered
+
+
+def list_segments(root: str = ARCHIVE_DIR, tft_set_number: int = None, patch: str = None):
+    """
+    조건에 맞는 완성된 세그먼트 파일 경로를 이름 순으로 반환합니다.
+    """
+    set_dir = f"set={tft_set_number}" if tft_set_number is not None else None
+    patch_dir = f"patch={patch}" if patch is not None else None
+    paths = []
+    for directory, _, files in os.walk(root):
+        parts = os.path.relpath(directory, root).split(os.sep)
+        if len(parts) != 2:
+            continue
+        if (set_dir and parts[0] != set_dir) or (patch_dir and parts[1] != patch_dir):
+            continue
+        paths.extend(os.path.join(directory, name) for name in files if name.endswith(('.jsonl.zst', '.jsonl.gz')))
+    return sorted(paths)
+
+
+def iter_archived_matches(root: str = ARCHIVE_DIR, tft_set_number: int = None, patch: str = None):
+    """
+    아카이브의 매치 응답을 한 줄씩 풀면서 (match_id, match_detail)로 돌려줍니다.
+    전체를 메모리에 올리지 않고 세그먼트를 스트리밍으로 읽습니다.
+    """
+    for path in list_segments(root, tft_set_number, patch):
+        with _open_segment(path) as reader:
+            for line in reader:
+                if not line.strip():
+                    continue
+                match_detail = json.loads(line)
+                yield match_detail['metadata']['match_id'], match_detail
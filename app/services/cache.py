@@ -0,0 +1,108 @@
+# tft/app/services/cache.py
+
+import os
+import time
+import threading
+
+# 캐시된 값을 세대 번호 확인 없이 그대로 사용하는 시간 (초)
+CACHE_TTL = float(os.getenv('CACHE_TTL', 30))
+# 키(페이지 등)별로 보관할 최대 항목 수
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 256))
+
+
+class CacheEntry:
+    """
+    특정 세대의 값과, 그 값으로 미리 렌더링한 결과(HTML 등)를 함께 보관합니다.
+    """
+
+    def __init__(self, generation, value):
+        self.generation = generation
+        self.value = value
+        self.rendered = {}
+
+    def render(self, key, render):
+        """
+        render(value) 결과를 key별로 한 번만 만들고 이후에는 재사용합니다.
+        """
+        if key not in self.rendered:
+            self.rendered[key] = render(self.value)
+        return self.rendered[key]
+
+
+class GenerationCache:
+    """
+    loader(*args)의 결과를 args별로 메모리에 캐시합니다.
+    TTL 동안은 그대로 반환하고, TTL이 지나면 generation_loader()로 세대 번호만 확인해
+    번호가 바뀌었을 때만 캐시를 비우고 다시 loader()를 호출합니다.
+    (수집기가 데이터를 쓰면 세대 번호가 올라갑니다.)
+    loader가 None을 반환하면 (DB 오류 등) 캐시하지 않고 None을 그대로 반환해 다음 요청이 다시 읽게 합니다.
+    """
+
+    def __init__(self, loader, generation_loader=None, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.loader = loader
+        self.generation_loader = generation_loader
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._generation = None
+        self._checked_at = 0.0
+        self._cleared = 0       # 캐시를 비운 횟수. 읽는 동안 비워졌으면 읽은 값을 저장하지 않습니다.
+        self._lock = threading.Lock()
+        self._key_locks = {}    # args -> 해당 키를 읽는 중인 스레드가 잡는 Lock
+
+    def _fresh(self):
+        return time.monotonic() - self._checked_at < self.ttl
+
+    def get_entry(self, *args) -> CacheEntry:
+        entry = self._entries.get(args)
+        if entry is not None and self._fresh():
+            return entry
+
+        with self._lock:
+            if not self._fresh():
+                generation = self.generation_loader() if self.generation_loader else None
+                if generation is None or generation != self._generation:
+                    self._clear()
+                self._generation = generation
+                self._checked_at = time.monotonic()
+            entry = self._entries.get(args)
+            if entry is not None:
+                return entry
+            key_lock = self._key_locks.setdefault(args, threading.Lock())
+
+        # 같은 키를 동시에 요청한 스레드는 한 번만 DB를 읽고, 다른 키는 기다리지 않고 따로 읽습니다.
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(args)
+                generation = self._generation
+                cleared = self._cleared
+            if entry is not None:
+                return entry
+
+            try:
+                value = self.loader(*args)
+                if value is not None:
+                    entry = CacheEntry(generation, value)
+            finally:
+                with self._lock:
+                    if entry is not None and self._cleared == cleared:
+                        if len(self._entries) >= self.max_entries:
+                            # 가장 먼저 들어온 항목부터 버립니다.
+                            self._entries.pop(next(iter(self._entries)))
+                        self._entries[args] = entry
+                    if self._key_locks.get(args) is key_lock:
+                        del self._key_locks[args]
+            return entry
+
+    def get(self, *args):
+        entry = self.get_entry(*args)
+        return None if entry is None else entry.value
+
+    def _clear(self):
+        self._entries.clear()
+        self._cleared += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._clear()
+            self._checked_at = 0.0
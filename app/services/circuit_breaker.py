@@ -0,0 +1,76 @@
+# tft/app/services/circuit_breaker.py
+
+import os
+import time
+
+# 연속 실패가 이 횟수에 도달하면 회로를 엽니다.
+FAILURE_THRESHOLD = int(os.getenv('RIOT_BREAKER_FAILURES', 5))
+# 회로가 열린 뒤 시험 요청을 보내기까지 기다리는 시간 (초)
+COOLDOWN_SECONDS = float(os.getenv('RIOT_BREAKER_COOLDOWN', 30))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    호스트 하나에 대한 회로 차단기입니다.
+    5xx / 타임아웃이 연속으로 쌓이면 열려서 요청을 바로 실패시키고,
+    cooldown이 지나면 시험 요청 하나만 통과시켜 성공하면 다시 닫습니다.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """
+        지금 요청을 보내도 되는지 반환합니다.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def release_probe(self):
+        """
+        결과를 남기지 못하고 끝난 시험 요청(취소 등)의 자리를 돌려줍니다.
+        cooldown은 이미 지났으므로 다음 allow()가 곧바로 새 시험 요청을 통과시킵니다.
+        """
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+            self.opened_at = time.monotonic() - self.cooldown
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """
+    호스트(kr, asia 등)별 CircuitBreaker를 필요할 때 만들어 보관합니다.
+    """
+
+    def __init__(self):
+        self.breakers = {}
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker()
+        return self.breakers[host]
+
+
+# 모든 riot_api 요청이 공유하는 회로 차단기
+circuit_breakers = CircuitBreakers()
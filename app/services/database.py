@@ -2,84 +2,423 @@
 
 import os
 import json
+import time
+import random
+import logging
+import threading
 import mysql.connector
+from mysql.connector import pooling
+from itertools import islice
 from dotenv import load_dotenv
 
+from .regions import DEFAULT_PLATFORM, DEFAULT_TIER
+from .metrics import DB_BATCH_SECONDS, DB_ROWS_WRITTEN
+from .records import participant_db_row
+
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 DB_HOST = os.getenv('MYSQL_HOST')
 DB_USER = os.getenv('MYSQL_USER')
 DB_PASSWORD = os.getenv('MYSQL_PASSWORD')
 DB_NAME = os.getenv('MYSQL_DATABASE')
 
-def get_db_connection():
+# 연결 풀 설정 (mysql.connector 풀은 최대 32개)
+DB_POOL_NAME = 'tft_pool'
+DB_POOL_SIZE = int(os.getenv('MYSQL_POOL_SIZE', 8))
+# 풀이 비어 있을 때 연결을 기다리는 최대 시간 (초)
+DB_POOL_TIMEOUT = float(os.getenv('MYSQL_POOL_TIMEOUT', 5))
+DB_POOL_RETRY_INTERVAL = 0.05
+DB_PING_ATTEMPTS = 2
+
+# 다중 행 INSERT 한 번(= 트랜잭션 하나)에 저장할 최대 행 수
+DB_BATCH_SIZE = int(os.getenv('MYSQL_BATCH_SIZE', 500))
+
+# IN (...) 조회 한 번에 넣을 최대 값 개수
+IN_QUERY_CHUNK = 1000
+
+# 수집기가 사용하는 보조 테이블 (없으면 생성)
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+        puuid VARCHAR(100) NOT NULL PRIMARY KEY,
+        last_match_id VARCHAR(30),
+        last_game_datetime DATETIME NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_generations (
+        name VARCHAR(50) NOT NULL PRIMARY KEY,
+        generation BIGINT NOT NULL DEFAULT 0
+    );
+    """,
+    # 여러 서버 / 티어(챌린저, 그랜드마스터, 마스터) 플레이어를 함께 저장하기 위한 컬럼
+    """
+    ALTER TABLE challenger_players ADD COLUMN platform VARCHAR(8) NOT NULL DEFAULT 'kr';
+    """,
+    """
+    ALTER TABLE challenger_players ADD COLUMN tier VARCHAR(16) NOT NULL DEFAULT 'challenger';
+    """,
+    # 서버별 리더보드 조회용 커버링 인덱스 (정렬 + 조회 컬럼을 모두 포함)
+    """
+    CREATE INDEX idx_challenger_players_ladder
+        ON challenger_players (platform, league_points DESC, puuid, summoner_name, wins, losses, tier);
+    """,
+    # 특성/유닛/아이템 이름을 정수 ID로 바꾸는 사전 테이블
+    """
+    CREATE TABLE IF NOT EXISTS tft_names (
+        id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        kind TINYINT UNSIGNED NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        UNIQUE KEY uq_tft_names_kind_name (kind, name)
+    );
+    """,
+    # 참가자별 특성 (placement는 집계용으로 함께 저장)
+    """
+    CREATE TABLE IF NOT EXISTS participant_trait (
+        match_id VARCHAR(30) NOT NULL,
+        puuid VARCHAR(100) NOT NULL,
+        trait_id INT UNSIGNED NOT NULL,
+        num_units TINYINT UNSIGNED NOT NULL,
+        style TINYINT UNSIGNED NOT NULL,
+        tier_current TINYINT UNSIGNED NOT NULL,
+        tier_total TINYINT UNSIGNED NOT NULL,
+        placement TINYINT UNSIGNED NOT NULL,
+        PRIMARY KEY (match_id, puuid, trait_id),
+        KEY idx_participant_trait_stats (trait_id, tier_current, placement)
+    );
+    """,
+    # 참가자별 유닛 (slot = 참가자의 units 리스트 내 위치)
+    """
+    CREATE TABLE IF NOT EXISTS participant_unit (
+        match_id VARCHAR(30) NOT NULL,
+        puuid VARCHAR(100) NOT NULL,
+        slot TINYINT UNSIGNED NOT NULL,
+        unit_id INT UNSIGNED NOT NULL,
+        tier TINYINT UNSIGNED NOT NULL,
+        rarity TINYINT UNSIGNED NOT NULL,
+        placement TINYINT UNSIGNED NOT NULL,
+        PRIMARY KEY (match_id, puuid, slot),
+        KEY idx_participant_unit_stats (unit_id, tier, placement)
+    );
+    """,
+    # 유닛별 장착 아이템 (item_slot = 유닛의 itemNames 리스트 내 위치)
+    """
+    CREATE TABLE IF NOT EXISTS unit_item (
+        match_id VARCHAR(30) NOT NULL,
+        puuid VARCHAR(100) NOT NULL,
+        slot TINYINT UNSIGNED NOT NULL,
+        item_slot TINYINT UNSIGNED NOT NULL,
+        unit_id INT UNSIGNED NOT NULL,
+        item_id INT UNSIGNED NOT NULL,
+        placement TINYINT UNSIGNED NOT NULL,
+        PRIMARY KEY (match_id, puuid, slot, item_slot),
+        KEY idx_unit_item_stats (unit_id, item_id, placement),
+        KEY idx_unit_item_item (item_id, placement)
+    );
+    """,
+    # PUUID -> Riot ID (gameName#tagLine) 캐시
+    """
+    CREATE TABLE IF NOT EXISTS riot_accounts (
+        puuid VARCHAR(100) NOT NULL PRIMARY KEY,
+        game_name VARCHAR(50) NOT NULL,
+        tag_line VARCHAR(10) NOT NULL,
+        fetched_at DATETIME NOT NULL
+    );
+    """,
+    # Riot ID(gameName#tagLine)로 PUUID를 찾는 플레이어 페이지용 인덱스
+    """
+    CREATE INDEX idx_riot_accounts_riot_id ON riot_accounts (game_name, tag_line);
+    """,
+    # 플레이어 페이지의 최근 매치 조회용 인덱스
+    """
+    CREATE INDEX idx_match_participants_puuid ON challenger_match_participants (puuid, match_id);
+    """,
+    # 패치(game_version)별 메타 통계 집계 테이블. 참가자 저장 시 증가분만 더하고, 통계 페이지는 여기서 바로 읽습니다.
+    # placement_sum / play_count = 평균 등수, top4_count / play_count = top 4 비율
+    """
+    CREATE TABLE IF NOT EXISTS meta_patch_totals (
+        game_version VARCHAR(100) NOT NULL PRIMARY KEY,
+        tft_set_number INT,
+        match_count INT UNSIGNED NOT NULL DEFAULT 0,
+        board_count INT UNSIGNED NOT NULL DEFAULT 0,
+        KEY idx_meta_patch_totals_set (tft_set_number)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta_unit_stats (
+        game_version VARCHAR(100) NOT NULL,
+        unit_id INT UNSIGNED NOT NULL,
+        play_count INT UNSIGNED NOT NULL,
+        placement_sum INT UNSIGNED NOT NULL,
+        top4_count INT UNSIGNED NOT NULL,
+        PRIMARY KEY (game_version, unit_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta_trait_stats (
+        game_version VARCHAR(100) NOT NULL,
+        trait_id INT UNSIGNED NOT NULL,
+        tier_current TINYINT UNSIGNED NOT NULL,
+        play_count INT UNSIGNED NOT NULL,
+        placement_sum INT UNSIGNED NOT NULL,
+        top4_count INT UNSIGNED NOT NULL,
+        PRIMARY KEY (game_version, trait_id, tier_current)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta_item_stats (
+        game_version VARCHAR(100) NOT NULL,
+        item_id INT UNSIGNED NOT NULL,
+        play_count INT UNSIGNED NOT NULL,
+        placement_sum INT UNSIGNED NOT NULL,
+        top4_count INT UNSIGNED NOT NULL,
+        PRIMARY KEY (game_version, item_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta_unit_item_stats (
+        game_version VARCHAR(100) NOT NULL,
+        unit_id INT UNSIGNED NOT NULL,
+        item_id INT UNSIGNED NOT NULL,
+        play_count INT UNSIGNED NOT NULL,
+        placement_sum INT UNSIGNED NOT NULL,
+        top4_count INT UNSIGNED NOT NULL,
+        PRIMARY KEY (game_version, unit_id, item_id)
+    );
+    """,
+    # comp = 활성 특성 "trait_id:tier_current"를 trait_id 순으로 이은 문자열
+    """
+    CREATE TABLE IF NOT EXISTS meta_comp_stats (
+        game_version VARCHAR(100) NOT NULL,
+        comp VARCHAR(255) NOT NULL,
+        play_count INT UNSIGNED NOT NULL,
+        placement_sum INT UNSIGNED NOT NULL,
+        top4_count INT UNSIGNED NOT NULL,
+        PRIMARY KEY (game_version, comp)
+    );
+    """,
+    # 집계에 이미 반영된 매치. 같은 매치를 다시 저장해도 두 번 더하지 않습니다.
+    # batch_token: 이 행을 넣은 update_meta_aggregates 호출의 임의 값 (INSERT IGNORE로 실제 추가된 행 구분용)
+    """
+    CREATE TABLE IF NOT EXISTS meta_aggregated_matches (
+        match_id VARCHAR(30) NOT NULL PRIMARY KEY,
+        batch_token BIGINT UNSIGNED NOT NULL DEFAULT 0
+    );
+    """,
+]
+
+# 메타 통계 집계 테이블 -> 키 컬럼
+META_AGGREGATE_TABLES = {
+    'meta_unit_stats': ('unit_id',),
+    'meta_trait_stats': ('trait_id', 'tier_current'),
+    'meta_item_stats': ('item_id',),
+    'meta_unit_item_stats': ('unit_id', 'item_id'),
+    'meta_comp_stats': ('comp',),
+}
+# 집계에서 top 4로 보는 등수
+META_TOP4_PLACEMENT = 4
+# 집계 반영 트랜잭션이 교착 상태(1213) / 잠금 대기 시간 초과(1205)로 실패했을 때 다시 시도하는 횟수와 간격 (초)
+META_AGGREGATE_ATTEMPTS = int(os.getenv('META_AGGREGATE_ATTEMPTS', 3))
+META_AGGREGATE_RETRY_DELAY = 0.2
+RETRYABLE_ERRNOS = (1205, 1213)
+
+# tft_names.kind 값
+NAME_KIND_TRAIT = 1
+NAME_KIND_UNIT = 2
+NAME_KIND_ITEM = 3
+
+# 챌린저 리더보드 캐시의 세대 이름
+LEADERBOARD_CACHE = 'challenger_players'
+# 매치 참가자 데이터(메타 통계) 캐시의 세대 이름
+PARTICIPANTS_CACHE = 'match_participants'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# (kind, name) -> tft_names.id. 이름은 거의 바뀌지 않으므로 프로세스 안에서 계속 재사용합니다.
+_name_ids = {}
+_name_ids_lock = threading.Lock()
+
+def _get_pool():
+    # 프로세스당 하나의 연결 풀을 처음 사용할 때 만듭니다. (Flask 스레드 / 수집기 스레드 공용)
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=DB_POOL_NAME,
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=True,
+                    host=DB_HOST,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    database=DB_NAME,
+                )
+                logger.debug(f"Created MySQL connection pool (size {DB_POOL_SIZE}).")
+    return _pool
+
+def get_db_connection(timeout: float = DB_POOL_TIMEOUT):
+    """
+    연결 풀에서 MySQL 연결 객체를 빌려 반환합니다. close()를 호출하면 풀로 돌아갑니다.
+    풀이 비어 있으면 timeout초까지 기다리고, 빌린 연결은 ping으로 확인해 끊겼으면 다시 연결합니다.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = _get_pool().get_connection()
+        except pooling.PoolError:
+            if time.monotonic() >= deadline:
+                logger.error(f"Error connecting to MySQL: no pooled connection available after {timeout}s")
+                return None
+            time.sleep(DB_POOL_RETRY_INTERVAL)
+            continue
+        except mysql.connector.Error as err:
+            logger.error(f"Error connecting to MySQL: {err}")
+            return None
+
+        try:
+            conn.ping(reconnect=True, attempts=DB_PING_ATTEMPTS, delay=0)
+            return conn
+        except mysql.connector.Error as err:
+            logger.error(f"Error connecting to MySQL: {err}")
+            conn.close()
+            return None
+
+def get_bulk_load_connection():
     """
-    MySQL 데이터베이스 연결 객체를 반환합니다.
+    LOAD DATA LOCAL INFILE용 연결을 반환합니다. 로컬 파일 읽기를 허용해야 하므로 풀을 쓰지 않습니다.
     """
     try:
-        conn = mysql.connector.connect(
+        return mysql.connector.connect(
             host=DB_HOST,
             user=DB_USER,
             password=DB_PASSWORD,
             database=DB_NAME,
-            # multi_statements=True  # <-- 이 라인을 다시 삭제합니다.
+            allow_local_infile=True,
         )
-        print("DEBUG: Successfully connected to MySQL database.")
-        return conn
     except mysql.connector.Error as err:
-        print(f"Error connecting to MySQL: {err}")
+        logger.error(f"Error connecting to MySQL: {err}")
         return None
 
-def save_challenger_player(player_data: dict):
+def ensure_schema():
     """
-    단일 챌린저 플레이어 데이터를 데이터베이스에 저장합니다.
-    PUUID가 이미 존재하면 REPLACE INTO를 사용하여 업데이트합니다.
+    SCHEMA_STATEMENTS의 테이블/컬럼/인덱스를 생성합니다. 이미 존재하면 무시합니다.
     """
     conn = None
+    cursor = None
     try:
         conn = get_db_connection()
         if conn is None:
             return False
 
         cursor = conn.cursor()
-
-        sql = """
-        REPLACE INTO challenger_players 
-            (puuid, summoner_name, league_points, wins, losses)
-        VALUES 
-            (%s, %s, %s, %s, %s);
-        """
-        
-        values = (
-            player_data.get('puuid'),
-            #player_data.get('summonerId'),
-            player_data.get('summonerName'),
-            #player_data.get('summonerLevel'),
-            player_data.get('leaguePoints'),
-            player_data.get('wins'),
-            player_data.get('losses')
-        )
-        
-        cursor.execute(sql, values)
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as err:
+                # 1060: 이미 존재하는 컬럼, 1061: 이미 존재하는 인덱스
+                if err.errno not in (1060, 1061):
+                    raise
         conn.commit()
-        print(f"DEBUG: Saved/Updated player '{player_data.get('summonerName')}' (PUUID: {player_data.get('puuid')[:10]}...).")
         return True
 
     except mysql.connector.Error as err:
-        print(f"Error saving player data to MySQL: {err}")
+        logger.error(f"Error creating schema in MySQL: {err}")
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def _batches(rows, batch_size: int):
+    # 임의의 iterable을 batch_size 크기의 리스트로 나눕니다.
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def insert_in_batches(head: str, tail: str, rows, batch_size: int, label: str):
+    """
+    rows를 batch_size 단위로 나눠 "head VALUES (...), (...), ... tail" 형태의
+    다중 행 INSERT 하나로 저장하고, 배치마다 한 번씩 커밋합니다.
+    실패한 배치는 롤백하고 중단하며, 커밋까지 끝난 행 수를 반환합니다.
+    """
+    conn = None
+    cursor = None
+    written = 0
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return written
+
+        cursor = conn.cursor()
+        for batch in _batches(rows, batch_size):
+            started_at = time.perf_counter()
+            placeholder = '(' + ', '.join(['%s'] * len(batch[0])) + ')'
+            sql = f"{head} VALUES {', '.join([placeholder] * len(batch))} {tail}"
+            cursor.execute(sql, [value for row in batch for value in row])
+            conn.commit()
+            written += len(batch)
+            DB_BATCH_SECONDS.observe(time.perf_counter() - started_at, label)
+            DB_ROWS_WRITTEN.inc(label, amount=len(batch))
+        return written
+
+    except Exception as err:
+        logger.error(f"Error saving {label} to MySQL: {err}")
         if conn:
             conn.rollback()
-        return False
+        return written
     finally:
-        if conn and conn.is_connected():
+        if cursor:
             cursor.close()
-            conn.close()
+        close_db_connection(conn)
 
-def fetch_all_challenger_players():
+def save_challenger_players(players, batch_size: int = DB_BATCH_SIZE):
     """
-    데이터베이스에서 모든 챌린저 플레이어 데이터를 가져옵니다.
+    챌린저 플레이어 데이터 여러 개를 배치 단위로 저장하고, 저장된 행 수를 반환합니다.
+    PUUID가 이미 존재하면 REPLACE INTO를 사용하여 업데이트합니다.
+    그랜드마스터 / 마스터 플레이어도 platform, tier 값과 함께 같은 테이블에 저장합니다.
+    """
+    head = "REPLACE INTO challenger_players (puuid, summoner_name, league_points, wins, losses, platform, tier)"
+    rows = (
+        (
+            player_data.get('puuid'),
+            player_data.get('summonerName'),
+            player_data.get('leaguePoints'),
+            player_data.get('wins'),
+            player_data.get('losses'),
+            player_data.get('platform', DEFAULT_PLATFORM),
+            player_data.get('tier', DEFAULT_TIER),
+        )
+        for player_data in players
+    )
+    written = insert_in_batches(head, '', rows, batch_size, 'player data')
+    if written:
+        bump_cache_generation(LEADERBOARD_CACHE)
+    return written
+
+def save_challenger_player(player_data: dict):
+    """
+    단일 챌린저 플레이어 데이터를 데이터베이스에 저장합니다.
+    """
+    return save_challenger_players([player_data]) == 1
+
+# 리더보드 조회 컬럼. 승률은 SQL에서 계산합니다.
+LEADERBOARD_COLUMNS = """
+    puuid, summoner_name, league_points, wins, losses, tier,
+    ROUND(100 * wins / NULLIF(wins + losses, 0), 1) AS win_rate
+"""
+
+def fetch_all_challenger_players(platform: str = DEFAULT_PLATFORM):
+    """
+    데이터베이스에서 해당 서버의 모든 플레이어 데이터를 가져옵니다.
     """
     conn = None
+    cursor = None
     players = []
     try:
         conn = get_db_connection()
@@ -87,118 +426,731 @@ def fetch_all_challenger_players():
             return []
 
         cursor = conn.cursor(dictionary=True) # dictionary=True로 설정하여 결과를 딕셔너리 형태로 받습니다.
-        sql = "SELECT puuid, summoner_id, summoner_name, summoner_level, league_points, wins, losses, last_updated FROM challenger_players ORDER BY league_points DESC;"
-        cursor.execute(sql)
+        sql = f"SELECT {LEADERBOARD_COLUMNS} FROM challenger_players WHERE platform = %s ORDER BY league_points DESC, puuid;"
+        cursor.execute(sql, (platform,))
         players = cursor.fetchall() # 모든 결과 가져오기
-        print(f"DEBUG: Fetched {len(players)} players from database.")
+        logger.debug(f"Fetched {len(players)} players from database.")
         return players
 
     except mysql.connector.Error as err:
-        print(f"Error fetching player data from MySQL: {err}")
+        logger.error(f"Error fetching player data from MySQL: {err}")
         return []
     finally:
-        if conn and conn.is_connected():
+        if cursor:
             cursor.close()
-            conn.close()
+        close_db_connection(conn)
 
-def save_match_details_to_db(match_details):
+def fetch_challenger_players_page(limit: int, after_league_points: int = None, after_puuid: str = None, platform: str = DEFAULT_PLATFORM):
     """
-    match_id 리스트를 challenger_match_ids 테이블에 저장합니다.
-    이미 존재하는 match_id는 무시하고, 새로 추가합니다.
+    해당 서버에서 (league_points 내림차순, puuid 오름차순) 기준으로 커서 다음의 플레이어 limit명을 가져옵니다.
+    커서가 없으면 첫 페이지를 반환합니다. OFFSET 없이 인덱스 위치에서 바로 읽습니다.
+    DB 오류면 None을 반환합니다. (빈 페이지와 구분해 캐시하지 않도록)
     """
     conn = None
+    cursor = None
     try:
         conn = get_db_connection()
         if conn is None:
-            return False
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        if after_league_points is None:
+            sql = f"""
+            SELECT {LEADERBOARD_COLUMNS} FROM challenger_players
+            WHERE platform = %s
+            ORDER BY league_points DESC, puuid
+            LIMIT %s;
+            """
+            cursor.execute(sql, (platform, limit))
+        else:
+            sql = f"""
+            SELECT {LEADERBOARD_COLUMNS} FROM challenger_players
+            WHERE platform = %s AND (league_points < %s OR (league_points = %s AND puuid > %s))
+            ORDER BY league_points DESC, puuid
+            LIMIT %s;
+            """
+            cursor.execute(sql, (platform, after_league_points, after_league_points, after_puuid, limit))
+        return cursor.fetchall()
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching player page from MySQL: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def save_match_details_to_db(match_details, batch_size: int = DB_BATCH_SIZE):
+    """
+    매치 상세 정보를 challenger_match_details 테이블에 배치 단위로 저장합니다.
+    이미 존재하는 match_id는 갱신하며, 저장된 행 수를 반환합니다.
+    """
+    head = """
+    INSERT IGNORE INTO challenger_match_details 
+    (match_id, game_datetime, game_length, game_version, queue_id, tft_set_number, tft_set_core_name)
+    """
+    tail = """
+    ON DUPLICATE KEY UPDATE 
+        game_datetime=VALUES(game_datetime),
+        game_length=VALUES(game_length),
+        game_version=VALUES(game_version),
+        queue_id=VALUES(queue_id),
+        tft_set_number=VALUES(tft_set_number)
+    """
+    # MatchRow의 필드 순서가 컬럼 순서와 같으므로 그대로 넘깁니다.
+    return insert_in_batches(head, tail, match_details, batch_size, 'match details')
+
+def save_participant_details_to_db(participant_details, batch_size: int = DB_BATCH_SIZE):
+    """
+    참가자 정보를 challenger_match_participants 테이블에 배치 단위로 저장하고, 저장된 행 수를 반환합니다.
+    """
+    head = """
+        INSERT IGNORE INTO challenger_match_participants
+        (match_id, puuid, placement, level, gold_left, last_round, players_eliminated, total_damage_to_players, traits, units)
+    """
+    tail = """
+        ON DUPLICATE KEY UPDATE
+            placement=VALUES(placement),
+            level=VALUES(level),
+            gold_left=VALUES(gold_left),
+            last_round=VALUES(last_round),
+            players_eliminated=VALUES(players_eliminated),
+            total_damage_to_players=VALUES(total_damage_to_players),
+            traits=VALUES(traits),
+            units=VALUES(units)
+    """
+    rows = (participant_db_row(p) for p in participant_details)
+    return insert_in_batches(head, tail, rows, batch_size, 'participant details')
+
+def save_matches_to_db(match_details, participant_details, batch_size: int = DB_BATCH_SIZE):
+    """
+    매치와 참가자를 참가자 -> 정규화 테이블 -> 메타 통계 집계 -> 매치 순서로 저장하고, 저장된 매치 수를 반환합니다.
+    앞 단계가 모두 저장되지 않으면 뒤 단계는 건너뛰고 0을 반환하므로, challenger_match_details에 있는 매치는
+    나머지가 모두 저장된 매치입니다. (fetch_known_match_ids가 이 테이블로 다시 받지 않을 매치를 고릅니다)
+    모든 단계가 같은 매치를 다시 저장해도 안전하므로 실패한 매치는 다시 받아 그대로 저장하면 됩니다.
+    """
+    if not isinstance(match_details, list):
+        match_details = list(match_details)
+    if not isinstance(participant_details, list):
+        participant_details = list(participant_details)
+    if save_participant_details_to_db(participant_details, batch_size) != len(participant_details):
+        return 0
+    if not save_participant_components_to_db(participant_details, batch_size):
+        return 0
+    aggregated = update_meta_aggregates(match_details, participant_details, batch_size)
+    if aggregated is None:
+        return 0
+    if aggregated:
+        bump_cache_generation(PARTICIPANTS_CACHE)
+    written = save_match_details_to_db(match_details, batch_size)
+    return written if written == len(match_details) else 0
+
+def resolve_name_ids(kind: int, names):
+    """
+    특성/유닛/아이템 이름을 tft_names의 정수 ID로 바꾼 {name: id} 딕셔너리를 반환합니다.
+    처음 보는 이름은 한 번에 추가한 뒤 ID를 읽어옵니다.
+    """
+    names = set(names)
+    with _name_ids_lock:
+        missing = [name for name in names if (kind, name) not in _name_ids]
+    if missing:
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            if conn is None:
+                return {}
+
+            cursor = conn.cursor()
+            for i in range(0, len(missing), IN_QUERY_CHUNK):
+                chunk = missing[i:i + IN_QUERY_CHUNK]
+                values = ', '.join(['(%s, %s)'] * len(chunk))
+                cursor.execute(f"INSERT IGNORE INTO tft_names (kind, name) VALUES {values};",
+                               [value for name in chunk for value in (kind, name)])
+                conn.commit()
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"SELECT name, id FROM tft_names WHERE kind = %s AND name IN ({placeholders});",
+                               [kind] + chunk)
+                with _name_ids_lock:
+                    for name, name_id in cursor:
+                        _name_ids[(kind, name)] = name_id
+
+        except mysql.connector.Error as err:
+            logger.error(f"Error resolving tft name ids in MySQL: {err}")
+            if conn:
+                conn.rollback()
+            return {}
+        finally:
+            if cursor:
+                cursor.close()
+            close_db_connection(conn)
+
+    with _name_ids_lock:
+        return {name: _name_ids[(kind, name)] for name in names if (kind, name) in _name_ids}
+
+def save_participant_components_to_db(participant_details, batch_size: int = DB_BATCH_SIZE):
+    """
+    참가자의 traits / units (및 유닛 아이템)를 participant_trait, participant_unit, unit_item
+    테이블에 정수 ID로 풀어서 배치 저장하고, 모든 행이 저장되었는지 반환합니다.
+    이름을 ID로 바꾸지 못해 빠진 행이 있어도 실패입니다.
+    """
+    trait_ids = resolve_name_ids(NAME_KIND_TRAIT, (
+        trait.name for p in participant_details for trait in p.traits
+    ))
+    unit_ids = resolve_name_ids(NAME_KIND_UNIT, (
+        unit.character_id for p in participant_details for unit in p.units
+    ))
+    item_ids = resolve_name_ids(NAME_KIND_ITEM, (
+        item for p in participant_details for unit in p.units for item in unit.item_names
+    ))
+
+    trait_rows = (
+        (p.match_id, p.puuid, trait_ids[trait.name], trait.num_units, trait.style,
+         trait.tier_current, trait.tier_total, p.placement)
+        for p in participant_details for trait in p.traits
+        if trait.name in trait_ids
+    )
+    unit_rows = (
+        (p.match_id, p.puuid, slot, unit_ids[unit.character_id], unit.tier, unit.rarity, p.placement)
+        for p in participant_details for slot, unit in enumerate(p.units)
+        if unit.character_id in unit_ids
+    )
+    item_rows = (
+        (p.match_id, p.puuid, slot, item_slot, unit_ids[unit.character_id], item_ids[item], p.placement)
+        for p in participant_details for slot, unit in enumerate(p.units)
+        for item_slot, item in enumerate(unit.item_names)
+        if unit.character_id in unit_ids and item in item_ids
+    )
+
+    expected_traits = sum(len(p.traits) for p in participant_details)
+    expected_units = sum(len(p.units) for p in participant_details)
+    expected_items = sum(len(unit.item_names) for p in participant_details for unit in p.units)
+    # 앞 테이블이 실패하면 뒤 테이블은 저장하지 않습니다. (다시 저장할 때 REPLACE로 덮어씁니다)
+    return (
+        insert_in_batches(
+            "REPLACE INTO participant_trait (match_id, puuid, trait_id, num_units, style, tier_current, tier_total, placement)",
+            '', trait_rows, batch_size, 'participant traits') == expected_traits
+        and insert_in_batches(
+            "REPLACE INTO participant_unit (match_id, puuid, slot, unit_id, tier, rarity, placement)",
+            '', unit_rows, batch_size, 'participant units') == expected_units
+        and insert_in_batches(
+            "REPLACE INTO unit_item (match_id, puuid, slot, item_slot, unit_id, item_id, placement)",
+            '', item_rows, batch_size, 'unit items') == expected_items
+    )
+
+def comp_signature(traits, trait_ids: dict) -> str:
+    """
+    활성 특성(tier_current > 0)을 "trait_id:tier_current,..." 형태(trait_id 순)로 이은 조합 키를 반환합니다.
+    rebuild_meta_aggregates의 GROUP_CONCAT과 같은 형식입니다.
+    """
+    active = sorted(
+        (trait_ids[trait.name], trait.tier_current)
+        for trait in traits if trait.tier_current > 0 and trait.name in trait_ids
+    )
+    return ','.join(f"{trait_id}:{tier}" for trait_id, tier in active)
+
+def _aggregate_participants(participant_details, game_versions: dict):
+    """
+    참가자 목록을 {집계 테이블: {(game_version, *키): [play_count, placement_sum, top4_count]}}와
+    {game_version: [tft_set_number, 매치 수, 보드 수]}로 합칩니다.
+    보드(참가자) 하나에서 같은 키는 한 번만 셉니다. (같은 유닛 2개, 같은 아이템 여러 개)
+    """
+    trait_ids = resolve_name_ids(NAME_KIND_TRAIT, (trait.name for p in participant_details for trait in p.traits))
+    unit_ids = resolve_name_ids(NAME_KIND_UNIT, (unit.character_id for p in participant_details for unit in p.units))
+    item_ids = resolve_name_ids(NAME_KIND_ITEM, (
+        item for p in participant_details for unit in p.units for item in unit.item_names
+    ))
+
+    counts = {table: {} for table in META_AGGREGATE_TABLES}
+    totals = {}
+    matches = set()
+
+    def add(table, key, placement):
+        entry = counts[table].get(key)
+        if entry is None:
+            entry = counts[table][key] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += placement
+        entry[2] += placement <= META_TOP4_PLACEMENT
+
+    for p in participant_details:
+        game_version, tft_set_number = game_versions[p.match_id]
+        total = totals.get(game_version)
+        if total is None:
+            total = totals[game_version] = [tft_set_number, 0, 0]
+        if p.match_id not in matches:
+            matches.add(p.match_id)
+            total[1] += 1
+        total[2] += 1
+
+        board_units = set()
+        board_items = set()
+        board_unit_items = set()
+        for unit in p.units:
+            unit_id = unit_ids.get(unit.character_id)
+            if unit_id is None:
+                continue
+            board_units.add(unit_id)
+            for item in unit.item_names:
+                item_id = item_ids.get(item)
+                if item_id is not None:
+                    board_items.add(item_id)
+                    board_unit_items.add((unit_id, item_id))
+        for unit_id in board_units:
+            add('meta_unit_stats', (game_version, unit_id), p.placement)
+        for item_id in board_items:
+            add('meta_item_stats', (game_version, item_id), p.placement)
+        for unit_id, item_id in board_unit_items:
+            add('meta_unit_item_stats', (game_version, unit_id, item_id), p.placement)
+        for trait in p.traits:
+            if trait.tier_current > 0 and trait.name in trait_ids:
+                add('meta_trait_stats', (game_version, trait_ids[trait.name], trait.tier_current), p.placement)
+        comp = comp_signature(p.traits, trait_ids)
+        if comp:
+            add('meta_comp_stats', (game_version, comp), p.placement)
+    return counts, totals
+
+def _execute_in_batches(cursor, head: str, tail: str, rows, batch_size: int):
+    # insert_in_batches와 같은 다중 행 INSERT를 실행하되 커밋하지 않습니다. (호출한 쪽 트랜잭션에 포함)
+    for batch in _batches(rows, batch_size):
+        placeholder = '(' + ', '.join(['%s'] * len(batch[0])) + ')'
+        cursor.execute(f"{head} VALUES {', '.join([placeholder] * len(batch))} {tail}",
+                       [value for row in batch for value in row])
+
+def _apply_meta_aggregates(cursor, participant_details, game_versions: dict, candidates: list, batch_size: int):
+    """
+    update_meta_aggregates의 트랜잭션 본문. 반영한 매치 수를 반환하며 커밋은 호출한 쪽에서 합니다.
+    """
+    # 반영 기록을 먼저 넣고, 이번 호출이 실제로 넣은 행(= 이 호출의 token을 가진 행)의 매치만 집계합니다.
+    # 이미 있던 행은 INSERT IGNORE가 건너뛰고, 다른 트랜잭션이 넣는 중인 행은 그 트랜잭션이 끝날 때까지 기다린 뒤 건너뜁니다.
+    token = random.getrandbits(63)
+    _execute_in_batches(cursor, "INSERT IGNORE INTO meta_aggregated_matches (match_id, batch_token)", '',
+                        ((match_id, token) for match_id in candidates), batch_size)
+    inserted = set()
+    for i in range(0, len(candidates), IN_QUERY_CHUNK):
+        chunk = candidates[i:i + IN_QUERY_CHUNK]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(f"""
+        SELECT match_id FROM meta_aggregated_matches WHERE batch_token = %s AND match_id IN ({placeholders});
+        """, [token] + chunk)
+        inserted.update(match_id for (match_id,) in cursor)
+
+    new_participants = [p for p in participant_details if p.match_id in inserted]
+    if not new_participants:
+        return 0
+
+    counts, totals = _aggregate_participants(new_participants, game_versions)
+    tail = """
+    ON DUPLICATE KEY UPDATE
+        play_count = play_count + VALUES(play_count),
+        placement_sum = placement_sum + VALUES(placement_sum),
+        top4_count = top4_count + VALUES(top4_count)
+    """
+    # 여러 수집기가 같은 집계 행을 갱신할 때 잠금 순서가 엇갈려 교착 상태가 생기지 않도록 키 순서로 씁니다.
+    for table, keys in META_AGGREGATE_TABLES.items():
+        head = f"INSERT INTO {table} (game_version, {', '.join(keys)}, play_count, placement_sum, top4_count)"
+        rows = (key + tuple(entry) for key, entry in sorted(counts[table].items()))
+        _execute_in_batches(cursor, head, tail, rows, batch_size)
+    _execute_in_batches(
+        cursor, "INSERT INTO meta_patch_totals (game_version, tft_set_number, match_count, board_count)", """
+        ON DUPLICATE KEY UPDATE
+            match_count = match_count + VALUES(match_count),
+            board_count = board_count + VALUES(board_count)
+        """, ((game_version, *total) for game_version, total in sorted(totals.items())), batch_size)
+    return len(inserted)
+
+def update_meta_aggregates(match_details, participant_details, batch_size: int = DB_BATCH_SIZE):
+    """
+    매치의 참가자를 패치별 메타 통계 집계 테이블에 더하고, 반영한 매치 수를 반환합니다.
+    패치는 match_details(MatchRow)에서 읽으며, match_details에 없는 매치의 참가자는 건너뜁니다.
+    meta_aggregated_matches에 이미 있는 매치는 건너뛰며, 집계와 반영 기록을 한 트랜잭션으로 저장하므로
+    같은 매치를 다시 저장하거나 중간에 실패해도 두 번 더해지지 않습니다.
+    교착 상태 / 잠금 대기 시간 초과는 META_AGGREGATE_ATTEMPTS번까지 다시 시도하고, 그래도 실패하면 None을 반환합니다.
+    한 매치의 참가자는 한 번에 함께 저장된다고 가정합니다.
+    """
+    if not isinstance(participant_details, list):
+        participant_details = list(participant_details)
+    game_versions = {match.match_id: (match.game_version, match.tft_set_number) for match in match_details}
+    match_ids = sorted({p.match_id for p in participant_details if p.match_id in game_versions})
+    if not match_ids:
+        return 0
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return None
 
         cursor = conn.cursor()
+        for attempt in range(1, META_AGGREGATE_ATTEMPTS + 1):
+            started_at = time.perf_counter()
+            try:
+                aggregated = _apply_meta_aggregates(cursor, participant_details, game_versions, match_ids, batch_size)
+                conn.commit()
+            except mysql.connector.Error as err:
+                conn.rollback()
+                if err.errno not in RETRYABLE_ERRNOS or attempt == META_AGGREGATE_ATTEMPTS:
+                    raise
+                logger.warning(f"Retrying meta aggregates after MySQL error: {err}", extra={'attempt': attempt})
+                time.sleep(META_AGGREGATE_RETRY_DELAY * attempt)
+                continue
+            DB_BATCH_SECONDS.observe(time.perf_counter() - started_at, 'meta aggregates')
+            DB_ROWS_WRITTEN.inc('meta aggregates', amount=aggregated)
+            return aggregated
 
-        sql = """
-        INSERT IGNORE INTO challenger_match_details 
-        (match_id, game_datetime, game_length, game_version, queue_id, tft_set_number, tft_set_core_name)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            game_datetime=VALUES(game_datetime),
-            game_length=VALUES(game_length),
-            game_version=VALUES(game_version),
-            queue_id=VALUES(queue_id),
-            tft_set_number=VALUES(tft_set_number);
-        """
+    except mysql.connector.Error as err:
+        logger.error(f"Error updating meta aggregates in MySQL: {err}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
 
-        for match in match_details:
-            cursor.execute(sql, (
-                match['match_id'],
-                match['game_datetime'],
-                match['game_length'],
-                match['game_version'],
-                match['queue_id'],
-                match['tft_set_number'],
-                match['tft_set_core_name']
-            ))
+# rebuild_meta_aggregates가 정규화 테이블에서 집계를 다시 만드는 쿼리.
+# 보드(match_id, puuid)마다 같은 키는 한 번만 세도록 DISTINCT로 먼저 줄입니다.
+_META_REBUILD_STATEMENTS = [
+    """
+    INSERT INTO meta_patch_totals (game_version, tft_set_number, match_count, board_count)
+    SELECT d.game_version, MAX(d.tft_set_number), COUNT(DISTINCT p.match_id), COUNT(*)
+    FROM challenger_match_participants p JOIN challenger_match_details d ON d.match_id = p.match_id
+    GROUP BY d.game_version;
+    """,
+    """
+    INSERT INTO meta_unit_stats (game_version, unit_id, play_count, placement_sum, top4_count)
+    SELECT d.game_version, u.unit_id, COUNT(*), SUM(u.placement), SUM(u.placement <= %(top4)s)
+    FROM (SELECT DISTINCT match_id, puuid, unit_id, placement FROM participant_unit) u
+    JOIN challenger_match_details d ON d.match_id = u.match_id
+    GROUP BY d.game_version, u.unit_id;
+    """,
+    """
+    INSERT INTO meta_trait_stats (game_version, trait_id, tier_current, play_count, placement_sum, top4_count)
+    SELECT d.game_version, t.trait_id, t.tier_current, COUNT(*), SUM(t.placement), SUM(t.placement <= %(top4)s)
+    FROM participant_trait t JOIN challenger_match_details d ON d.match_id = t.match_id
+    WHERE t.tier_current > 0
+    GROUP BY d.game_version, t.trait_id, t.tier_current;
+    """,
+    """
+    INSERT INTO meta_item_stats (game_version, item_id, play_count, placement_sum, top4_count)
+    SELECT d.game_version, i.item_id, COUNT(*), SUM(i.placement), SUM(i.placement <= %(top4)s)
+    FROM (SELECT DISTINCT match_id, puuid, item_id, placement FROM unit_item) i
+    JOIN challenger_match_details d ON d.match_id = i.match_id
+    GROUP BY d.game_version, i.item_id;
+    """,
+    """
+    INSERT INTO meta_unit_item_stats (game_version, unit_id, item_id, play_count, placement_sum, top4_count)
+    SELECT d.game_version, i.unit_id, i.item_id, COUNT(*), SUM(i.placement), SUM(i.placement <= %(top4)s)
+    FROM (SELECT DISTINCT match_id, puuid, unit_id, item_id, placement FROM unit_item) i
+    JOIN challenger_match_details d ON d.match_id = i.match_id
+    GROUP BY d.game_version, i.unit_id, i.item_id;
+    """,
+    """
+    INSERT INTO meta_comp_stats (game_version, comp, play_count, placement_sum, top4_count)
+    SELECT d.game_version, c.comp, COUNT(*), SUM(c.placement), SUM(c.placement <= %(top4)s)
+    FROM (
+        SELECT match_id, MAX(placement) AS placement,
+               GROUP_CONCAT(CONCAT(trait_id, ':', tier_current) ORDER BY trait_id SEPARATOR ',') AS comp
+        FROM participant_trait WHERE tier_current > 0
+        GROUP BY match_id, puuid
+    ) c
+    JOIN challenger_match_details d ON d.match_id = c.match_id
+    GROUP BY d.game_version, c.comp;
+    """,
+    """
+    INSERT INTO meta_aggregated_matches (match_id)
+    SELECT DISTINCT p.match_id
+    FROM challenger_match_participants p JOIN challenger_match_details d ON d.match_id = p.match_id;
+    """,
+]
+
+def rebuild_meta_aggregates():
+    """
+    메타 통계 집계 테이블을 비우고 정규화 테이블(participant_unit / participant_trait / unit_item)에서 다시 계산합니다.
+    집계가 어긋났을 때의 복구용이며, 한 트랜잭션으로 실행하므로 중간에 실패하면 기존 집계가 그대로 남습니다.
+    수집기가 함께 쓰고 있으면 잠금 대기가 길어지므로 수집기를 멈춘 뒤 실행하는 것이 좋습니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return False
+
+        cursor = conn.cursor()
+        # comp 문자열이 GROUP_CONCAT 기본 길이(1024)에서 잘리지 않도록 늘립니다.
+        cursor.execute("SET SESSION group_concat_max_len = 4096;")
+        for table in (*META_AGGREGATE_TABLES, 'meta_patch_totals', 'meta_aggregated_matches'):
+            cursor.execute(f"DELETE FROM {table};")
+        for statement in _META_REBUILD_STATEMENTS:
+            cursor.execute(statement, {'top4': META_TOP4_PLACEMENT})
         conn.commit()
-        print(f"DEBUG: Saved/Updated {len(match_details)} match details to DB.")
+        bump_cache_generation(PARTICIPANTS_CACHE)
+        logger.info("Rebuilt meta aggregates.")
         return True
 
-    except Exception as err:
-        print(f"Error saving match ids to MySQL: {err}")
+    except mysql.connector.Error as err:
+        logger.error(f"Error rebuilding meta aggregates in MySQL: {err}")
         if conn:
             conn.rollback()
         return False
     finally:
-        if conn:
+        if cursor:
             cursor.close()
-            conn.close()
+        close_db_connection(conn)
 
-def save_participant_details_to_db(participant_details):
+def fetch_known_match_ids(match_ids=None):
+    """
+    challenger_match_details에 이미 저장된 match_id 집합을 반환합니다.
+    save_matches_to_db가 매치 행을 마지막에 저장하므로 참가자 / 집계까지 모두 저장된 매치만 포함됩니다.
+    match_ids가 주어지면 그 중 저장된 것만 PK 인덱스로 묶어서 조회합니다.
+    """
     conn = None
+    cursor = None
+    known = set()
     try:
         conn = get_db_connection()
         if conn is None:
-            return False
+            return known
+
+        cursor = conn.cursor()
+        if match_ids is None:
+            cursor.execute("SELECT match_id FROM challenger_match_details;")
+            known.update(row[0] for row in cursor)
+            return known
+
+        match_ids = list(match_ids)
+        for i in range(0, len(match_ids), IN_QUERY_CHUNK):
+            chunk = match_ids[i:i + IN_QUERY_CHUNK]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT match_id FROM challenger_match_details WHERE match_id IN ({placeholders});", chunk)
+            known.update(row[0] for row in cursor)
+        return known
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching known match ids from MySQL: {err}")
+        return known
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def fetch_riot_accounts(puuids):
+    """
+    riot_accounts에 저장된 계정 정보를 {puuid: {'puuid', 'gameName', 'tagLine', 'fetched_at'}}로 반환합니다.
+    """
+    conn = None
+    cursor = None
+    accounts = {}
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return accounts
 
         cursor = conn.cursor()
+        puuids = list(puuids)
+        for i in range(0, len(puuids), IN_QUERY_CHUNK):
+            chunk = puuids[i:i + IN_QUERY_CHUNK]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT puuid, game_name, tag_line, fetched_at FROM riot_accounts WHERE puuid IN ({placeholders});", chunk)
+            for puuid, game_name, tag_line, fetched_at in cursor:
+                accounts[puuid] = {'puuid': puuid, 'gameName': game_name, 'tagLine': tag_line, 'fetched_at': fetched_at}
+        return accounts
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching riot accounts from MySQL: {err}")
+        return accounts
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def save_riot_accounts(accounts, batch_size: int = DB_BATCH_SIZE):
+    """
+    {'puuid', 'gameName', 'tagLine', 'fetched_at'} 계정 정보들을 저장하고, 저장된 행 수를 반환합니다.
+    """
+    head = "INSERT INTO riot_accounts (puuid, game_name, tag_line, fetched_at)"
+    tail = """
+    ON DUPLICATE KEY UPDATE
+        game_name = VALUES(game_name),
+        tag_line = VALUES(tag_line),
+        fetched_at = VALUES(fetched_at)
+    """
+    rows = (
+        (account['puuid'], account.get('gameName', ''), account.get('tagLine', ''), account['fetched_at'])
+        for account in accounts
+    )
+    return insert_in_batches(head, tail, rows, batch_size, 'riot accounts')
+
+def fetch_riot_account_by_riot_id(game_name: str, tag_line: str):
+    """
+    Riot ID로 저장된 계정 정보 {'puuid', 'gameName', 'tagLine', 'fetched_at'}를 반환합니다. 없으면 None입니다.
+    (대소문자는 테이블 collation에 따라 구분하지 않습니다.)
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT puuid, game_name AS gameName, tag_line AS tagLine, fetched_at FROM riot_accounts
+            WHERE game_name = %s AND tag_line = %s
+            ORDER BY fetched_at DESC
+            LIMIT 1;
+        """, (game_name, tag_line))
+        return cursor.fetchone()
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching riot account by Riot ID from MySQL: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def fetch_player_matches(puuid: str, match_ids=None, limit: int = 20):
+    """
+    플레이어의 매치 기록을 최신순으로 반환합니다. match_ids가 주어지면 그 매치만 조회합니다.
+    traits / units는 JSON을 풀어 리스트로, game_length는 초 단위 정수로 반환합니다.
+    """
+    if match_ids is not None and not match_ids:
+        return []
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
         sql = """
-            INSERT IGNORE INTO challenger_match_participants
-            (match_id, puuid, placement, level, gold_left, last_round, players_eliminated, total_damage_to_players, traits, units)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                placement=VALUES(placement),
-                level=VALUES(level),
-                gold_left=VALUES(gold_left),
-                last_round=VALUES(last_round),
-                players_eliminated=VALUES(players_eliminated),
-                total_damage_to_players=VALUES(total_damage_to_players),
-                traits=VALUES(traits),
-                units=VALUES(units)
+            SELECT p.match_id, d.game_datetime, TIME_TO_SEC(d.game_length) AS game_length, d.game_version,
+                   p.placement, p.level, p.gold_left, p.last_round, p.players_eliminated, p.total_damage_to_players,
+                   p.traits, p.units
+            FROM challenger_match_participants p
+            JOIN challenger_match_details d ON d.match_id = p.match_id
+            WHERE p.puuid = %s
         """
-        for p in participant_details:
-            cursor.execute(sql, (
-                p['match_id'],
-                p['puuid'],
-                p['placement'],
-                p['level'],
-                p['gold_left'],
-                p['last_round'],
-                p['players_eliminated'],
-                p['total_damage_to_players'],
-                json.dumps(p['traits']),
-                json.dumps(p['units'])
-            ))
+        params = [puuid]
+        if match_ids is not None:
+            match_ids = list(match_ids)[:IN_QUERY_CHUNK]
+            sql += f" AND p.match_id IN ({', '.join(['%s'] * len(match_ids))})"
+            params.extend(match_ids)
+        sql += " ORDER BY d.game_datetime DESC LIMIT %s;"
+        params.append(limit)
+        cursor.execute(sql, params)
+        matches = cursor.fetchall()
+        for match in matches:
+            match['traits'] = json.loads(match['traits'] or '[]')
+            match['units'] = json.loads(match['units'] or '[]')
+        return matches
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching player matches from MySQL: {err}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def fetch_crawl_checkpoints():
+    """
+    puuid별 마지막으로 저장된 매치 시각을 {puuid: {'last_match_id', 'last_game_datetime'}} 형태로 반환합니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return {}
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT puuid, last_match_id, last_game_datetime FROM crawl_checkpoints;")
+        return {row['puuid']: row for row in cursor.fetchall()}
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching crawl checkpoints from MySQL: {err}")
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def save_crawl_checkpoints(checkpoints: dict, batch_size: int = DB_BATCH_SIZE):
+    """
+    {puuid: {'last_match_id', 'last_game_datetime'}} 체크포인트를 저장하고, 저장된 행 수를 반환합니다.
+    기존 값보다 최신인 경우에만 갱신합니다.
+    """
+    head = "INSERT INTO crawl_checkpoints (puuid, last_match_id, last_game_datetime)"
+    tail = """
+    ON DUPLICATE KEY UPDATE
+        last_match_id = IF(VALUES(last_game_datetime) > last_game_datetime, VALUES(last_match_id), last_match_id),
+        last_game_datetime = GREATEST(last_game_datetime, VALUES(last_game_datetime))
+    """
+    rows = (
+        (puuid, checkpoint['last_match_id'], checkpoint['last_game_datetime'])
+        for puuid, checkpoint in checkpoints.items()
+    )
+    return insert_in_batches(head, tail, rows, batch_size, 'crawl checkpoints')
+
+def fetch_cache_generation(name: str):
+    """
+    캐시 세대 번호를 반환합니다. 아직 없으면 0, 조회에 실패하면 None을 반환합니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT generation FROM cache_generations WHERE name = %s;", (name,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error fetching cache generation from MySQL: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+def bump_cache_generation(name: str):
+    """
+    캐시 세대 번호를 1 올려, 이 데이터를 캐시한 모든 프로세스가 다음 확인 때 다시 읽도록 합니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return False
+
+        cursor = conn.cursor()
+        cursor.execute("""
+        INSERT INTO cache_generations (name, generation) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE generation = generation + 1;
+        """, (name,))
         conn.commit()
-        print(f"DEBUG: Saved/Updated {len(participant_details)} participant details to DB.")
         return True
-    
-    except Exception as err:
-        print(f"Error saving match ids to MySQL: {err}")
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error bumping cache generation in MySQL: {err}")
         if conn:
             conn.rollback()
         return False
     finally:
-        if conn:
+        if cursor:
             cursor.close()
-            conn.close()
+        close_db_connection(conn)
 
 def close_db_connection(conn):
-    if conn and conn.is_connected():
+    # 풀 연결은 끊긴 상태여도 close()를 호출해야 풀에 자리가 반환됩니다.
+    if conn:
         conn.close()
\ No newline at end of file
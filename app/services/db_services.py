@@ -1,131 +1,109 @@
 import os
 import json
-import pymysql
+import logging
 import pandas as pd
 from dotenv import load_dotenv
 
-load_dotenv()
+from .database import IN_QUERY_CHUNK
+from .export import read_frame, bulk_load, to_python
 
-def get_db_connection():
-    return pymysql.connect(
-        host='localhost',
-        user='root',
-        password=os.getenv('mysql_password'),
-        db='TFT',
-        charset='utf8'
-    )
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+def _frame_rows(df: pd.DataFrame, columns: list):
+    # NaN을 None으로 바꾼 (행 튜플) 이터레이터. iterrows 대신 itertuples로 한 번에 꺼냅니다.
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def _reconcile(table: str, key_columns: list, export_keys: set, columns: list, rows, mode: str):
+    """
+    DB 테이블의 키 집합과 내보낸 데이터의 키 집합의 차집합으로 사라진 행만 묶어서 삭제하고,
+    나머지 행은 LOAD DATA LOCAL INFILE 한 번으로 적재합니다.
+    삭제와 적재는 한 트랜잭션으로 커밋하므로 적재가 실패하면 삭제도 롤백됩니다.
+    """
+    deleted = []
+
+    def delete_stale(cur):
+        cur.execute(f"select {', '.join(key_columns)} from {table}")
+        stale_keys = [key for key in cur if key not in export_keys]
+
+        # (col1, col2) IN ((..), (..)) 형태로 IN_QUERY_CHUNK개씩 삭제
+        row_placeholder = '(' + ', '.join(['%s'] * len(key_columns)) + ')'
+        for i in range(0, len(stale_keys), IN_QUERY_CHUNK):
+            chunk = stale_keys[i:i + IN_QUERY_CHUNK]
+            query = f"delete from {table} where ({', '.join(key_columns)}) in ({', '.join([row_placeholder] * len(chunk))})"
+            cur.execute(query, [value for key in chunk for value in key])
+        deleted.append(len(stale_keys))
+
+    loaded = bulk_load(table, columns, rows, mode, prepare=delete_stale)
+    logger.info(f"{table}: deleted {sum(deleted)}, loaded {loaded}")
+    return loaded
 
 def save_challenger_users():
-    conn = get_db_connection()
-    cur = conn.cursor(pymysql.cursors.DictCursor)
-
-    cur.execute("select puuid from challenger_users")
-    db_users_df = pd.DataFrame(cur.fetchall())
-
-    challenger_user_df = pd.read_csv('challenger_users.csv')
-
-    # 강등당한 챌린저 유저 데이터 삭제
-    for index, row in db_users_df.iterrows():
-        if row['puuid'] not in challenger_user_df['puuid'].values:
-            query = "delete from challenger_users where puuid = %s"
-            cur.execute(query, (row['puuid']))
-
-    # 승급한 챌린저 유저 데이터 저장
-    for index, row in challenger_user_df.iterrows():
-        query = "insert ignore into challenger_users (summonerId, puuid, leaguePoints, `rank`, wins, losses) values (%s, %s, %s, %s, %s, %s) on duplicate key update leaguePoints = %s, `rank` = %s, wins = %s, losses = %s"
-        cur.execute(query, (row['summonerId'],row['puuid'], row['leaguePoints'], row['rank'], row['wins'], row['losses'], row['leaguePoints'], row['rank'], row['wins'], row['losses']))
-
-    conn.commit()
-    conn.close()
+    columns = ['summonerId', 'puuid', 'leaguePoints', 'rank', 'wins', 'losses']
+    challenger_user_df = read_frame('challenger_users', columns)
+
+    # 강등당한 챌린저 유저 데이터 삭제 / 승급한 챌린저 유저 데이터 저장 (기존 유저는 교체)
+    return _reconcile(
+        'challenger_users', ['puuid'],
+        set(zip(challenger_user_df['puuid'])),
+        ['summonerId', 'puuid', 'leaguePoints', '`rank`', 'wins', 'losses'],
+        _frame_rows(challenger_user_df, columns),
+        'REPLACE',
+    )
 
 def save_match_details():
-    conn = get_db_connection()
-    cur = conn.cursor(pymysql.cursors.DictCursor)
-
-    cur.execute("select match_id from challenger_match_details")
-    db_match_ids_df = pd.DataFrame(cur.fetchall())
-
-    match_ids_df = pd.read_csv('challenger_match_details.csv')
-
-    for index, row in db_match_ids_df.iterrows():
-        if row['match_id'] not in match_ids_df['match_id'].values:
-            query = "delete from challenger_match_details where match_id = %s"
-            cur.execute(query, (row['match_id']))
-
-    for index, row in match_ids_df.iterrows():
-        query = "insert ignore into challenger_match_details (match_id, game_datetime, game_length, game_version, queue_id, tft_set_number) values (%s, %s, %s, %s, %s, %s) on duplicate key update game_datetime = %s, game_length = %s, game_version = %s, queue_id = %s, tft_set_number = %s"
-        cur.execute(query, (row['match_id'], row['game_datetime'], row['game_length'], row['game_version'], row['queue_id'], row['tft_set_number'], row['game_datetime'], row['game_length'], row['game_version'], row['queue_id'], row['tft_set_number']))
-        
-    conn.commit()
-    conn.close()
+    columns = ['match_id', 'game_datetime', 'game_length', 'game_version', 'queue_id', 'tft_set_number']
+    match_ids_df = read_frame('challenger_match_details', columns)
+
+    return _reconcile(
+        'challenger_match_details', ['match_id'],
+        set(zip(match_ids_df['match_id'])),
+        columns,
+        _frame_rows(match_ids_df, columns),
+        'REPLACE',
+    )
 
 def save_participants():
-    conn = get_db_connection()
-    cur = conn.cursor(pymysql.cursors.DictCursor)
-
-    cur.execute("select puuid from challenger_match_participants")
-    db_match_participants_df = pd.DataFrame(cur.fetchall())
-
-    match_participants_df = pd.read_csv('challenger_match_participants.csv')
-
-    for index, row in db_match_participants_df.iterrows():
-        if row['puuid'] not in match_participants_df['puuid'].values:
-            query = "delete from challenger_match_participants where puuid = %s and match_id = %s"
-            cur.execute(query, (row['puuid'], row['match_id']))
-
-    for index, row in match_participants_df.iterrows():
-        query = "insert ignore into challenger_match_participants (match_id, puuid, placement, level, gold_left, last_round, players_eliminated, total_damage_to_players) values (%s, %s, %s, %s, %s, %s, %s, %s)"
-        cur.execute(query, (row['match_id'], row['puuid'], row['placement'], row['level'], row['gold_left'], row['last_round'], row['players_eliminated'], row['total_damage_to_players']))
-    conn.commit()
-    conn.close()
+    columns = ['match_id', 'puuid', 'placement', 'level', 'gold_left', 'last_round', 'players_eliminated', 'total_damage_to_players']
+    match_participants_df = read_frame('challenger_match_participants', columns)
+
+    return _reconcile(
+        'challenger_match_participants', ['match_id', 'puuid'],
+        set(zip(match_participants_df['match_id'], match_participants_df['puuid'])),
+        columns,
+        _frame_rows(match_participants_df, columns),
+        'IGNORE',
+    )
 
 def save_traits():
-    conn = get_db_connection()
-    cur = conn.cursor(pymysql.cursors.DictCursor)
-
-    cur.execute("select match_id, puuid from challenger_match_participants")
-    db_traits_df = pd.DataFrame(cur.fetchall())
-
-    traits_df = pd.read_csv('challenger_match_participants.csv')
-
-    for index, row in db_traits_df.iterrows():
-        if row['match_id'] not in traits_df['match_id'].values:
-            query = "delete from participant_traits where match_id = %s and puuid = %s"
-            cur.execute(query, (row['match_id'], row['puuid']))
-
-    for index, row in traits_df.iterrows():
-        traits_list = eval(row['traits'])
-        traits_json = json.dumps(traits_list)
-        query = "insert ignore into participant_traits (match_id, puuid, traits) values (%s, %s, %s)"
-        cur.execute(query, (row['match_id'], row['puuid'], traits_json))
-    conn.commit()
-    conn.close()
+    traits_df = read_frame('challenger_match_participants', ['match_id', 'puuid', 'traits'])
+
+    # Parquet에 중첩 리스트가 그대로 저장되어 있으므로 문자열 파싱 없이 바로 JSON으로 씁니다.
+    return _reconcile(
+        'participant_traits', ['match_id', 'puuid'],
+        set(zip(traits_df['match_id'], traits_df['puuid'])),
+        ['match_id', 'puuid', 'traits'],
+        ((match_id, puuid, json.dumps(to_python(traits)))
+         for match_id, puuid, traits in zip(traits_df['match_id'], traits_df['puuid'], traits_df['traits'])),
+        'IGNORE',
+    )
 
 def save_units():
-    conn = get_db_connection()
-    cur = conn.cursor(pymysql.cursors.DictCursor)
-
-    cur.execute("select match_id, puuid from challenger_match_participants")
-    db_units_df = pd.DataFrame(cur.fetchall())
-
-    units_df = pd.read_csv('challenger_match_participants.csv')
-
-    for index, row in db_units_df.iterrows():
-        if row['match_id'] not in units_df['match_id'].values:
-            query = "delete from participant_units where match_id = %s and puuid = %s"
-            cur.execute(query, (row['match_id'], row['puuid']))
-
-    for index, row in units_df.iterrows():
-        units_list = eval(row['units'])
-        units_json = json.dumps(units_list)
-        query = "insert ignore into participant_units (match_id, puuid, units) values (%s, %s, %s)"
-        cur.execute(query, (row['match_id'], row['puuid'], units_json))
-    conn.commit()
-    conn.close()
+    units_df = read_frame('challenger_match_participants', ['match_id', 'puuid', 'units'])
+
+    return _reconcile(
+        'participant_units', ['match_id', 'puuid'],
+        set(zip(units_df['match_id'], units_df['puuid'])),
+        ['match_id', 'puuid', 'units'],
+        ((match_id, puuid, json.dumps(to_python(units)))
+         for match_id, puuid, units in zip(units_df['match_id'], units_df['puuid'], units_df['units'])),
+        'IGNORE',
+    )
 
 def save_to_database():
     save_challenger_users()
     save_match_details()
     save_participants()
     save_traits()
-    save_units() 
\ No newline at end of file
+    save_units()
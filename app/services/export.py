@@ -0,0 +1,120 @@
+# tft/app/services/export.py
+
+import os
+import json
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+import mysql.connector
+
+from .database import get_bulk_load_connection, close_db_connection
+
+logger = logging.getLogger(__name__)
+
+# 중간 데이터(Parquet) 저장 폴더
+EXPORT_DIR = os.getenv('EXPORT_DIR', 'src')
+
+# LOAD DATA 기본 형식에서 이스케이프가 필요한 문자
+_TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+
+def export_path(name: str):
+    return os.path.join(EXPORT_DIR, f"{name}.parquet")
+
+
+def write_frame(df: pd.DataFrame, name: str):
+    """
+    DataFrame을 Parquet으로 저장합니다. traits / units 같은 중첩 리스트도 그대로 보존됩니다.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = export_path(name)
+    df.to_parquet(path, index=False)
+    return path
+
+
+def read_frame(name: str, columns: list = None):
+    return pd.read_parquet(export_path(name), columns=columns)
+
+
+def to_python(value):
+    """
+    Parquet에서 읽은 중첩 값(numpy 배열, numpy 스칼라)을 json.dumps 가능한 파이썬 객체로 바꿉니다.
+    """
+    if isinstance(value, np.ndarray):
+        return [to_python(item) for item in value]
+    if isinstance(value, list):
+        return [to_python(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_python(item) for key, item in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _tsv_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return '\\N'
+    if isinstance(value, (list, dict, np.ndarray)):
+        value = json.dumps(to_python(value))
+    return str(value).translate(_TSV_ESCAPES)
+
+
+def write_tsv(rows, path: str):
+    """
+    행 튜플들을 LOAD DATA 기본 형식(탭 구분, 백슬래시 이스케이프, NULL = \\N)의 TSV로 씁니다.
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for row in rows:
+            f.write('\t'.join(_tsv_value(value) for value in row))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def bulk_load(table: str, columns: list, rows, mode: str = 'IGNORE', prepare=None):
+    """
+    rows를 임시 TSV로 쓴 뒤 LOAD DATA LOCAL INFILE 한 번으로 table에 적재합니다.
+    mode는 키가 겹칠 때의 동작입니다. ('IGNORE' 또는 'REPLACE')
+    prepare(cursor)가 주어지면 같은 연결 / 트랜잭션에서 LOAD DATA 전에 실행하므로,
+    적재가 실패하면 prepare의 변경(삭제 등)도 함께 롤백됩니다.
+    적재된 행 수를 반환하고, 실패하면 0을 반환합니다.
+    """
+    if mode not in ('IGNORE', 'REPLACE'):
+        raise ValueError(f"invalid LOAD DATA mode: {mode}")
+
+    fd, path = tempfile.mkstemp(suffix='.tsv')
+    os.close(fd)
+    conn = None
+    cursor = None
+    try:
+        if write_tsv(rows, path) == 0 and prepare is None:
+            return 0
+
+        conn = get_bulk_load_connection()
+        if conn is None:
+            return 0
+
+        cursor = conn.cursor()
+        if prepare is not None:
+            prepare(cursor)
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s {mode} INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(columns)})",
+            (path,),
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error bulk loading {table} into MySQL: {err}")
+        if conn:
+            conn.rollback()
+        return 0
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+        os.remove(path)
@@ -0,0 +1,77 @@
+# tft/app/services/http_client.py
+
+import os
+import json
+import asyncio
+import weakref
+import aiohttp
+from contextlib import asynccontextmanager
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 디코딩합니다.
+    orjson = None
+
+# 전체 / 호스트별 최대 동시 연결 수
+HTTP_LIMIT = int(os.getenv('HTTP_LIMIT', 100))
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', 50))
+# DNS 조회 결과 캐시 시간 (초)
+HTTP_DNS_TTL = int(os.getenv('HTTP_DNS_TTL', 300))
+# 유휴 연결을 열어 두는 시간 (초)
+HTTP_KEEPALIVE = float(os.getenv('HTTP_KEEPALIVE', 60))
+# 요청 타임아웃 (초)
+HTTP_TOTAL_TIMEOUT = float(os.getenv('HTTP_TOTAL_TIMEOUT', 30))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 10))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 20))
+
+# 이벤트 루프별 공유 세션
+_sessions = weakref.WeakKeyDictionary()
+
+
+def json_loads(data):
+    """
+    응답 본문을 디코딩합니다. orjson이 있으면 orjson을 사용합니다.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def create_session():
+    """
+    연결 풀, keep-alive, DNS 캐시, 타임아웃을 설정한 ClientSession을 만듭니다.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_LIMIT,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT,
+        sock_read=HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+@asynccontextmanager
+async def shared_session():
+    """
+    현재 이벤트 루프에 열린 공유 세션이 있으면 그대로 사용하고,
+    없으면 새로 열어 이 블록이 끝날 때 닫습니다.
+    가장 바깥쪽에서 한 번 열어 두면 안쪽의 모든 단계가 같은 연결 풀을 재사용합니다.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is not None and not session.closed:
+        yield session
+        return
+
+    session = create_session()
+    _sessions[loop] = session
+    try:
+        yield session
+    finally:
+        _sessions.pop(loop, None)
+        await session.close()
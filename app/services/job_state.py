@@ -0,0 +1,104 @@
+# tft/app/services/job_state.py
+
+import os
+import json
+import logging
+import time
+import datetime
+
+logger = logging.getLogger(__name__)
+
+# 수집 작업 상태 파일 위치
+JOB_STATE_PATH = os.getenv('CRAWL_JOB_STATE_PATH', 'data/crawl_job.json')
+# 상태 파일을 디스크에 쓰는 최소 간격 (초)
+JOB_FLUSH_INTERVAL = float(os.getenv('CRAWL_JOB_FLUSH_INTERVAL', 10))
+
+
+class CrawlJobState:
+    """
+    수집 작업의 단계별 진행 상황을 기록합니다.
+    - done_puuids: 매치 ID 조회를 마친 puuid
+    - pending_matches: 발견했지만 아직 DB에 저장되지 않은 match_id
+    일정 간격으로 파일에 저장하고, 재시작하면 남은 작업부터 이어서 처리할 수 있습니다.
+    """
+
+    def __init__(self, path: str = JOB_STATE_PATH):
+        self.path = path
+        self.job_id = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+        self.started_at = time.time()
+        self.done_puuids = set()
+        self.pending_matches = set()
+        self.dirty = False
+        self.flushed_at = 0.0
+
+    @classmethod
+    def load(cls, path: str = JOB_STATE_PATH):
+        """
+        끝나지 않은 작업 상태가 있으면 불러오고, 없으면 새 작업 상태를 반환합니다.
+        """
+        state = cls(path)
+        if not os.path.exists(path):
+            return state
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable crawl job state {path}: {e}")
+            return state
+        state.job_id = saved['job_id']
+        state.started_at = saved['started_at']
+        state.done_puuids = set(saved['stages']['match_ids']['done_puuids'])
+        state.pending_matches = set(saved['stages']['match_details']['pending'])
+        return state
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.done_puuids or self.pending_matches)
+
+    def mark_puuid_done(self, puuid: str, match_ids):
+        # 매치 ID를 큐에 넣은 뒤 호출합니다. 이후 재시작에서는 이 puuid의 목록 조회를 건너뜁니다.
+        self.pending_matches.update(match_ids)
+        self.done_puuids.add(puuid)
+        self.dirty = True
+
+    def mark_matches_done(self, match_ids):
+        # DB 저장까지 끝난 매치를 대기 목록에서 뺍니다.
+        self.pending_matches.difference_update(match_ids)
+        self.dirty = True
+
+    def snapshot(self) -> dict:
+        return {
+            'job_id': self.job_id,
+            'started_at': self.started_at,
+            'stages': {
+                'match_ids': {'done_puuids': sorted(self.done_puuids)},
+                'match_details': {'pending': sorted(self.pending_matches)},
+            },
+        }
+
+    def should_flush(self) -> bool:
+        return self.dirty and time.time() - self.flushed_at >= JOB_FLUSH_INTERVAL
+
+    def write(self, snapshot: dict):
+        """
+        스냅샷을 임시 파일에 쓴 뒤 이름을 바꿔, 쓰다가 죽어도 이전 상태가 깨지지 않게 합니다.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        partial_path = self.path + '.part'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(partial_path, self.path)
+
+    def begin_flush(self) -> dict:
+        # 현재 상태의 스냅샷을 만들고 저장된 것으로 표시합니다. (쓰기는 write로 따로 수행)
+        self.dirty = False
+        self.flushed_at = time.time()
+        return self.snapshot()
+
+    def flush(self):
+        self.write(self.begin_flush())
+
+    def complete(self):
+        # 모든 단계가 끝나면 상태 파일을 지워 다음 실행이 새 작업으로 시작하게 합니다.
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,55 @@
+# tft/app/services/logs.py
+
+import os
+import sys
+import json
+import logging
+
+# 로그 레벨과 형식 (text: 사람이 읽는 한 줄, json: 한 줄에 JSON 객체 하나)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+
+# LogRecord 기본 속성. 이 외의 속성은 extra로 넘긴 구조화 필드입니다.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+def _fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    # 메시지 뒤에 extra 필드를 key=value로 붙입니다.
+    def format(self, record):
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """
+    루트 로거에 stderr 핸들러를 설정합니다. 수집기 / 웹 앱 진입점에서 한 번 호출합니다.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
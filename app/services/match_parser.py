@@ -0,0 +1,69 @@
+# tft/app/services/match_parser.py
+
+import sys
+import logging
+import datetime
+
+from .http_client import json_loads
+from .records import MatchRow, ParticipantRow, TraitRow, UnitRow
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 풀 작업 하나에 넘길 매치 수
+PARSE_BATCH_SIZE = 20
+
+
+def parse_match_detail(match_id: str, match_detail: dict):
+    """
+    매치 상세 응답에서 DB에 저장할 MatchRow와 ParticipantRow 리스트를 추출합니다.
+    특성 / 유닛 / 아이템 이름은 매치마다 반복되므로 sys.intern으로 같은 문자열 객체를 공유합니다.
+    """
+    info = match_detail['info']
+    match_row = MatchRow(
+        match_id,
+        datetime.datetime.fromtimestamp(info['game_datetime'] / 1000),
+        datetime.timedelta(seconds = info['game_length']),
+        sys.intern(info['game_version']),
+        info['queue_id'],
+        info['tft_set_number'],
+        sys.intern(info['tft_set_core_name']),
+    )
+
+    participant_rows = []
+    for participant in info['participants']:
+        participant_rows.append(ParticipantRow(
+            match_id,
+            participant['puuid'],
+            participant['placement'],
+            participant['level'],
+            participant['gold_left'],
+            participant['last_round'],
+            participant['players_eliminated'],
+            participant['total_damage_to_players'],
+            tuple(
+                TraitRow(sys.intern(trait['name']), trait['num_units'], trait['style'], trait['tier_current'], trait['tier_total'])
+                for trait in participant['traits']
+            ),
+            tuple(
+                UnitRow(sys.intern(unit['character_id']), unit['tier'], unit['rarity'],
+                        tuple(sys.intern(item) for item in unit.get('itemNames', [])))
+                for unit in participant['units']
+            ),
+        ))
+    return match_row, participant_rows
+
+
+def decode_match_batch(items):
+    """
+    [(match_id, 응답 본문 bytes), ...]를 디코딩 + 변환해 같은 순서로
+    (MatchRow, ParticipantRow 리스트) 또는 실패 시 None을 담은 리스트로 반환합니다.
+    프로세스 풀에서 실행할 수 있도록 모듈 최상위 함수로 둡니다.
+    """
+    parsed = []
+    for match_id, body in items:
+        try:
+            parsed.append(parse_match_detail(match_id, json_loads(body)))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error parsing match {match_id}: {e}")
+            parsed.append(None)
+    return parsed
@@ -0,0 +1,243 @@
+# tft/app/services/metrics.py
+
+import os
+import json
+import time
+import bisect
+import threading
+
+# 주기적으로 JSON 스냅샷을 기록할 파일 (비우면 기록하지 않음)
+METRICS_DUMP_PATH = os.getenv('METRICS_DUMP_PATH', 'data/metrics.json')
+# JSON 스냅샷 기록 간격 (초)
+METRICS_DUMP_INTERVAL = float(os.getenv('METRICS_DUMP_INTERVAL', 30))
+
+# 지연 시간 히스토그램 버킷 경계 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# JSON 스냅샷에 포함할 백분위수
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class _Metric:
+    def __init__(self, registry, name: str, help_text: str, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # 레이블 값 튜플 -> 값
+
+    def _labels(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(label) for label in labels)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._labels(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, *labels):
+        key = self._labels(labels)
+        with self.registry.lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    고정 버킷 히스토그램. 값마다 [버킷별 개수..., 합계, 개수]를 보관합니다.
+    """
+    kind = 'histogram'
+
+    def __init__(self, registry, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        key = self._labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def percentile(self, state, q: float):
+        # 버킷 안에서 선형 보간한 근사 백분위수 (Prometheus histogram_quantile과 같은 방식)
+        total = state[-1]
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        lower = 0.0
+        for index, upper in enumerate(self.buckets):
+            count = state[index]
+            if seen + count >= rank and count:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 지표 저장소. 외부 라이브러리 없이 Prometheus 텍스트 형식과 JSON 스냅샷을 만듭니다.
+    값은 스레드에서 갱신될 수 있으므로 잠금으로 보호합니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.callbacks = []  # 조회 시점에 값을 계산하는 게이지: (Gauge, 함수)
+        self.started_at = time.time()
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            return self.metrics[metric.name]
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames=()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help_text: str, labelnames, collect):
+        """
+        collect()가 [(레이블 튜플, 값), ...]을 반환하면 조회할 때마다 게이지 값을 새로 채웁니다.
+        """
+        gauge = self.gauge(name, help_text, labelnames)
+        self.callbacks.append((gauge, collect))
+        return gauge
+
+    def _collect_callbacks(self):
+        for gauge, collect in self.callbacks:
+            try:
+                samples = collect()
+            except Exception:
+                continue
+            with self.lock:
+                gauge.values = {gauge._labels(labels): value for labels, value in samples}
+
+    def render_prometheus(self) -> str:
+        self._collect_callbacks()
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for key, value in sorted(metric.values.items()):
+                    labels = list(zip(metric.labelnames, key))
+                    if metric.kind != 'histogram':
+                        lines.append(f"{metric.name}{_format_labels(labels)} {value}")
+                        continue
+                    cumulative = 0
+                    for upper, count in zip(metric.buckets + ('+Inf',), value):
+                        cumulative += count
+                        lines.append(f"{metric.name}_bucket{_format_labels(labels + [('le', upper)])} {cumulative}")
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {value[-2]}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {value[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> dict:
+        """
+        {지표 이름: [{labels, value}]} 형태의 JSON 스냅샷. 히스토그램은 개수 / 평균 / 백분위수로 요약합니다.
+        """
+        self._collect_callbacks()
+        result = {}
+        with self.lock:
+            for metric in self.metrics.values():
+                samples = []
+                for key, value in sorted(metric.values.items()):
+                    sample = {'labels': dict(zip(metric.labelnames, key))}
+                    if metric.kind == 'histogram':
+                        count = value[-1]
+                        sample['count'] = count
+                        sample['mean'] = value[-2] / count if count else None
+                        for q in PERCENTILES:
+                            sample[f"p{int(q * 100)}"] = metric.percentile(value, q)
+                    else:
+                        sample['value'] = value
+                    samples.append(sample)
+                result[metric.name] = samples
+        return result
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class MetricsDumper:
+    """
+    지표 스냅샷을 JSON 파일로 기록합니다. 카운터는 직전 기록 이후의 초당 증가량(rate)도 함께 남깁니다.
+    """
+
+    def __init__(self, registry, path: str = METRICS_DUMP_PATH):
+        self.registry = registry
+        self.path = path
+        self.previous = None  # (시각, {(이름, 레이블): 값})
+
+    def dump(self):
+        if not self.path:
+            return
+        now = time.time()
+        snapshot = self.registry.snapshot()
+        counters = {
+            (name, json.dumps(sample['labels'], sort_keys=True)): sample['value']
+            for name, samples in snapshot.items()
+            if self.registry.metrics[name].kind == 'counter'
+            for sample in samples
+        }
+        rates = {}
+        if self.previous is not None:
+            elapsed = now - self.previous[0]
+            for (name, labels), value in counters.items():
+                if elapsed > 0:
+                    rate = (value - self.previous[1].get((name, labels), 0)) / elapsed
+                    rates.setdefault(name, []).append({'labels': json.loads(labels), 'per_second': rate})
+        self.previous = (now, counters)
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        partial_path = self.path + '.part'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump({'time': now, 'uptime': now - self.registry.started_at, 'metrics': snapshot, 'rates': rates}, f, default=str)
+        os.replace(partial_path, self.path)
+
+
+# 프로세스 전체가 공유하는 지표 저장소
+metrics = MetricsRegistry()
+
+RIOT_REQUESTS = metrics.counter(
+    'riot_requests_total', 'Riot API 요청 결과 수 (status: HTTP 코드, error, circuit_open)', ('host', 'method', 'status'))
+RIOT_LATENCY = metrics.histogram(
+    'riot_request_seconds', 'Riot API 요청 한 번의 응답 시간', ('host', 'method'))
+RIOT_LIMIT_WAIT = metrics.histogram(
+    'riot_rate_limit_wait_seconds', 'rate limiter에서 요청이 대기한 시간', ('host',))
+RIOT_RATE_LIMITED = metrics.counter(
+    'riot_rate_limited_total', '429 응답 수', ('host', 'method', 'limit_type'))
+QUEUE_DEPTH = metrics.gauge(
+    'collector_queue_depth', '수집기 단계별 큐에 쌓인 항목 수', ('queue',))
+COLLECTOR_ITEMS = metrics.counter(
+    'collector_items_total', '수집기 단계별 처리 항목 수', ('stage',))
+DB_BATCH_SECONDS = metrics.histogram(
+    'db_batch_seconds', 'DB 다중 행 INSERT 배치 하나의 실행 + 커밋 시간', ('label',))
+DB_ROWS_WRITTEN = metrics.counter(
+    'db_rows_written_total', 'DB에 저장된 행 수', ('label',))
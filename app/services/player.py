@@ -0,0 +1,151 @@
+# tft/app/services/player.py
+
+import os
+import time
+import asyncio
+import datetime
+import threading
+
+from .database import (
+    fetch_riot_account_by_riot_id, fetch_known_match_ids, fetch_player_matches,
+    save_matches_to_db,
+)
+from .account_cache import account_cache
+from .http_client import create_session
+from .match_parser import decode_match_batch
+from .regions import DEFAULT_PLATFORM, region_of
+from .riot_api import search_by_name, fetch_match_ids, fetch_match_detail_raw
+
+# 플레이어 페이지에 보여줄 최근 매치 수
+PLAYER_MATCH_COUNT = int(os.getenv('PLAYER_MATCH_COUNT', 20))
+# DB에 없는 매치를 API로 동시에 가져오는 최대 요청 수
+PLAYER_FETCH_CONCURRENCY = int(os.getenv('PLAYER_FETCH_CONCURRENCY', 5))
+# 같은 플레이어를 이 시간(초) 안에 다시 조회하면 API를 호출하지 않고 이전 결과를 사용합니다.
+PLAYER_REFRESH_SECONDS = float(os.getenv('PLAYER_REFRESH_SECONDS', 120))
+# 최근 결과를 보관할 최대 플레이어 수
+PLAYER_CACHE_MAX_ENTRIES = int(os.getenv('PLAYER_CACHE_MAX_ENTRIES', 1000))
+
+
+class PlayerProfiles:
+    """
+    Riot ID로 플레이어의 최근 매치 기록을 조회합니다.
+    저장된 매치는 DB에서 읽고, DB에 없는 매치만 API로 동시에 가져와 저장합니다.
+
+    Flask는 요청마다 별도의 이벤트 루프에서 async 뷰를 실행하므로, API 호출은 전용 스레드의
+    이벤트 루프 하나에서만 실행해 rate limiter / 회로 차단기 / 세션을 모든 요청이 공유하게 합니다.
+    같은 플레이어에 대한 동시 요청은 진행 중인 조회 하나를 함께 기다리고,
+    조회 결과는 PLAYER_REFRESH_SECONDS 동안 재사용해 트래픽이 몰려도 API 사용량이 늘지 않습니다.
+    """
+
+    def __init__(self, match_count: int = PLAYER_MATCH_COUNT, refresh_seconds: float = PLAYER_REFRESH_SECONDS,
+                 max_entries: int = PLAYER_CACHE_MAX_ENTRIES):
+        self.match_count = match_count
+        self.refresh_seconds = refresh_seconds
+        self.max_entries = max_entries
+        self.loop = None
+        self.session = None
+        self.start_lock = threading.Lock()
+        self.in_flight = {}  # key -> asyncio.Task (전용 루프에서만 접근)
+        self.recent = {}     # key -> (조회 시각, 결과)
+
+    def _ensure_loop(self):
+        with self.start_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, name='riot-api', daemon=True).start()
+            return self.loop
+
+    async def get(self, game_name: str, tag_line: str, platform: str = DEFAULT_PLATFORM):
+        """
+        어떤 이벤트 루프에서든 호출할 수 있습니다. 플레이어를 찾지 못하면 None을 반환합니다.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._get(game_name, tag_line, platform), self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    async def _get(self, game_name: str, tag_line: str, platform: str):
+        key = (platform, game_name.lower(), tag_line.lower())
+        cached = self.recent.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.refresh_seconds:
+            return cached[1]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, game_name, tag_line, platform))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # 먼저 요청한 쪽이 연결을 끊어도 다른 요청이 기다리는 조회는 취소되지 않도록 shield합니다.
+        return await asyncio.shield(task)
+
+    def _remember(self, key, profile):
+        self.recent.pop(key, None)
+        self.recent[key] = (time.monotonic(), profile)
+        while len(self.recent) > self.max_entries:
+            self.recent.pop(next(iter(self.recent)))
+
+    async def _resolve_account(self, game_name: str, tag_line: str, platform: str):
+        # 저장된 계정이 유효하면 Account API를 호출하지 않습니다.
+        account = await asyncio.to_thread(fetch_riot_account_by_riot_id, game_name, tag_line)
+        if account is not None and datetime.datetime.now() - account['fetched_at'] < account_cache.ttl:
+            return account
+        account = await search_by_name(self.session, game_name, tag_line, platform)
+        if account is None or not account.get('puuid'):
+            return None
+        await asyncio.to_thread(account_cache.put_many, [account])
+        return account
+
+    async def _fetch_missing(self, match_ids):
+        """
+        DB에 없는 매치만 동시에 가져와 저장하고, 저장한 매치 수를 반환합니다.
+        """
+        known = await asyncio.to_thread(fetch_known_match_ids, match_ids)
+        missing = [match_id for match_id in match_ids if match_id not in known]
+        if not missing:
+            return 0
+
+        semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+
+        async def fetch(match_id):
+            async with semaphore:
+                return match_id, await fetch_match_detail_raw(self.session, match_id)
+
+        bodies = [item for item in await asyncio.gather(*(fetch(match_id) for match_id in missing)) if item[1] is not None]
+        parsed = [result for result in decode_match_batch(bodies) if result is not None]
+        if not parsed:
+            return 0
+        saved = await asyncio.to_thread(
+            save_matches_to_db, [match for match, _ in parsed], [p for _, participants in parsed for p in participants])
+        return saved
+
+    async def _load(self, key, game_name: str, tag_line: str, platform: str):
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+
+        account = await self._resolve_account(game_name, tag_line, platform)
+        if account is None:
+            return None
+
+        puuid = account['puuid']
+        match_ids = await fetch_match_ids(self.session, puuid, count=self.match_count, platform=platform)
+        fetched = 0
+        if match_ids is None:
+            # 매치 목록 조회에 실패하면 DB에 저장된 최근 매치만 보여줍니다.
+            matches = await asyncio.to_thread(fetch_player_matches, puuid, None, self.match_count)
+        else:
+            fetched = await self._fetch_missing(match_ids)
+            matches = await asyncio.to_thread(fetch_player_matches, puuid, match_ids, self.match_count)
+
+        profile = {
+            'account': {'puuid': puuid, 'gameName': account.get('gameName', game_name), 'tagLine': account.get('tagLine', tag_line)},
+            'platform': platform,
+            'region': region_of(platform),
+            'matches': matches,
+            'fetched': fetched,
+            'stale': match_ids is None,
+        }
+        if match_ids is not None:
+            self._remember(key, profile)
+        return profile
+
+
+# 웹 앱 전체가 공유하는 플레이어 조회기
+player_profiles = PlayerProfiles()
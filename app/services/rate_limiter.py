@@ -0,0 +1,210 @@
+# tft/app/services/rate_limiter.py
+
+import os
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+# 헤더를 받기 전까지 사용할 기본 앱 한도 (개발용 키 기준: 1초 20회, 2분 100회)
+DEFAULT_APP_RATE_LIMIT = os.getenv('RIOT_APP_RATE_LIMIT', '20:1,100:120')
+# 서버 창 경계와의 시차를 흡수하기 위한 여유 시간 (초)
+WINDOW_MARGIN = float(os.getenv('RIOT_RATE_LIMIT_MARGIN', 0.05))
+# 메서드 한도를 모를 때 첫 요청(probe)의 응답을 기다리는 최대 시간 (초). 지나면 다음 요청이 probe를 넘겨받습니다.
+PROBE_TIMEOUT = float(os.getenv('RIOT_RATE_LIMIT_PROBE_TIMEOUT', 30))
+
+
+def parse_rate_limit_header(value: str):
+    """
+    "20:1,100:120" 형태의 헤더 값을 [(20, 1), (100, 120)] 리스트로 변환합니다.
+    """
+    pairs = []
+    if not value:
+        return pairs
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, second = part.split(':')
+        pairs.append((int(first), int(second)))
+    return pairs
+
+
+class RateWindow:
+    """
+    하나의 제한 창 (예: 120초에 100회)을 슬라이딩 로그로 추적합니다.
+    """
+
+    def __init__(self, limit: int, seconds: int):
+        self.limit = limit
+        self.seconds = seconds
+        self.timestamps = deque()
+
+    def _purge(self, now: float):
+        horizon = now - self.seconds - WINDOW_MARGIN
+        while self.timestamps and self.timestamps[0] <= horizon:
+            self.timestamps.popleft()
+
+    def delay(self, now: float) -> float:
+        """
+        지금 요청을 하나 더 보내려면 기다려야 하는 시간(초)을 반환합니다.
+        """
+        self._purge(now)
+        if len(self.timestamps) < self.limit:
+            return 0.0
+        return self.timestamps[0] + self.seconds + WINDOW_MARGIN - now
+
+    def remaining(self, now: float) -> int:
+        # 현재 창에서 더 보낼 수 있는 요청 수 (기록을 지우지 않고 계산합니다)
+        horizon = now - self.seconds - WINDOW_MARGIN
+        return self.limit - sum(1 for timestamp in list(self.timestamps) if timestamp > horizon)
+
+    def record(self, now: float):
+        self.timestamps.append(now)
+
+    def sync_count(self, count: int, now: float):
+        """
+        서버가 알려준 사용량이 로컬 기록보다 많으면 (같은 키를 쓰는 다른 수집기),
+        부족한 만큼 현재 시각으로 채워 넣어 서버 기준에 맞춥니다.
+        """
+        self._purge(now)
+        for _ in range(count - len(self.timestamps)):
+            self.timestamps.append(now)
+
+
+class RateLimiter:
+    """
+    Riot API의 앱 단위 / 메서드 단위 제한을 라우팅 호스트(kr, asia 등)별로 추적하고,
+    모든 창에 여유가 생기는 시점에 맞춰 요청을 통과시킵니다.
+    """
+
+    def __init__(self, app_rate_limit: str = DEFAULT_APP_RATE_LIMIT, probe_timeout: float = PROBE_TIMEOUT):
+        self.default_app_limits = parse_rate_limit_header(app_rate_limit)
+        self.probe_timeout = probe_timeout
+        self.app_windows = {}       # host -> [RateWindow]
+        self.method_windows = {}    # (host, method) -> [RateWindow]
+        self.blocked_until = {}     # host 또는 (host, method) -> 재시도 가능 시각
+        self.method_probes = {}     # (host, method) -> 첫 응답을 기다리는 Event
+
+    def _app_windows(self, host: str):
+        if host not in self.app_windows:
+            self.app_windows[host] = [RateWindow(limit, seconds) for limit, seconds in self.default_app_limits]
+        return self.app_windows[host]
+
+    async def acquire(self, host: str, method: str):
+        """
+        host/method 조합으로 요청을 하나 보낼 수 있을 때까지 기다립니다.
+        메서드 한도를 아직 모르면 첫 응답을 받을 때까지 해당 메서드는 한 번에 하나만 보냅니다.
+        첫 요청이 probe_timeout 안에 끝나지 않으면 (update / release 없이 사라진 경우 등) 다음 요청이 대신 보냅니다.
+        acquire를 부른 쪽은 반드시 release해야 하므로, 가능하면 slot()을 사용합니다.
+        """
+        key = (host, method)
+        while True:
+            probe = self.method_probes.get(key)
+            if key not in self.method_windows and probe is not None:
+                try:
+                    await asyncio.wait_for(probe.wait(), self.probe_timeout)
+                except asyncio.TimeoutError:
+                    if self.method_probes.get(key) is probe:
+                        del self.method_probes[key]
+                        probe.set()
+                continue
+
+            now = time.monotonic()
+            windows = self._app_windows(host) + self.method_windows.get(key, [])
+            wait = max(
+                [window.delay(now) for window in windows]
+                + [self.blocked_until.get(host, 0) - now, self.blocked_until.get(key, 0) - now]
+            )
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            for window in windows:
+                window.record(now)
+            if key not in self.method_windows:
+                self.method_probes[key] = asyncio.Event()
+            return
+
+    @asynccontextmanager
+    async def slot(self, host: str, method: str):
+        """
+        acquire한 뒤 블록이 어떻게 끝나든 (예외, 취소 포함) release합니다.
+        """
+        await self.acquire(host, method)
+        try:
+            yield
+        finally:
+            self.release(host, method)
+
+    def update(self, host: str, method: str, headers):
+        """
+        응답 헤더의 X-App-Rate-Limit / X-Method-Rate-Limit (및 -Count) 값으로 창을 갱신합니다.
+        """
+        now = time.monotonic()
+        key = (host, method)
+
+        app_limits = parse_rate_limit_header(headers.get('X-App-Rate-Limit'))
+        if app_limits:
+            self.app_windows[host] = self._merge(self._app_windows(host), app_limits)
+        method_limits = parse_rate_limit_header(headers.get('X-Method-Rate-Limit'))
+        if method_limits:
+            self.method_windows[key] = self._merge(self.method_windows.get(key, []), method_limits)
+
+        self._sync(self.app_windows.get(host, []), headers.get('X-App-Rate-Limit-Count'), now)
+        self._sync(self.method_windows.get(key, []), headers.get('X-Method-Rate-Limit-Count'), now)
+        self.release(host, method)
+
+    def release(self, host: str, method: str):
+        """
+        메서드 한도를 모르는 채로 보낸 첫 요청이 끝났음을 알려 대기 중인 요청을 깨웁니다.
+        """
+        key = (host, method)
+        if key not in self.method_windows:
+            # 헤더 없이 끝난 경우 (네트워크 오류 등)에는 앱 한도만으로 계속 진행합니다.
+            self.method_windows[key] = []
+        probe = self.method_probes.pop(key, None)
+        if probe is not None:
+            probe.set()
+
+    def penalize(self, host: str, method: str, retry_after: float, limit_type: str = None):
+        """
+        429 응답을 받았을 때 Retry-After 동안 해당 호스트(또는 메서드)를 막습니다.
+        """
+        until = time.monotonic() + retry_after
+        key = host if limit_type == 'application' else (host, method)
+        self.blocked_until[key] = max(self.blocked_until.get(key, 0), until)
+
+    def headroom(self):
+        """
+        [((host, method, 창 길이), 남은 요청 수), ...]를 반환합니다. method가 ''이면 앱 한도입니다.
+        """
+        now = time.monotonic()
+        samples = []
+        for host, windows in list(self.app_windows.items()):
+            samples.extend(((host, '', window.seconds), window.remaining(now)) for window in windows)
+        for (host, method), windows in list(self.method_windows.items()):
+            samples.extend(((host, method, window.seconds), window.remaining(now)) for window in windows)
+        return samples
+
+    @staticmethod
+    def _merge(windows, limits):
+        # 같은 길이의 창은 기록을 유지한 채 한도만 바꿉니다.
+        by_seconds = {window.seconds: window for window in windows}
+        merged = []
+        for limit, seconds in limits:
+            window = by_seconds.get(seconds) or RateWindow(limit, seconds)
+            window.limit = limit
+            merged.append(window)
+        return merged
+
+    @staticmethod
+    def _sync(windows, count_header, now):
+        counts = dict((seconds, count) for count, seconds in parse_rate_limit_header(count_header))
+        for window in windows:
+            if window.seconds in counts:
+                window.sync_count(counts[window.seconds], now)
+
+
+# 모든 riot_api 요청이 공유하는 전역 제한기
+rate_limiter = RateLimiter()
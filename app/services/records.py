@@ -0,0 +1,64 @@
+# tft/app/services/records.py
+
+import json
+from typing import NamedTuple
+
+
+# 수집기에서 DB 저장까지 매치 / 참가자 데이터를 담는 행 타입.
+# 딕셔너리 대신 NamedTuple을 사용해 행마다 키 해시 테이블을 두지 않고,
+# 필드 순서가 INSERT 컬럼 순서와 같아 그대로 쿼리 파라미터로 넘길 수 있습니다.
+# traits / units는 TraitRow / UnitRow로만 들고 있다가, DB의 JSON 컬럼에 저장할 때 participant_db_row로 직렬화합니다.
+
+class TraitRow(NamedTuple):
+    name: str
+    num_units: int
+    style: int
+    tier_current: int
+    tier_total: int
+
+
+class UnitRow(NamedTuple):
+    character_id: str
+    tier: int
+    rarity: int
+    item_names: tuple
+
+
+class MatchRow(NamedTuple):
+    match_id: str
+    game_datetime: object    # datetime.datetime
+    game_length: object      # datetime.timedelta
+    game_version: str
+    queue_id: int
+    tft_set_number: int
+    tft_set_core_name: str
+
+
+class ParticipantRow(NamedTuple):
+    match_id: str
+    puuid: str
+    placement: int
+    level: int
+    gold_left: int
+    last_round: int
+    players_eliminated: int
+    total_damage_to_players: int
+    traits: tuple            # TraitRow 튜플
+    units: tuple             # UnitRow 튜플
+
+
+def participant_db_row(p: ParticipantRow) -> tuple:
+    """
+    challenger_match_participants 컬럼 순서의 INSERT 파라미터를 만듭니다.
+    traits / units는 Riot 응답과 같은 키 이름의 JSON 문자열로 저장합니다.
+    """
+    traits = [
+        {'name': t.name, 'num_units': t.num_units, 'style': t.style, 'tier_current': t.tier_current, 'tier_total': t.tier_total}
+        for t in p.traits
+    ]
+    units = [
+        {'character_id': u.character_id, 'itemNames': list(u.item_names), 'rarity': u.rarity, 'tier': u.tier}
+        for u in p.units
+    ]
+    return p[:8] + (json.dumps(traits), json.dumps(units))
+
@@ -0,0 +1,54 @@
+# tft/app/services/regions.py
+
+import os
+
+# 플랫폼(서버) -> TFT 매치 API 라우팅 지역
+PLATFORM_REGIONS = {
+    'kr': 'asia',
+    'jp1': 'asia',
+    'na1': 'americas',
+    'br1': 'americas',
+    'la1': 'americas',
+    'la2': 'americas',
+    'euw1': 'europe',
+    'eun1': 'europe',
+    'tr1': 'europe',
+    'ru': 'europe',
+    'me1': 'europe',
+    'oc1': 'sea',
+    'sg2': 'sea',
+    'tw2': 'sea',
+    'vn2': 'sea',
+}
+
+# Account API는 americas / asia / europe만 지원하므로 sea는 asia로 보냅니다.
+ACCOUNT_REGIONS = {'americas': 'americas', 'asia': 'asia', 'europe': 'europe', 'sea': 'asia'}
+
+# 리그 API 경로의 티어 이름
+TIERS = ('challenger', 'grandmaster', 'master')
+
+DEFAULT_PLATFORM = os.getenv('RIOT_PLATFORM', 'kr')
+DEFAULT_TIER = 'challenger'
+
+
+def region_of(platform: str) -> str:
+    try:
+        return PLATFORM_REGIONS[platform.lower()]
+    except KeyError:
+        raise ValueError(f"unknown platform: {platform}")
+
+
+def account_region_of(platform: str) -> str:
+    return ACCOUNT_REGIONS[region_of(platform)]
+
+
+def platform_of_match(match_id: str) -> str:
+    """
+    "KR_7312345678" 같은 match_id의 접두어로 플랫폼을 알아냅니다.
+    """
+    return match_id.split('_', 1)[0].lower()
+
+
+def parse_list_env(name: str, default: str):
+    # "kr,jp1" 형태의 환경 변수를 소문자 리스트로 변환합니다.
+    return [value.strip().lower() for value in os.getenv(name, default).split(',') if value.strip()]
@@ -1,12 +1,26 @@
 import os
 import time
+import logging
 import asyncio
 import aiohttp
+import random
 import datetime
 import pandas as pd
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+from .rate_limiter import rate_limiter
+from .circuit_breaker import circuit_breakers, HALF_OPEN
+from .export import write_frame, read_frame
+from .http_client import shared_session, json_loads
+from .metrics import metrics, RIOT_REQUESTS, RIOT_LATENCY, RIOT_LIMIT_WAIT, RIOT_RATE_LIMITED
+from .regions import DEFAULT_PLATFORM, DEFAULT_TIER, region_of, account_region_of, platform_of_match
+
 load_dotenv()
+logger = logging.getLogger(__name__)
 api_key = os.getenv('RIOT_API_KEY')
 
 request_header = {
@@ -17,125 +31,282 @@ request_header = {
     "X-Riot-Token": api_key
 }
 
-base_url = "https://kr.api.riotgames.com/tft/"
-match_base_url = "https://asia.api.riotgames.com/tft/match/v1/"
-account_base_url = "https://asia.api.riotgames.com/riot/account/v1/accounts/"
+# API 주소 형식. {host}에 kr, asia 같은 라우팅 호스트가 들어갑니다.
+# 벤치마크에서는 "http://127.0.0.1:8089/{host}"처럼 로컬 목 서버로 바꿔서 사용합니다.
+RIOT_API_URL = os.getenv('RIOT_API_URL', 'https://{host}.api.riotgames.com')
 
-DEFAULT_API_CALL_DELAY = 0.125
-MIN_RETRY_DELAY = 120
 
-# 챌린저 유저 데이터 가져오는 함수
-async def fetch_challenger_data(session: aiohttp.ClientSession):
-    url = base_url + 'league/v1/challenger'
+def api_url(host: str) -> str:
+    return RIOT_API_URL.format(host=host)
+
+
+def routing_host(url: str) -> str:
+    """
+    요청 URL의 라우팅 호스트(kr, asia 등)를 반환합니다. rate limit과 회로 차단기는 이 값 단위로 나뉩니다.
+    RIOT_API_URL이 호스트를 경로에 넣는 형식이면 첫 번째 경로 조각을 사용합니다.
+    """
+    parts = urlsplit(url)
+    if '{host}' in urlsplit(RIOT_API_URL).path:
+        return parts.path.lstrip('/').split('/', 1)[0]
+    return parts.hostname.split('.')[0]
+
+
+def platform_url(platform: str = DEFAULT_PLATFORM) -> str:
+    # 리그 / 소환사 API는 플랫폼(kr, jp1, na1 ...) 호스트를 사용합니다.
+    return f"{api_url(platform.lower())}/tft/"
+
+
+def match_url(platform: str = DEFAULT_PLATFORM) -> str:
+    # 매치 API는 플랫폼이 속한 라우팅 지역(asia, americas ...) 호스트를 사용합니다.
+    return f"{api_url(region_of(platform))}/tft/match/v1/"
+
+
+def account_url(platform: str = DEFAULT_PLATFORM) -> str:
+    return f"{api_url(account_region_of(platform))}/riot/account/v1/accounts/"
+
+
+base_url = platform_url()
+match_base_url = match_url()
+account_base_url = account_url()
+
+# 재시도할 서버 오류 응답 코드
+RETRY_STATUSES = {500, 502, 503, 504}
+# 5xx / 타임아웃 / 연결 오류에 대한 최대 시도 횟수
+MAX_ATTEMPTS = int(os.getenv('RIOT_MAX_ATTEMPTS', 5))
+# 429 응답에 대한 최대 재시도 횟수 (Retry-After만큼 기다린 뒤 다시 시도)
+MAX_RATE_LIMITED_RETRIES = int(os.getenv('RIOT_MAX_429_RETRIES', 10))
+# 지수 백오프 기본 / 최대 대기 시간 (초)
+BACKOFF_BASE = float(os.getenv('RIOT_BACKOFF_BASE', 0.5))
+BACKOFF_CAP = float(os.getenv('RIOT_BACKOFF_CAP', 30))
+# 429 응답에 Retry-After가 없거나 읽을 수 없을 때 기다리는 시간 (초)
+RETRY_AFTER_DEFAULT = float(os.getenv('RIOT_RETRY_AFTER_DEFAULT', 1))
+# process_match_details에서 동시에 기다리는 매치 상세 요청 수
+MATCH_DETAIL_CONCURRENCY = int(os.getenv('MATCH_DETAIL_CONCURRENCY', 20))
+
+
+@dataclass
+class ApiResult:
+    """
+    Riot API 요청 결과. status가 None이면 응답을 받지 못한 경우입니다. (연결 오류, 회로 차단 등)
+    """
+    status: Optional[int]
+    data: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+# 호스트 / 메서드 / 창별로 지금 더 보낼 수 있는 요청 수
+metrics.gauge_callback(
+    'riot_rate_limit_headroom', 'rate limit 창별 남은 요청 수 (method가 비어 있으면 앱 한도)',
+    ('host', 'method', 'window_seconds'), rate_limiter.headroom)
+
+
+def backoff_delay(attempt: int) -> float:
+    # full jitter: 0 ~ min(cap, base * 2^attempt) 사이의 무작위 대기
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 바꿉니다.
+    없거나 읽을 수 없으면 RETRY_AFTER_DEFAULT를 반환합니다.
+    """
+    if value is None:
+        return RETRY_AFTER_DEFAULT
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return RETRY_AFTER_DEFAULT
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+# 공용 GET 요청 함수: 호출 전에 제한기와 회로 차단기를 통과하고, 응답 헤더로 제한기를 갱신합니다.
+async def riot_get(session: aiohttp.ClientSession, url: str, method: str, raw: bool = False) -> ApiResult:
+    """
+    host(kr, asia 등)와 method(엔드포인트 이름) 단위의 제한을 지키며 GET 요청을 보냅니다.
+    raw이면 성공 응답을 디코딩하지 않고 본문 bytes 그대로 data에 담습니다.
+    429는 Retry-After만큼, 5xx / 타임아웃은 지터를 준 지수 백오프로 정해진 횟수까지 다시 시도합니다.
+    호스트의 회로가 열려 있으면 요청하지 않고 바로 실패 결과를 반환합니다.
+    """
+    host = routing_host(url)
+    breaker = circuit_breakers.for_host(host)
+    attempts = 0
+    rate_limited = 0
     while True:
-        async with session.get(url, headers=request_header) as response:
-            if response.status == 429:  # Rate limit exceeded
-                retry_after = int(response.headers.get('Retry-After', 1))
-                await asyncio.sleep(retry_after)
-                continue
-            return await response.json()
+        if not breaker.allow():
+            RIOT_REQUESTS.inc(host, method, 'circuit_open')
+            return ApiResult(None, error=f"circuit open for {host}")
+
+        # 이 요청이 회로를 다시 닫을지 정하는 시험 요청인지 기록해 둡니다.
+        probing = breaker.state == HALF_OPEN
+        status = None
+        try:
+            waited_at = time.perf_counter()
+            async with rate_limiter.slot(host, method):
+                started_at = time.perf_counter()
+                RIOT_LIMIT_WAIT.observe(started_at - waited_at, host)
+                try:
+                    async with session.get(url, headers=request_header) as response:
+                        RIOT_LATENCY.observe(time.perf_counter() - started_at, host, method)
+                        rate_limiter.update(host, method, response.headers)
+                        status = response.status
+                        RIOT_REQUESTS.inc(host, method, status)
+                        if status == 429:
+                            breaker.record_success()
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                            limit_type = response.headers.get('X-Rate-Limit-Type')
+                            RIOT_RATE_LIMITED.inc(host, method, limit_type or 'unknown')
+                            rate_limiter.penalize(host, method, retry_after, limit_type)
+                            rate_limited += 1
+                            if rate_limited > MAX_RATE_LIMITED_RETRIES:
+                                return ApiResult(status, error="rate limited")
+                            continue
+                        if status in RETRY_STATUSES:
+                            breaker.record_failure()
+                            error = f"HTTP {status}"
+                        else:
+                            breaker.record_success()
+                            if raw and status == 200:
+                                return ApiResult(status, await response.read())
+                            try:
+                                data = await response.json(content_type=None, loads=json_loads)
+                            except ValueError:
+                                data = None
+                            if status != 200:
+                                return ApiResult(status, data, error=f"HTTP {status}")
+                            return ApiResult(status, data)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    RIOT_REQUESTS.inc(host, method, 'error')
+                    breaker.record_failure()
+                    error = f"{type(e).__name__}: {e}"
+        except BaseException:
+            # 응답도 네트워크 오류도 없이 끝나면 (취소 등) 시험 요청 자리를 돌려줘 회로가 반쯤 열린 채 멈추지 않게 합니다.
+            if probing:
+                breaker.release_probe()
+            raise
+
+        attempts += 1
+        if attempts >= MAX_ATTEMPTS:
+            return ApiResult(status, error=error)
+        await asyncio.sleep(backoff_delay(attempts))
+
+# 리그 API 메서드 이름 (메서드별 rate limit 구분용)
+LEAGUE_METHODS = {
+    'challenger': 'league-v1.getChallengerLeague',
+    'grandmaster': 'league-v1.getGrandmasterLeague',
+    'master': 'league-v1.getMasterLeague',
+}
+
+# 티어(challenger / grandmaster / master) 리그 데이터 가져오는 함수
+async def fetch_league_data(session: aiohttp.ClientSession, tier: str = DEFAULT_TIER, platform: str = DEFAULT_PLATFORM):
+    url = platform_url(platform) + f'league/v1/{tier}'
+    result = await riot_get(session, url, LEAGUE_METHODS[tier])
+    if not result.ok:
+        logger.warning("League API call failed", extra={'platform': platform, 'tier': tier, 'error': result.error})
+        return None
+    return result.data
+
+# 챌린저 유저 데이터 가져오는 함수
+async def fetch_challenger_data(session: aiohttp.ClientSession, platform: str = DEFAULT_PLATFORM):
+    return await fetch_league_data(session, 'challenger', platform)
 
 # 매치 아이디 가져오는 함수
-async def fetch_match_ids(session: aiohttp.ClientSession, puuid: str, count: int = 10):
-    url = f"{match_base_url}matches/by-puuid/{puuid}/ids?count={count}"
-    while True:
-        async with session.get(url, headers=request_header) as response:
-            if response.status == 429:
-                retry_after = int(response.headers.get('Retry-After', 1))
-                await asyncio.sleep(retry_after)
-                continue
-            if response.status == 200:
-                return await response.json()
+async def fetch_match_ids(session: aiohttp.ClientSession, puuid: str, count: int = 10, start_time: int = None, platform: str = DEFAULT_PLATFORM):
+    """
+    start_time(epoch 초)이 주어지면 그 이후에 시작된 매치 ID만 가져옵니다.
+    """
+    url = f"{match_url(platform)}matches/by-puuid/{puuid}/ids?count={count}"
+    if start_time is not None:
+        url += f"&startTime={start_time}"
+    result = await riot_get(session, url, 'match-v1.getMatchIdsByPUUID')
+    if not result.ok:
+        logger.warning("Match IDs API call failed", extra={'puuid': puuid, 'error': result.error})
+        return None
+    return result.data
             
 # 매치 상세 데이터 가져오는 함수
 async def fetch_match_detail(session: aiohttp.ClientSession, match_id: str):
-    url = f"{match_base_url}matches/{match_id}"
-    while True:
-        async with session.get(url, headers=request_header) as response:
-            if response.status == 429:
-                retry_after = int(response.headers.get('Retry-After', 1))
-                await asyncio.sleep(retry_after)
-                continue
-            return await response.json()
+    # match_id 접두어(KR_, NA1_ ...)로 라우팅 지역을 정합니다.
+    url = f"{match_url(platform_of_match(match_id))}matches/{match_id}"
+    result = await riot_get(session, url, 'match-v1.getMatch')
+    if not result.ok:
+        logger.warning("Match API call failed", extra={'match_id': match_id, 'error': result.error})
+        return None
+    return result.data
+
+async def fetch_match_detail_raw(session: aiohttp.ClientSession, match_id: str):
+    """
+    매치 상세 응답 본문을 디코딩하지 않고 bytes로 반환합니다.
+    디코딩 / 변환은 match_parser.decode_match_batch로 따로 (프로세스 풀에서) 처리합니다.
+    """
+    url = f"{match_url(platform_of_match(match_id))}matches/{match_id}"
+    result = await riot_get(session, url, 'match-v1.getMatch', raw=True)
+    if not result.ok:
+        logger.warning("Match API call failed", extra={'match_id': match_id, 'error': result.error})
+        return None
+    return result.data
         
 # 유저 이름 가져오는 함수
-async def fetch_account_info_by_puuid(session: aiohttp.ClientSession, puuid: str):
+async def fetch_account_info_by_puuid(session: aiohttp.ClientSession, puuid: str, platform: str = DEFAULT_PLATFORM):
     """
     PUUID를 사용하여 Riot Account API에서 계정 정보 (gameName, tagLine)를 가져옵니다.
     """
-    url = f"{account_base_url}by-puuid/{puuid}" # Account API는 PUUID로 직접 조회
-    while True:
-        try:
-            async with session.get(url, headers=request_header) as response:
-                if response.status == 429:
-                    retry_after = int(response.headers.get('Retry-After', 1))
-                    #print(f"Rate limit hit for Account API (PUUID: {puuid}). Retrying after {retry_after} seconds...")
-                    await asyncio.sleep(retry_after)
-                    continue
-                response.raise_for_status()
-                data = await response.json()
-                return data # 딕셔너리 그대로 반환
-        except aiohttp.ClientError as e:
-            print(f"Error calling Account API for PUUID {puuid}: {e}")
-            return None
-        except Exception as e:
-            print(f"An unexpected error occurred for PUUID {puuid}: {e}")
-            return None
-
-async def fetch_summoner_details_by_puuid(session: aiohttp.ClientSession, puuid: str):
+    url = f"{account_url(platform)}by-puuid/{puuid}" # Account API는 PUUID로 직접 조회
+    result = await riot_get(session, url, 'account-v1.getByPuuid')
+    if not result.ok:
+        logger.warning("Account API call failed", extra={'puuid': puuid, 'error': result.error})
+        return None
+    return result.data # 딕셔너리 그대로 반환
+
+async def fetch_summoner_details_by_puuid(session: aiohttp.ClientSession, puuid: str, platform: str = DEFAULT_PLATFORM):
     """
     PUUID를 사용하여 TFT Summoner API에서 소환사 상세 정보 (ID, 레거시 이름, 레벨 등)를 가져옵니다.
     """
-    url = base_url + f'summoner/v1/summoners/by-puuid/{puuid}' # Summoner API는 PUUID로 조회
-    while True:
-        try:
-            async with session.get(url, headers=request_header) as response:
-                if response.status == 429:
-                    retry_after = int(response.headers.get('Retry-After', 1))
-                    #print(f"Rate limit hit for Summoner API (PUUID: {puuid}). Retrying after {retry_after} seconds...")
-                    await asyncio.sleep(retry_after)
-                    continue
-                response.raise_for_status()
-                data = await response.json()
-                return data # 딕셔너리 그대로 반환
-        except aiohttp.ClientError as e:
-            print(f"Error calling Summoner API for PUUID {puuid}: {e}")
-            return None
-        except Exception as e:
-            print(f"An unexpected error occurred for PUUID {puuid}: {e}")
-            return None
+    url = platform_url(platform) + f'summoner/v1/summoners/by-puuid/{puuid}' # Summoner API는 PUUID로 조회
+    result = await riot_get(session, url, 'summoner-v1.getByPUUID')
+    if not result.ok:
+        logger.warning("Summoner API call failed", extra={'puuid': puuid, 'error': result.error})
+        return None
+    return result.data # 딕셔너리 그대로 반환
 
 # 이름으로 유저 검색
-async def search_by_name(session: aiohttp.ClientSession, gameName: str, tagLine:str):
-    url = f"{account_base_url}by-riot-id/{gameName}/{tagLine}"
-    while True:
-        async with session.get(url, headers=request_header) as response:
-            if response.status == 429:
-                retry_after = int(response.headers.get('Retry-After', 1))
-                await asyncio.sleep(retry_after)
-                continue
-            return await response.json()
+async def search_by_name(session: aiohttp.ClientSession, gameName: str, tagLine:str, platform: str = DEFAULT_PLATFORM):
+    url = f"{account_url(platform)}by-riot-id/{gameName}/{tagLine}"
+    result = await riot_get(session, url, 'account-v1.getByRiotId')
+    if not result.ok:
+        logger.warning("Account API call failed", extra={'riot_id': f"{gameName}#{tagLine}", 'error': result.error})
+        return None
+    return result.data
         
 # 챌린저 데이터 DataFrame 생성
 async def process_challenger_data():
-    async with aiohttp.ClientSession() as session:
+    async with shared_session() as session:
         challenger  = await fetch_challenger_data(session)
         challenger_df = pd.DataFrame(challenger['entries'])
         
-        # 각 puuid에 대한 소환사 이름을 가져와서 리스트에 저장
+        # 각 puuid에 대한 Riot ID(gameName#tagLine)를 가져와서 리스트에 저장
         summoner_names = []
         for puuid in challenger_df['puuid']:
-            name = await search_by_name(session, puuid)
-            summoner_names.append(name)
+            account = await fetch_account_info_by_puuid(session, puuid)
+            summoner_names.append(f"{account.get('gameName', '')}#{account.get('tagLine', '')}" if account else None)
         
         # DataFrame에 summoner_name 열 추가
         challenger_df['summoner_name'] = summoner_names
         
-        challenger_df.to_csv('src/challenger_users.csv', index=False)
+        write_frame(challenger_df, 'challenger_users')
         return challenger_df
 
 async def process_match_ids():
-    async with aiohttp.ClientSession() as session:
+    async with shared_session() as session:
         # 챌린저 데이터 가져오기
         challenger_df = await process_challenger_data()
         
@@ -153,7 +324,9 @@ async def process_match_ids():
         # 결과 처리
         for result in results:
             if isinstance(result, Exception):
-                print(f"Error fetching matches: {str(result)}")
+                logger.error(f"Error fetching matches: {result}")
+                continue
+            if result is None:  # API 호출 실패 (fetch_match_ids에서 이미 로그를 남김)
                 continue
             all_match_ids.extend(result)
         
@@ -162,15 +335,15 @@ async def process_match_ids():
         
         # DataFrame 생성 및 저장
         match_ids_df = pd.DataFrame(unique_match_ids, columns=['match_id'])
-        match_ids_df.to_csv('challenger_match_ids.csv', index=False)
+        write_frame(match_ids_df, 'challenger_match_ids')
         
-        print(f"수집된 고유 매치 ID 개수: {len(unique_match_ids)}")
+        logger.info(f"수집된 고유 매치 ID 개수: {len(unique_match_ids)}")
         return match_ids_df
 
 async def process_match_details():
-    async with aiohttp.ClientSession() as session:
+    async with shared_session() as session:
         # 저장된 매치 ID 파일 읽기
-        match_ids_df = pd.read_csv('src/challenger_match_ids.csv')
+        match_ids_df = read_frame('challenger_match_ids')
         match_ids = match_ids_df['match_id'].tolist()
         
         # 매치 상세 정보를 저장할 리스트
@@ -179,71 +352,66 @@ async def process_match_details():
         # 참가자 정보를 저장할 리스트
         participant_details = []
 
-        # 병렬 처리를 위한 태스크 생성
-        tasks = []
-        for match_id in match_ids:
-            tasks.append(fetch_match_detail(session, match_id))
-        
-        # 모든 태스크 동시 실행 (최대 50개씩)
-        chunk_size = 50  # 청크 크기를 50으로 증가
-        for i in range(0, len(tasks), chunk_size):
-            chunk = tasks[i:i + chunk_size]
-            results = await asyncio.gather(*chunk, return_exceptions=True)
-            
-            for match_id, result in zip(match_ids[i:i + chunk_size], results):
-                if isinstance(result, Exception):
-                    print(f"Error fetching match details for match_id {match_id}: {str(result)}")
-                    continue
-                
-                try:
-                    match_detail = result
-                    # 필요한 정보 추출
-                    match_info = {
+        # 요청 간격은 riot_get의 공용 rate limiter가 맞추고,
+        # 매치 수만큼 코루틴이 한꺼번에 대기열에 쌓이지 않도록 동시 요청 수만 제한합니다.
+        semaphore = asyncio.Semaphore(MATCH_DETAIL_CONCURRENCY)
+
+        async def fetch(match_id):
+            async with semaphore:
+                return await fetch_match_detail(session, match_id)
+
+        results = await asyncio.gather(*(fetch(match_id) for match_id in match_ids), return_exceptions=True)
+
+        for match_id, result in zip(match_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching match details for match_id {match_id}: {result}")
+                continue
+            if result is None:
+                continue
+
+            try:
+                match_detail = result
+                # 필요한 정보 추출
+                match_info = {
+                    'match_id': match_id,
+                    'game_datetime': datetime.datetime.fromtimestamp(match_detail['info']['game_datetime'] / 1000),
+                    'game_length': match_detail['info']['game_length'],
+                    'game_version': match_detail['info']['game_version'],
+                    'queue_id': match_detail['info']['queue_id'],
+                    'tft_set_number': match_detail['info']['tft_set_number'],
+                }
+                match_details.append(match_info)
+
+                # 참가자 정보 추출
+                for participant in match_detail['info']['participants']:
+                    participant_info = {
                         'match_id': match_id,
-                        'game_datetime': datetime.datetime.fromtimestamp(match_detail['info']['game_datetime'] / 1000),
-                        'game_length': match_detail['info']['game_length'],
-                        'game_version': match_detail['info']['game_version'],
-                        'queue_id': match_detail['info']['queue_id'],
-                        'tft_set_number': match_detail['info']['tft_set_number'],
+                        'puuid': participant['puuid'],
+                        'placement': participant['placement'],
+                        'level': participant['level'],
+                        'gold_left': participant['gold_left'],
+                        'last_round': participant['last_round'],
+                        'players_eliminated': participant['players_eliminated'],
+                        'total_damage_to_players': participant['total_damage_to_players'],
+                        'traits': participant['traits'],
+                        'units': participant['units']
                     }
-                    match_details.append(match_info)
-                    
-                    # 참가자 정보 추출
-                    for participant in match_detail['info']['participants']:
-                        participant_info = {
-                            'match_id': match_id,
-                            'puuid': participant['puuid'],
-                            'placement': participant['placement'],
-                            'level': participant['level'],
-                            'gold_left': participant['gold_left'],
-                            'last_round': participant['last_round'],
-                            'players_eliminated': participant['players_eliminated'],
-                            'total_damage_to_players': participant['total_damage_to_players'],
-                            'traits': participant['traits'],
-                            'units': participant['units']
-                        }
-                        participant_details.append(participant_info)
-                    
-                except Exception as e:
-                    print(f"Error processing match details for match_id {match_id}: {str(e)}")
-                    continue
-            
-            # API 요청 제한을 위한 대기 (0.5초로 단축)
-            await asyncio.sleep(0.5)
-            
-            # 진행 상황 출력
-            print(f"진행률: {min(i + chunk_size, len(match_ids))}/{len(match_ids)}")
+                    participant_details.append(participant_info)
+
+            except Exception as e:
+                logger.error(f"Error processing match details for match_id {match_id}: {e}")
+                continue
         
         # DataFrame 생성 및 저장
         match_details_df = pd.DataFrame(match_details)
-        match_details_df.to_csv('src/challenger_match_details.csv', index=False)
+        write_frame(match_details_df, 'challenger_match_details')
         
         # 참가자 정보 DataFrame 생성 및 저장
         participant_details_df = pd.DataFrame(participant_details)
-        participant_details_df.to_csv('src/challenger_match_participants.csv', index=False)
+        write_frame(participant_details_df, 'challenger_match_participants')
 
-        print(f"수집된 매치 상세 정보 개수: {len(match_details)}")
-        print(f"수집된 매치 참가자 정보 개수: {len(participant_details)}")
+        logger.info(f"수집된 매치 상세 정보 개수: {len(match_details)}")
+        logger.info(f"수집된 매치 참가자 정보 개수: {len(participant_details)}")
         return match_details_df
 
 '''
@@ -252,15 +420,15 @@ async def main():
     
     # 챌린저 데이터 수집
     challenger_df = await process_challenger_data()
-    print(f"챌린저 데이터 수집 완료: {time.time() - start_time:.2f}초")
+    logger.info(f"챌린저 데이터 수집 완료: {time.time() - start_time:.2f}초")
     
     # 매치 ID 수집
     match_ids_df = await process_match_ids()
-    print(f"매치 ID 수집 완료: {time.time() - start_time:.2f}초")
+    logger.info(f"매치 ID 수집 완료: {time.time() - start_time:.2f}초")
     
     # 매치 상세 정보 수집
     match_details_df = await process_match_details()
-    print(f"매치 상세 정보 수집 완료: {time.time() - start_time:.2f}초")
+    logger.info(f"매치 상세 정보 수집 완료: {time.time() - start_time:.2f}초")
     
-    print(f"전체 실행 시간: {time.time() - start_time:.2f}초")
+    logger.info(f"전체 실행 시간: {time.time() - start_time:.2f}초")
 '''
\ No newline at end of file
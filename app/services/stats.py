@@ -0,0 +1,139 @@
+# tft/app/services/stats.py
+
+import logging
+import numpy as np
+import pandas as pd
+import mysql.connector
+
+from .database import get_db_connection, close_db_connection, NAME_KIND_TRAIT, NAME_KIND_UNIT, NAME_KIND_ITEM, META_AGGREGATE_TABLES
+
+logger = logging.getLogger(__name__)
+
+# 통계에 포함할 최소 사용 횟수 (표본이 너무 적은 조합 제외)
+DEFAULT_MIN_PLAY_COUNT = 10
+
+STAT_KINDS = ('units', 'traits', 'items', 'unit_items', 'comps')
+
+# 통계 종류 -> 미리 집계된 테이블
+AGGREGATE_TABLES = {
+    'units': 'meta_unit_stats',
+    'traits': 'meta_trait_stats',
+    'items': 'meta_item_stats',
+    'unit_items': 'meta_unit_item_stats',
+    'comps': 'meta_comp_stats',
+}
+
+
+def _fetch_frame(sql: str, params, columns: list):
+    """
+    SQL 결과를 DataFrame으로 읽습니다. 행 단위 파이썬 처리 없이 한 번에 변환합니다.
+    DB 오류면 None을 반환합니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    except mysql.connector.Error as err:
+        logger.error(f"Error loading stats data from MySQL: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_db_connection(conn)
+
+
+def load_name_maps():
+    """
+    tft_names의 {id: name} 매핑을 종류별로 읽어옵니다.
+    """
+    names = _fetch_frame("SELECT id, kind, name FROM tft_names", (), ['id', 'kind', 'name'])
+    if names is None:
+        return None
+    maps = {}
+    for kind in (NAME_KIND_TRAIT, NAME_KIND_UNIT, NAME_KIND_ITEM):
+        subset = names[names['kind'] == kind]
+        maps[kind] = pd.Series(subset['name'].to_numpy(), index=subset['id'].to_numpy())
+    return maps
+
+
+def aggregate_placements(frame: pd.DataFrame, keys: list, total_boards: int, min_play_count: int = 1):
+    """
+    keys별 사용 횟수 / 등수 합 / top 4 횟수(play_count, placement_sum, top4_count) 합계로
+    평균 등수, top 4 비율, 픽률을 열 단위로 계산하고 평균 등수 순으로 정렬합니다.
+    """
+    columns = keys + ['play_count', 'avg_placement', 'top4_rate', 'pick_rate']
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    play_count = frame['play_count'].to_numpy(dtype=np.int64)
+    stats = frame[keys].assign(
+        play_count=play_count,
+        avg_placement=frame['placement_sum'].to_numpy(dtype=np.float64) / play_count,
+        top4_rate=frame['top4_count'].to_numpy(dtype=np.float64) / play_count,
+        pick_rate=play_count / total_boards if total_boards else 0.0,
+    )
+    stats = stats[stats['play_count'] >= min_play_count]
+    return stats.sort_values(['avg_placement', 'play_count'], ascending=[True, False], ignore_index=True)
+
+
+def _comp_name(comp: str, trait_names) -> str:
+    # "trait_id:tier,..." 조합 키를 "특성 이름 단계, ..."로 바꿉니다.
+    parts = []
+    for part in comp.split(','):
+        trait_id, tier = part.split(':')
+        parts.append(f"{trait_names.get(int(trait_id), trait_id)} {tier}")
+    return ', '.join(parts)
+
+
+def fetch_meta_aggregates(game_version: str = None, tft_set_number: int = None, min_play_count: int = DEFAULT_MIN_PLAY_COUNT):
+    """
+    유닛 / 특성 / 아이템 / 유닛+아이템 / 특성 조합(comps)별 통계를 미리 집계된 meta_*_stats 테이블에서 읽어
+    {'total_boards': 보드 수, 종류: 레코드 리스트} 형태로 반환합니다. DB 오류면 None을 반환합니다.
+    game_version을 주면 기본 키 범위만 읽으므로 저장된 매치 수와 관계없이 빠릅니다.
+    필터가 없거나 tft_set_number만 주면 해당 패치들의 집계 행을 합칩니다.
+    """
+    conditions = []
+    params = []
+    if game_version is not None:
+        conditions.append("s.game_version = %s")
+        params.append(game_version)
+    if tft_set_number is not None:
+        conditions.append("s.game_version IN (SELECT game_version FROM meta_patch_totals WHERE tft_set_number = %s)")
+        params.append(tft_set_number)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+    totals = _fetch_frame(f"SELECT COALESCE(SUM(s.board_count), 0) FROM meta_patch_totals s {where}", params, ['boards'])
+    name_maps = load_name_maps()
+    if totals is None or name_maps is None:
+        return None
+    total_boards = int(totals['boards'].iloc[0]) if len(totals) else 0
+    id_columns = {'unit_id': NAME_KIND_UNIT, 'trait_id': NAME_KIND_TRAIT, 'item_id': NAME_KIND_ITEM}
+
+    result = {'total_boards': total_boards}
+    for kind, table in AGGREGATE_TABLES.items():
+        keys = list(META_AGGREGATE_TABLES[table])
+        key_columns = ', '.join(f"s.{key}" for key in keys)
+        frame = _fetch_frame(f"""
+            SELECT {key_columns}, SUM(s.play_count), SUM(s.placement_sum), SUM(s.top4_count)
+            FROM {table} s {where}
+            GROUP BY {key_columns}
+            HAVING SUM(s.play_count) >= %s
+        """, params + [min_play_count], keys + ['play_count', 'placement_sum', 'top4_count'])
+        if frame is None:
+            return None
+        frame = aggregate_placements(frame, keys, total_boards, min_play_count)
+        for column, name_kind in id_columns.items():
+            if column in frame:
+                frame[column.replace('_id', '_name')] = frame[column].map(name_maps[name_kind])
+        if kind == 'comps':
+            trait_names = name_maps[NAME_KIND_TRAIT].to_dict()
+            frame['comp_name'] = [_comp_name(comp, trait_names) for comp in frame['comp']]
+        result[kind] = frame.to_dict('records')
+    return result
@@ -0,0 +1,11 @@
+# tft/tests/conftest.py
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 수집기는 app 패키지(from .services ...)로, 웹 서버는 app 디렉터리 안에서(from services ...) 실행되므로 둘 다 경로에 넣습니다.
+# app 디렉터리를 뒤에 두어 "app"이 app/app.py가 아니라 패키지로 임포트되게 합니다.
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'app'))
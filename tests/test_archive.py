@@ -0,0 +1,68 @@
+# tft/tests/test_archive.py
+
+import gzip
+import json
+
+import pytest
+
+from app import data_collector
+from app.services import archive
+from app.benchmark.mock_riot import MockConfig, synthesize_match
+
+
+@pytest.fixture(params=['gzip', 'zstd'])
+def codec(request, monkeypatch):
+    if request.param == 'zstd':
+        pytest.importorskip('zstandard')
+        monkeypatch.setattr(archive, 'SEGMENT_SUFFIX', '.jsonl.zst')
+    else:
+        monkeypatch.setattr(archive, 'zstandard', None)
+        monkeypatch.setattr(archive, 'SEGMENT_SUFFIX', '.jsonl.gz')
+    return request.param
+
+
+def body(match_id, pretty=False):
+    detail = synthesize_match(match_id, MockConfig(players_per_match=2))
+    return json.dumps(detail, indent=2 if pretty else None).encode()
+
+
+def write_archive(root, match_ids, segment_max_records=2):
+    with archive.MatchArchiveWriter(str(root), segment_max_records) as writer:
+        for index, match_id in enumerate(match_ids):
+            # 여러 줄로 된 응답도 한 줄로 저장됩니다.
+            writer.append_raw(body(match_id, pretty=index % 2 == 0), archive.partition_for(10, 'Version 14.1.2'))
+
+
+def test_write_then_read_round_trip(tmp_path, codec):
+    match_ids = ['KR_1', 'KR_2', 'KR_3']
+    write_archive(tmp_path, match_ids)
+
+    segments = archive.list_segments(str(tmp_path), tft_set_number=10, patch='14.1')
+    assert len(segments) == 2
+    assert all(path.endswith(archive.SEGMENT_SUFFIX) for path in segments)
+    assert [match_id for match_id, _ in archive.iter_archived_matches(str(tmp_path))] == match_ids
+    assert [detail for _, detail in archive.iter_archived_matches(str(tmp_path))] == [json.loads(body(m)) for m in match_ids]
+    assert list(archive.iter_archived_matches(str(tmp_path), patch='14.2')) == []
+
+
+def test_recovers_complete_lines_of_partial_segment(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, 'zstandard', None)
+    monkeypatch.setattr(archive, 'SEGMENT_SUFFIX', '.jsonl.gz')
+    directory = tmp_path / 'set=10' / 'patch=14.1'
+    directory.mkdir(parents=True)
+    # 이미 끝난 프로세스(없는 pid)가 중간에 남긴 .part 세그먼트
+    with gzip.open(directory / 'segment-20240101000000-999999999-0.jsonl.gz.part', 'wb') as f:
+        f.write(body('KR_1') + b'\n' + body('KR_2')[:20])
+
+    assert archive.recover_partial_segments(str(tmp_path)) == 1
+    assert [match_id for match_id, _ in archive.iter_archived_matches(str(tmp_path))] == ['KR_1']
+
+
+def test_backfill_reads_given_root(tmp_path, codec, monkeypatch):
+    write_archive(tmp_path, ['KR_1', 'KR_2', 'KR_3'])
+    batches = []
+    monkeypatch.setattr(data_collector, 'save_matches_to_db',
+                        lambda matches, participants: batches.append([m.match_id for m in matches]) or len(matches))
+
+    assert data_collector.backfill_from_archive(str(tmp_path), batch_size=2) == 3
+    assert batches == [['KR_1', 'KR_2'], ['KR_3']]
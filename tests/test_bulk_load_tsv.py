@@ -0,0 +1,69 @@
+# tft/tests/test_bulk_load_tsv.py
+
+import math
+
+import pytest
+
+from app.services.export import write_tsv
+
+# LOAD DATA (ESCAPED BY '\\')가 백슬래시 뒤 문자를 해석하는 규칙
+MYSQL_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def _unescape(raw):
+    # 필드 전체가 \N일 때만 NULL이고, 그 밖의 백슬래시는 뒤 문자를 해석합니다.
+    if raw == '\\N':
+        return None
+    chars, escaped = [], False
+    for char in raw:
+        if escaped:
+            chars.append(MYSQL_ESCAPES.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def read_load_data(text):
+    """
+    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' 형식을 MySQL과 같은 규칙으로 읽습니다.
+    """
+    rows, row, raw, escaped = [], [], [], False
+    for char in text:
+        if not escaped and char in '\t\n':
+            row.append(_unescape(''.join(raw)))
+            raw = []
+            if char == '\n':
+                rows.append(tuple(row))
+                row = []
+            continue
+        escaped = not escaped and char == '\\'
+        raw.append(char)
+    assert not raw and not row
+    return rows
+
+
+ROWS = [
+    ('KR_1', 'tab\there', 'line\nbreak', 'back\\slash', None),
+    ('KR_2', 'carriage\rreturn', 'nul\0byte', '\\N', ''),
+    ('KR_3', 'trailing\\', '\\t literal', '끝\t\n\\', 'x'),
+]
+
+
+def test_round_trips_special_characters(tmp_path):
+    path = tmp_path / 'rows.tsv'
+    assert write_tsv(ROWS, str(path)) == len(ROWS)
+    assert read_load_data(path.read_text(encoding='utf-8')) == ROWS
+
+
+@pytest.mark.parametrize('value, expected', [
+    (math.nan, None),
+    ([{'name': 'a\tb'}], '[{"name": "a\\tb"}]'),
+    (3, '3'),
+])
+def test_nan_and_nested_values(tmp_path, value, expected):
+    path = tmp_path / 'rows.tsv'
+    write_tsv([('KR_1', value)], str(path))
+    assert read_load_data(path.read_text(encoding='utf-8')) == [('KR_1', expected)]
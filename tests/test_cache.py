@@ -0,0 +1,149 @@
+# tft/tests/test_cache.py
+
+import threading
+
+from app.services.cache import GenerationCache
+
+
+class Source:
+    # loader / generation_loader 호출 횟수를 세는 가짜 데이터 원본
+    def __init__(self):
+        self.generation = 1
+        self.loads = 0
+        self.generation_checks = 0
+
+    def load(self, page):
+        self.loads += 1
+        return (page, self.generation)
+
+    def load_generation(self):
+        self.generation_checks += 1
+        return self.generation
+
+
+def test_returns_cached_value_within_ttl():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=60)
+    assert cache.get(1) == (1, 1)
+    source.generation = 2
+    # TTL 안에서는 세대 번호도 확인하지 않습니다.
+    assert cache.get(1) == (1, 1)
+    assert source.loads == 1
+    assert source.generation_checks == 1
+
+
+def test_same_generation_keeps_entries_after_ttl():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=0)
+    entry = cache.get_entry(1)
+    assert cache.get_entry(1) is entry
+    assert source.loads == 1
+    assert source.generation_checks == 2
+
+
+def test_new_generation_invalidates_entries():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=0)
+    cache.get(1)
+    cache.get(2)
+    source.generation = 2
+    assert cache.get(1) == (1, 2)
+    assert cache.get(2) == (2, 2)
+    assert source.loads == 4
+
+
+def test_unknown_generation_always_reloads():
+    # 세대 번호를 읽지 못하면 (DB 오류 등) 캐시를 믿지 않습니다.
+    source = Source()
+    cache = GenerationCache(source.load, lambda: None, ttl=0)
+    cache.get(1)
+    cache.get(1)
+    assert source.loads == 2
+
+
+def test_evicts_oldest_entry():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=60, max_entries=2)
+    cache.get(1)
+    cache.get(2)
+    cache.get(3)
+    assert list(cache._entries) == [(2,), (3,)]
+
+
+def test_render_is_reused_per_entry():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=60)
+    renders = []
+    entry = cache.get_entry(1)
+    entry.render('html', lambda value: renders.append(value) or 'page')
+    assert cache.get_entry(1).render('html', lambda value: renders.append(value) or 'other') == 'page'
+    assert len(renders) == 1
+
+
+def test_invalidate_forces_reload():
+    source = Source()
+    cache = GenerationCache(source.load, source.load_generation, ttl=60)
+    cache.get(1)
+    cache.invalidate()
+    cache.get(1)
+    assert source.loads == 2
+
+
+def test_failed_load_is_not_cached():
+    # loader가 None을 반환하면 (DB 오류) 저장하지 않고 다음 요청에서 다시 읽습니다.
+    source = Source()
+    results = [None, 'page']
+
+    def load(page):
+        source.loads += 1
+        return results.pop(0)
+
+    cache = GenerationCache(load, source.load_generation, ttl=60)
+    assert cache.get_entry(1) is None
+    assert cache.get(1) == 'page'
+    assert cache.get(1) == 'page'
+    assert source.loads == 2
+
+
+def test_slow_load_does_not_block_other_keys():
+    started = threading.Event()
+    release = threading.Event()
+
+    def load(page):
+        if page == 1:
+            started.set()
+            release.wait(5)
+        return page
+
+    cache = GenerationCache(load, lambda: 1, ttl=60)
+    slow = threading.Thread(target=cache.get, args=(1,))
+    slow.start()
+    assert started.wait(5)
+    try:
+        # 키 1을 읽는 동안에도 키 2는 기다리지 않고 바로 읽습니다.
+        assert cache.get(2) == 2
+    finally:
+        release.set()
+        slow.join(5)
+    assert cache.get(1) == 1
+
+
+def test_same_key_is_loaded_once():
+    loads = []
+    release = threading.Event()
+
+    def load(page):
+        loads.append(page)
+        release.wait(5)
+        return page
+
+    cache = GenerationCache(load, lambda: 1, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(1))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [1] * 4
+    assert loads == [1]
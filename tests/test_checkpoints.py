@@ -0,0 +1,22 @@
+# tft/tests/test_checkpoints.py
+
+import asyncio
+import datetime
+import logging
+
+from app import data_collector
+
+CHECKPOINTS = {'p1': {'last_match_id': 'KR_1', 'last_game_datetime': datetime.datetime(2024, 1, 1)}}
+
+
+def test_save_checkpoints(monkeypatch):
+    monkeypatch.setattr(data_collector, 'save_crawl_checkpoints', lambda checkpoints: len(checkpoints))
+    assert asyncio.run(data_collector._save_checkpoints(CHECKPOINTS))
+    assert asyncio.run(data_collector._save_checkpoints({}))
+
+
+def test_failed_checkpoint_save_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(data_collector, 'save_crawl_checkpoints', lambda checkpoints: 0)
+    with caplog.at_level(logging.WARNING, logger=data_collector.logger.name):
+        assert not asyncio.run(data_collector._save_checkpoints(CHECKPOINTS))
+    assert 'Failed to save crawl checkpoints' in caplog.text
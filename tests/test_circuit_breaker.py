@@ -0,0 +1,108 @@
+# tft/tests/test_circuit_breaker.py
+
+import asyncio
+
+import pytest
+
+from app.services import riot_api
+from app.services.rate_limiter import RateLimiter
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakers, CLOSED, OPEN, HALF_OPEN
+
+
+def open_breaker(cooldown=0.0):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=cooldown)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = open_breaker(cooldown=60)
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_probe():
+    breaker = open_breaker()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # 시험 요청의 결과가 나오기 전에는 다른 요청을 보내지 않습니다.
+    assert not breaker.allow()
+
+
+def test_probe_success_closes():
+    breaker = open_breaker()
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_probe_failure_reopens():
+    breaker = open_breaker(cooldown=60)
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    # cooldown을 처음부터 다시 기다립니다.
+    assert not breaker.allow()
+
+
+def test_release_probe_lets_next_request_probe():
+    breaker = open_breaker(cooldown=60)
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == OPEN
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_release_probe_ignores_closed_breaker():
+    breaker = CircuitBreaker()
+    breaker.release_probe()
+    assert breaker.state == CLOSED
+
+
+class HangingRequest:
+    async def __aenter__(self):
+        await asyncio.sleep(10)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class HangingSession:
+    def get(self, url, headers=None):
+        return HangingRequest()
+
+
+def test_cancelled_probe_is_released(monkeypatch):
+    breakers = CircuitBreakers()
+    monkeypatch.setattr(riot_api, 'circuit_breakers', breakers)
+    monkeypatch.setattr(riot_api, 'rate_limiter', RateLimiter('1000:1'))
+    breaker = breakers.for_host('kr')
+    breaker.state = OPEN
+    breaker.opened_at -= breaker.cooldown
+
+    async def run():
+        task = asyncio.create_task(riot_api.riot_get(HangingSession(), 'https://kr.api.riotgames.com/tft/x', 'x'))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    # 취소된 시험 요청이 자리를 돌려줘 다음 요청이 바로 시험 요청이 됩니다.
+    assert breaker.state == OPEN
+    assert breaker.allow()
@@ -0,0 +1,30 @@
+# tft/tests/test_comp_signature.py
+
+from app.services.database import comp_signature
+from app.services.records import TraitRow
+
+TRAIT_IDS = {'TFT_Bruiser': 7, 'TFT_Mage': 3, 'TFT_Rogue': 12}
+
+
+def trait(name, tier_current):
+    return TraitRow(name=name, num_units=2, style=1, tier_current=tier_current, tier_total=3)
+
+
+def test_orders_active_traits_by_id():
+    traits = [trait('TFT_Rogue', 1), trait('TFT_Bruiser', 2), trait('TFT_Mage', 3)]
+    assert comp_signature(traits, TRAIT_IDS) == '3:3,7:2,12:1'
+
+
+def test_skips_inactive_and_unknown_traits():
+    traits = [trait('TFT_Mage', 0), trait('TFT_Bruiser', 1), trait('TFT_Unknown', 2)]
+    assert comp_signature(traits, TRAIT_IDS) == '7:1'
+
+
+def test_same_board_in_any_order_has_same_signature():
+    traits = [trait('TFT_Mage', 1), trait('TFT_Rogue', 2)]
+    assert comp_signature(traits, TRAIT_IDS) == comp_signature(list(reversed(traits)), TRAIT_IDS)
+
+
+def test_no_active_traits():
+    assert comp_signature([trait('TFT_Mage', 0)], TRAIT_IDS) == ''
+    assert comp_signature([], TRAIT_IDS) == ''
@@ -0,0 +1,33 @@
+# tft/tests/test_leaderboard_cursor.py
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+from app.app import parse_leaderboard_cursor, parse_leaderboard_limit, LEADERBOARD_PAGE_SIZE, LEADERBOARD_MAX_PAGE_SIZE
+
+
+def test_empty_cursor_is_first_page():
+    assert parse_leaderboard_cursor(None) == (0, None, None)
+    assert parse_leaderboard_cursor('') == (0, None, None)
+
+
+def test_parses_cursor():
+    assert parse_leaderboard_cursor('50:1234:abc-def') == (50, 1234, 'abc-def')
+
+
+def test_puuid_may_contain_colons():
+    assert parse_leaderboard_cursor('1:0:a:b') == (1, 0, 'a:b')
+
+
+@pytest.mark.parametrize('cursor', ['abc', '1:2', 'x:2:p', '1:y:p'])
+def test_invalid_cursor_is_bad_request(cursor):
+    with pytest.raises(BadRequest):
+        parse_leaderboard_cursor(cursor)
+
+
+def test_limit_defaults_and_clamps():
+    assert parse_leaderboard_limit(None) == LEADERBOARD_PAGE_SIZE
+    assert parse_leaderboard_limit('0') == 1
+    assert parse_leaderboard_limit('100000') == LEADERBOARD_MAX_PAGE_SIZE
+    with pytest.raises(BadRequest):
+        parse_leaderboard_limit('ten')
@@ -0,0 +1,49 @@
+# tft/tests/test_match_writer.py
+
+import time
+import asyncio
+
+from app import data_collector
+from test_save_matches import parsed_matches
+
+
+def test_flushes_full_batches_and_rest_on_close(monkeypatch):
+    monkeypatch.setattr(data_collector, 'save_matches_to_db', lambda matches, participants: len(matches))
+    matches, participants = parsed_matches()
+    flushes = []
+
+    async def run():
+        queue = asyncio.Queue()
+        writer = asyncio.create_task(data_collector._match_writer(
+            queue, batch_size=2, on_flush=lambda m, p, ok: flushes.append((len(m), ok))))
+        for match in matches + matches[:1]:
+            await queue.put((match, [p for p in participants if p.match_id == match.match_id], b''))
+        await queue.put(None)
+        return await writer
+
+    assert asyncio.run(run()) == 3
+    assert flushes == [(2, True), (1, True)]
+
+
+def test_trickle_is_flushed_by_age_of_oldest_item(monkeypatch):
+    flushed_at = []
+    monkeypatch.setattr(data_collector, 'save_matches_to_db', lambda matches, participants: len(matches))
+    matches, participants = parsed_matches()
+
+    async def run():
+        queue = asyncio.Queue()
+        writer = asyncio.create_task(data_collector._match_writer(
+            queue, batch_size=100, on_flush=lambda m, p, ok: flushed_at.append(time.monotonic()), flush_interval=0.1))
+        started_at = time.monotonic()
+        # 새 항목이 flush_interval보다 자주 들어와도 배치가 계속 쌓이기만 하면 안 됩니다.
+        while time.monotonic() - started_at < 0.35:
+            await queue.put((matches[0], [], b''))
+            await asyncio.sleep(0.02)
+        first_flush = flushed_at[0] - started_at if flushed_at else None
+        await queue.put(None)
+        await writer
+        return first_flush
+
+    first_flush = asyncio.run(run())
+    assert first_flush is not None and first_flush < 0.2
+    assert len(flushed_at) >= 3
@@ -0,0 +1,162 @@
+# tft/tests/test_meta_aggregates.py
+
+import re
+import datetime
+
+import mysql.connector
+import pytest
+
+from app.services import database
+from app.services.records import MatchRow, ParticipantRow, TraitRow, UnitRow
+
+
+class FakeDatabase:
+    """
+    update_meta_aggregates가 보내는 쿼리만 흉내 내는 MySQL 대역.
+    커밋 전 변경은 트랜잭션에 모아 두었다가 commit에서 반영하고 rollback에서 버립니다.
+    """
+
+    def __init__(self):
+        self.ledger = {}       # match_id -> batch_token
+        self.aggregates = {}   # (table, key) -> [값...]
+        self.errors = []       # 다음 집계 INSERT에서 차례로 던질 예외
+        self.attempts = 0
+        self._ledger = {}
+        self._aggregates = []
+
+    def connect(self, timeout=None):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.db.ledger.update(self.db._ledger)
+        for table, key, values in self.db._aggregates:
+            current = self.db.aggregates.setdefault((table, key), [0] * len(values))
+            for index, value in enumerate(values):
+                current[index] += value
+        self.rollback()
+
+    def rollback(self):
+        self.db._ledger = {}
+        self.db._aggregates = []
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+    def execute(self, sql, params=()):
+        db = self.db
+        self.rows = []
+        if sql.startswith('INSERT IGNORE INTO meta_aggregated_matches'):
+            db.attempts += 1
+            for match_id, token in zip(params[::2], params[1::2]):
+                if match_id not in db.ledger and match_id not in db._ledger:
+                    db._ledger[match_id] = token
+        elif 'FROM meta_aggregated_matches' in sql:
+            token = params[0]
+            ledger = {**db.ledger, **db._ledger}
+            self.rows = [(match_id,) for match_id in params[1:] if ledger.get(match_id) == token]
+        elif sql.startswith('INSERT INTO meta_'):
+            if db.errors:
+                raise db.errors.pop(0)
+            table, columns = re.match(r'INSERT INTO (\w+) \(([^)]*)\)', sql).groups()
+            width = len(columns.split(','))
+            key_width = 1 if table == 'meta_patch_totals' else width - 3
+            for start in range(0, len(params), width):
+                row = params[start:start + width]
+                values = row[key_width + 1:] if table == 'meta_patch_totals' else row[key_width:]
+                db._aggregates.append((table, tuple(row[:key_width]), tuple(values)))
+        else:
+            raise AssertionError(f"unexpected query: {sql}")
+
+
+def participant(match_id, puuid, placement, traits=(), units=()):
+    return ParticipantRow(match_id, puuid, placement, 8, 0, 30, 0, 100, tuple(traits), tuple(units))
+
+
+MATCHES = [
+    MatchRow('KR_1', datetime.datetime(2024, 1, 1), datetime.timedelta(minutes=30), '14.1', 1100, 10, 'TFTSet10'),
+    MatchRow('KR_2', datetime.datetime(2024, 1, 2), datetime.timedelta(minutes=30), '14.2', 1100, 10, 'TFTSet10'),
+]
+PARTICIPANTS = [
+    participant('KR_1', 'a', 1, [TraitRow('Mage', 3, 1, 1, 3)], [UnitRow('Ahri', 2, 4, ('Blue',))]),
+    participant('KR_1', 'b', 6, [TraitRow('Mage', 3, 1, 1, 3)], [UnitRow('Ahri', 1, 4, ())]),
+    participant('KR_2', 'c', 3, [], [UnitRow('Ahri', 2, 4, ('Blue', 'Blue'))]),
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDatabase()
+    monkeypatch.setattr(database, 'get_db_connection', db.connect)
+    monkeypatch.setattr(database, 'resolve_name_ids', lambda kind, names: {name: index for index, name in enumerate(sorted(set(names)), 1)})
+    monkeypatch.setattr(database, 'META_AGGREGATE_RETRY_DELAY', 0)
+    return db
+
+
+def test_aggregates_each_match_once(db):
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) == 2
+    # 유닛 / 아이템은 보드마다 한 번만 셉니다.
+    assert db.aggregates[('meta_unit_stats', ('14.1', 1))] == [2, 7, 1]
+    assert db.aggregates[('meta_item_stats', ('14.2', 1))] == [1, 3, 1]
+    assert db.aggregates[('meta_comp_stats', ('14.1', '1:1'))] == [2, 7, 1]
+    assert db.aggregates[('meta_patch_totals', ('14.1',))] == [1, 2]
+
+    snapshot = {key: list(values) for key, values in db.aggregates.items()}
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) == 0
+    assert db.aggregates == snapshot
+
+
+def test_retries_deadlock(db):
+    db.errors.append(mysql.connector.Error(msg='Deadlock found', errno=1213))
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) == 2
+    assert db.attempts == 2
+    # 실패한 시도의 반영 기록은 롤백되어 다시 시도할 때 두 매치 모두 집계됩니다.
+    assert db.aggregates[('meta_patch_totals', ('14.1',))] == [1, 2]
+    assert set(db.ledger) == {'KR_1', 'KR_2'}
+
+
+def test_gives_up_after_lock_wait_timeouts(db):
+    db.errors.extend(
+        mysql.connector.Error(msg='Lock wait timeout exceeded', errno=1205)
+        for _ in range(database.META_AGGREGATE_ATTEMPTS)
+    )
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) is None
+    assert db.attempts == database.META_AGGREGATE_ATTEMPTS
+    assert db.ledger == {}
+    assert db.aggregates == {}
+
+
+def test_other_errors_are_not_retried(db):
+    db.errors.append(mysql.connector.Error(msg="Table doesn't exist", errno=1146))
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) is None
+    assert db.attempts == 1
+
+
+def test_no_connection_is_failure(monkeypatch):
+    monkeypatch.setattr(database, 'get_db_connection', lambda timeout=None: None)
+    assert database.update_meta_aggregates(MATCHES, PARTICIPANTS) is None
+    assert database.update_meta_aggregates(MATCHES, []) == 0
+
+
+def test_skips_participants_without_match(db):
+    assert database.update_meta_aggregates(MATCHES[:1], PARTICIPANTS) == 1
+    assert set(db.ledger) == {'KR_1'}
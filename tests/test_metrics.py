@@ -0,0 +1,61 @@
+# tft/tests/test_metrics.py
+
+import app.app as web
+from app.services.metrics import MetricsRegistry
+
+
+def registry():
+    metrics = MetricsRegistry()
+    requests = metrics.counter('riot_requests_total', 'Riot API 요청 결과 수', ('host', 'status'))
+    latency = metrics.histogram('riot_request_seconds', '응답 시간', ('host',), buckets=(0.1, 1.0))
+    requests.inc('kr', '200', amount=3)
+    requests.inc('kr', '429')
+    for seconds in (0.05, 0.5, 5.0):
+        latency.observe(seconds, 'kr')
+    metrics.gauge_callback('rate_limit_remaining', '남은 요청 수', ('host',), lambda: [(('kr',), 17)])
+    return metrics
+
+
+def test_renders_prometheus_text():
+    lines = registry().render_prometheus().splitlines()
+    assert '# TYPE riot_requests_total counter' in lines
+    assert 'riot_requests_total{host="kr",status="200"} 3' in lines
+    assert 'riot_requests_total{host="kr",status="429"} 1' in lines
+    # 히스토그램 버킷은 누적 개수입니다.
+    assert 'riot_request_seconds_bucket{host="kr",le="0.1"} 1' in lines
+    assert 'riot_request_seconds_bucket{host="kr",le="1.0"} 2' in lines
+    assert 'riot_request_seconds_bucket{host="kr",le="+Inf"} 3' in lines
+    assert 'riot_request_seconds_count{host="kr"} 3' in lines
+    assert 'rate_limit_remaining{host="kr"} 17' in lines
+
+
+def test_escapes_label_values():
+    metrics = MetricsRegistry()
+    metrics.counter('errors_total', '오류 수', ('message',)).inc('say "hi"\\\n')
+    assert 'errors_total{message="say \\"hi\\"\\\\\\n"} 1' in metrics.render_prometheus().splitlines()
+
+
+def test_snapshot_summarizes_histograms():
+    snapshot = registry().snapshot()
+    assert snapshot['riot_requests_total'] == [
+        {'labels': {'host': 'kr', 'status': '200'}, 'value': 3},
+        {'labels': {'host': 'kr', 'status': '429'}, 'value': 1},
+    ]
+    [latency] = snapshot['riot_request_seconds']
+    assert latency['count'] == 3
+    assert abs(latency['mean'] - 5.55 / 3) < 1e-9
+    assert set(latency) >= {'p50', 'p90', 'p99'}
+
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(web, 'metrics', registry())
+    client = web.app.test_client()
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert 'riot_requests_total{host="kr",status="200"} 3' in response.get_data(as_text=True)
+
+    response = client.get('/metrics?format=json')
+    assert response.status_code == 200
+    assert response.get_json()['rate_limit_remaining'] == [{'labels': {'host': 'kr'}, 'value': 17}]
@@ -0,0 +1,79 @@
+# tft/tests/test_poll_schedule.py
+
+import pytest
+
+from app.data_collector import PollSchedule
+
+
+def summoners(*league_points):
+    return [{'puuid': f'p{lp}', 'leaguePoints': lp} for lp in league_points]
+
+
+def pop_all(schedule, now):
+    popped = []
+    while (item := schedule.pop_due(now)) is not None:
+        popped.append(item[0])
+    return popped
+
+
+def test_new_players_are_staggered_by_rank():
+    schedule = PollSchedule(interval=100, max_interval=1000)
+    assert schedule.update_league('kr', 'challenger', summoners(100, 300, 200, 400), now=0) == 4
+    # 1위는 바로, 나머지는 순위에 따라 interval 안에 나눠 조회합니다.
+    assert pop_all(schedule, 0) == ['p400']
+    assert pop_all(schedule, 25) == ['p300']
+    assert pop_all(schedule, 100) == ['p200', 'p100']
+    assert schedule.next_due() is None
+
+
+def test_same_due_time_pops_higher_lp_first():
+    schedule = PollSchedule(interval=100, max_interval=1000)
+    schedule.update_league('kr', 'challenger', summoners(100), now=0)
+    schedule.update_league('jp1', 'challenger', summoners(500), now=0)
+    assert pop_all(schedule, 0) == ['p500', 'p100']
+
+
+def test_popped_player_waits_for_reschedule():
+    schedule = PollSchedule(interval=100, max_interval=1000)
+    schedule.update_league('kr', 'challenger', summoners(100), now=0)
+    assert schedule.pop_due(0) == ('p100', 'kr')
+    assert schedule.pop_due(10_000) is None
+    schedule.reschedule('p100', 1, now=0)
+    assert schedule.next_due() == pytest.approx(100)
+
+
+def test_idle_players_back_off_until_max_interval():
+    schedule = PollSchedule(interval=100, max_interval=350)
+    schedule.update_league('kr', 'challenger', summoners(100), now=0)
+    schedule.pop_due(0)
+    dues = []
+    for _ in range(3):
+        schedule.reschedule('p100', 0, now=0)
+        dues.append(schedule.players['p100']['due'])
+        schedule.pop_due(dues[-1])
+    assert dues == [200, 350, 350]
+    # 새 매치가 나오면 기본 간격으로 돌아갑니다.
+    schedule.reschedule('p100', 2, now=0)
+    assert schedule.players['p100']['due'] == 100
+
+
+def test_lower_rank_polls_less_often():
+    schedule = PollSchedule(interval=100, max_interval=1000)
+    schedule.update_league('kr', 'challenger', summoners(200, 100), now=0)
+    pop_all(schedule, 100)
+    schedule.reschedule('p200', 1, now=0)
+    schedule.reschedule('p100', 1, now=0)
+    assert schedule.players['p200']['due'] == 100
+    assert schedule.players['p100']['due'] == 150
+
+
+def test_players_leaving_league_are_dropped():
+    schedule = PollSchedule(interval=100, max_interval=1000)
+    schedule.update_league('kr', 'challenger', summoners(300, 200), now=0)
+    schedule.update_league('kr', 'grandmaster', summoners(50), now=0)
+    assert schedule.update_league('kr', 'challenger', summoners(300), now=0) == 0
+    assert set(schedule.players) == {'p300', 'p50'}
+    assert pop_all(schedule, 1000) == ['p300', 'p50']
+    # 조회 중에 빠진 플레이어는 다시 예약하지 않습니다.
+    schedule.reschedule('p200', 1, now=0)
+    assert 'p200' not in schedule.players
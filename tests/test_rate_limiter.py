@@ -0,0 +1,126 @@
+# tft/tests/test_rate_limiter.py
+
+import time
+import asyncio
+
+import pytest
+
+from app.services.rate_limiter import RateWindow, RateLimiter, parse_rate_limit_header, WINDOW_MARGIN
+
+
+def test_parse_rate_limit_header():
+    assert parse_rate_limit_header('20:1,100:120') == [(20, 1), (100, 120)]
+    assert parse_rate_limit_header('') == []
+    assert parse_rate_limit_header(None) == []
+
+
+def test_window_delay_until_oldest_request_expires():
+    window = RateWindow(2, 10)
+    assert window.delay(0.0) == 0.0
+    window.record(0.0)
+    window.record(1.0)
+    # 한도가 찼으면 가장 오래된 요청이 창을 벗어날 때까지 기다립니다.
+    assert window.delay(2.0) == pytest.approx(8.0 + WINDOW_MARGIN)
+    assert window.remaining(2.0) == 0
+    # 창을 벗어난 기록은 지워지고 바로 보낼 수 있습니다.
+    assert window.delay(10.0 + WINDOW_MARGIN) == 0.0
+    assert window.remaining(10.0 + WINDOW_MARGIN) == 1
+
+
+def test_window_sync_count_only_raises_local_count():
+    window = RateWindow(5, 10)
+    window.record(0.0)
+    window.sync_count(4, 1.0)
+    assert len(window.timestamps) == 4
+    # 서버 값이 로컬 기록보다 적으면 그대로 둡니다.
+    window.sync_count(1, 1.0)
+    assert len(window.timestamps) == 4
+
+
+def _known_limiter(app_rate_limit):
+    # 메서드 한도를 미리 알려 probe 없이 앱 한도만으로 동작하게 합니다.
+    limiter = RateLimiter(app_rate_limit)
+    limiter.update('kr', 'league', {'X-Method-Rate-Limit': '1000:1'})
+    return limiter
+
+
+def test_acquire_paces_requests_to_app_limit():
+    limiter = _known_limiter('2:1')
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire('kr', 'league')
+        return time.monotonic() - started
+
+    # 세 번째 요청은 1초 창이 비워질 때까지 기다려야 합니다.
+    assert asyncio.run(run()) >= 1.0
+
+
+def test_update_syncs_server_counts():
+    limiter = RateLimiter('10:1')
+    limiter.update('kr', 'league', {
+        'X-App-Rate-Limit': '10:1',
+        'X-App-Rate-Limit-Count': '10:1',
+        'X-Method-Rate-Limit': '1000:1',
+    })
+    now = time.monotonic()
+    assert limiter.app_windows['kr'][0].delay(now) > 0
+
+
+def test_penalize_blocks_host_or_method():
+    limiter = RateLimiter('100:1')
+    limiter.penalize('kr', 'league', 5, 'application')
+    limiter.penalize('kr', 'match', 3)
+    assert limiter.blocked_until['kr'] > time.monotonic() + 4
+    assert limiter.blocked_until[('kr', 'match')] > time.monotonic() + 2
+    assert ('kr', 'league') not in limiter.blocked_until
+
+
+def test_unknown_method_sends_one_probe_until_release():
+    limiter = RateLimiter('100:1')
+
+    async def run():
+        await limiter.acquire('kr', 'league')
+        waiter = asyncio.create_task(limiter.acquire('kr', 'league'))
+        await asyncio.sleep(0.05)
+        blocked = not waiter.done()
+        limiter.release('kr', 'league')
+        await asyncio.wait_for(waiter, 1)
+        return blocked
+
+    assert asyncio.run(run())
+
+
+def test_probe_times_out_and_hands_over():
+    limiter = RateLimiter('100:1', probe_timeout=0.05)
+
+    async def run():
+        await limiter.acquire('kr', 'league')
+        first_probe = limiter.method_probes[('kr', 'league')]
+        # 첫 요청이 release 없이 사라져도 다음 요청이 probe를 넘겨받습니다.
+        await asyncio.wait_for(limiter.acquire('kr', 'league'), 1)
+        return first_probe, limiter.method_probes[('kr', 'league')]
+
+    first_probe, second_probe = asyncio.run(run())
+    assert first_probe.is_set()
+    assert second_probe is not first_probe
+
+
+def test_slot_releases_probe_on_cancel():
+    limiter = RateLimiter('100:1')
+
+    async def hold():
+        async with limiter.slot('kr', 'league'):
+            await asyncio.sleep(10)
+
+    async def run():
+        task = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.wait_for(limiter.acquire('kr', 'league'), 1)
+
+    asyncio.run(run())
+    assert ('kr', 'league') in limiter.method_windows
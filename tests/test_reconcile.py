@@ -0,0 +1,94 @@
+# tft/tests/test_reconcile.py
+
+import mysql.connector
+import pytest
+
+from app.services import export, db_services
+
+
+class FakeConnection:
+    """
+    LOAD DATA 연결 대역. 실행한 쿼리와 commit / rollback 여부를 기록합니다.
+    """
+
+    def __init__(self, existing_keys, load_error=None):
+        self.existing_keys = existing_keys
+        self.load_error = load_error
+        self.queries = []
+        self.committed = False
+        self.rolled_back = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = 0
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+    def execute(self, sql, params=()):
+        self.conn.queries.append((sql.split()[0].lower(), params))
+        if sql.startswith('select'):
+            self.rows = list(self.conn.existing_keys)
+        elif sql.startswith('LOAD DATA'):
+            if self.conn.load_error:
+                raise self.conn.load_error
+            with open(params[0], encoding='utf-8') as f:
+                self.rowcount = len(f.readlines())
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    connections = []
+
+    def connect_with(existing_keys, load_error=None):
+        conn = FakeConnection(existing_keys, load_error)
+        monkeypatch.setattr(export, 'get_bulk_load_connection', lambda: connections.append(conn) or conn)
+        return conn
+
+    connect_with.connections = connections
+    return connect_with
+
+
+def reconcile(rows):
+    return db_services._reconcile(
+        'challenger_users', ['puuid'], {(puuid,) for puuid, _ in rows}, ['puuid', 'leaguePoints'], iter(rows), 'REPLACE')
+
+
+def test_deletes_and_loads_in_one_transaction(connect):
+    conn = connect([('a',), ('gone',)])
+    assert reconcile([('a', 1000), ('b', 900)]) == 2
+    assert connect.connections == [conn]
+    assert [kind for kind, _ in conn.queries] == ['select', 'delete', 'load']
+    assert conn.queries[1][1] == ['gone']
+    assert conn.committed and conn.closed
+
+
+def test_failed_load_rolls_back_delete(connect):
+    conn = connect([('a',), ('gone',)], load_error=mysql.connector.Error(msg='Loading local data is disabled'))
+    assert reconcile([('a', 1000)]) == 0
+    assert [kind for kind, _ in conn.queries] == ['select', 'delete', 'load']
+    assert conn.rolled_back and not conn.committed
+
+
+def test_no_connection_deletes_nothing(monkeypatch):
+    monkeypatch.setattr(export, 'get_bulk_load_connection', lambda: None)
+    assert reconcile([('a', 1000)]) == 0
@@ -0,0 +1,31 @@
+# tft/tests/test_regions.py
+
+import pytest
+
+from app.services.regions import platform_of_match, region_of, account_region_of
+
+
+@pytest.mark.parametrize('match_id, platform', [
+    ('KR_7312345678', 'kr'),
+    ('JP1_412345678', 'jp1'),
+    ('EUW1_6912345678', 'euw1'),
+    ('na1_5012345678', 'na1'),
+])
+def test_platform_of_match(match_id, platform):
+    assert platform_of_match(match_id) == platform
+
+
+def test_match_platform_routes_to_region():
+    assert region_of(platform_of_match('KR_1')) == 'asia'
+    assert region_of(platform_of_match('EUW1_1')) == 'europe'
+    assert region_of(platform_of_match('OC1_1')) == 'sea'
+
+
+def test_account_region_sends_sea_to_asia():
+    assert account_region_of('oc1') == 'asia'
+    assert account_region_of('NA1') == 'americas'
+
+
+def test_unknown_platform():
+    with pytest.raises(ValueError):
+        region_of(platform_of_match('XX9_1'))
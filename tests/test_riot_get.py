@@ -0,0 +1,150 @@
+# tft/tests/test_riot_get.py
+
+import json
+import asyncio
+import datetime
+from email.utils import format_datetime
+
+import pytest
+
+from app.services import riot_api
+from app.services.rate_limiter import RateLimiter
+from app.services.circuit_breaker import CircuitBreakers
+
+URL = 'https://kr.api.riotgames.com/tft/league/v1/challenger'
+METHOD = 'league-v1.getChallengerLeague'
+
+
+class FakeResponse:
+    def __init__(self, status, body=b'{"ok": true}', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self, content_type=None, loads=json.loads):
+        return loads(self.body)
+
+    async def read(self):
+        return self.body
+
+
+class FailingRequest:
+    def __init__(self, error):
+        self.error = error
+
+    async def __aenter__(self):
+        raise self.error
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """
+    get이 불릴 때마다 준비된 응답(또는 예외)을 차례로 돌려줍니다. 마지막 항목은 계속 반복합니다.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None):
+        self.calls += 1
+        item = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return FailingRequest(item) if isinstance(item, BaseException) else item
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    limiter = RateLimiter('1000:1')
+    penalties = []
+    penalize = limiter.penalize
+    limiter.penalize = lambda *args: penalties.append(args) or penalize(*args)
+    limiter.penalties = penalties
+    monkeypatch.setattr(riot_api, 'rate_limiter', limiter)
+    monkeypatch.setattr(riot_api, 'circuit_breakers', CircuitBreakers())
+    backoffs = []
+    monkeypatch.setattr(riot_api, 'backoff_delay', lambda attempt: backoffs.append(attempt) or 0)
+    return backoffs
+
+
+def get(session, **kwargs):
+    return asyncio.run(riot_api.riot_get(session, URL, METHOD, **kwargs))
+
+
+def test_returns_decoded_or_raw_body(backoffs):
+    assert get(FakeSession(FakeResponse(200))).data == {'ok': True}
+    assert get(FakeSession(FakeResponse(200)), raw=True).data == b'{"ok": true}'
+    assert backoffs == []
+
+
+def test_rate_limited_waits_retry_after_and_penalizes(backoffs):
+    session = FakeSession(
+        FakeResponse(429, headers={'Retry-After': '0', 'X-Rate-Limit-Type': 'method'}),
+        FakeResponse(200),
+    )
+    result = get(session)
+    assert result.ok
+    assert session.calls == 2
+    assert riot_api.rate_limiter.penalties == [('kr', METHOD, 0.0, 'method')]
+    # 429는 지수 백오프나 회로 차단기 실패로 세지 않습니다.
+    assert backoffs == []
+    assert riot_api.circuit_breakers.for_host('kr').failures == 0
+
+
+def test_gives_up_after_rate_limited_retries(backoffs, monkeypatch):
+    monkeypatch.setattr(riot_api, 'MAX_RATE_LIMITED_RETRIES', 2)
+    session = FakeSession(FakeResponse(429, headers={'Retry-After': '0'}))
+    result = get(session)
+    assert (result.status, result.error) == (429, 'rate limited')
+    assert session.calls == 3
+
+
+def test_retries_server_errors_with_backoff(backoffs):
+    session = FakeSession(FakeResponse(503), FakeResponse(200))
+    assert get(session).ok
+    assert session.calls == 2
+    assert backoffs == [1]
+
+
+@pytest.mark.parametrize('response, status, error', [
+    (FakeResponse(500), 500, 'HTTP 500'),
+    (asyncio.TimeoutError(), None, 'TimeoutError'),
+])
+def test_gives_up_after_max_attempts(backoffs, response, status, error):
+    session = FakeSession(response)
+    result = get(session)
+    assert result.status == status
+    assert result.error.startswith(error)
+    assert session.calls == riot_api.MAX_ATTEMPTS
+    assert backoffs == list(range(1, riot_api.MAX_ATTEMPTS))
+
+
+def test_client_errors_are_not_retried(backoffs):
+    session = FakeSession(FakeResponse(404, b'{"status": "not found"}'))
+    result = get(session)
+    assert (result.status, result.data, result.error) == (404, {'status': 'not found'}, 'HTTP 404')
+    assert session.calls == 1
+
+
+def test_fetch_helpers_return_none_on_failure(backoffs):
+    session = FakeSession(asyncio.TimeoutError())
+    assert asyncio.run(riot_api.fetch_match_detail(session, 'KR_1')) is None
+    assert asyncio.run(riot_api.fetch_match_detail_raw(session, 'KR_1')) is None
+
+
+def test_parse_retry_after():
+    assert riot_api.parse_retry_after('3') == 3.0
+    assert riot_api.parse_retry_after('-1') == 0.0
+    # HTTP 날짜 형식은 지금부터 그 시각까지의 시간으로 바꿉니다.
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert 25 <= riot_api.parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert riot_api.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert riot_api.parse_retry_after('soon') == riot_api.RETRY_AFTER_DEFAULT
+    assert riot_api.parse_retry_after(None) == riot_api.RETRY_AFTER_DEFAULT
@@ -0,0 +1,142 @@
+# tft/tests/test_save_matches.py
+
+import json
+import asyncio
+
+import pytest
+
+from app import data_collector
+from app.services import database
+from app.services.match_parser import parse_match_detail
+from app.benchmark.mock_riot import MockConfig, synthesize_match
+
+MATCH_IDS = ['KR_7000000001', 'KR_7000000002']
+
+
+class FakeTables:
+    """
+    insert_in_batches 대신 label별로 행을 모아 두는 저장소. failing에 있는 label은 한 행도 저장하지 않습니다.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.order = []
+        self.failing = set()
+        self.aggregate_fails = False
+        self.aggregated = []
+
+    def insert_in_batches(self, head, tail, rows, batch_size, label):
+        rows = list(rows)
+        self.order.append(label)
+        if label in self.failing:
+            return 0
+        self.rows.setdefault(label, []).extend(rows)
+        return len(rows)
+
+    def update_meta_aggregates(self, match_details, participant_details, batch_size):
+        self.order.append('meta aggregates')
+        if self.aggregate_fails:
+            return None
+        self.aggregated.append({p.match_id for p in participant_details})
+        return len({p.match_id for p in participant_details})
+
+    def known_match_ids(self, match_ids=None):
+        known = {row[0] for row in self.rows.get('match details', [])}
+        return known if match_ids is None else known & set(match_ids)
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    tables = FakeTables()
+    monkeypatch.setattr(database, 'insert_in_batches', tables.insert_in_batches)
+    monkeypatch.setattr(database, 'update_meta_aggregates', tables.update_meta_aggregates)
+    monkeypatch.setattr(database, 'resolve_name_ids', lambda kind, names: {name: 1 for name in names})
+    monkeypatch.setattr(database, 'bump_cache_generation', lambda name: None)
+    return tables
+
+
+def body(match_id):
+    return json.dumps(synthesize_match(match_id, MockConfig(players_per_match=2))).encode()
+
+
+def parsed_matches():
+    rows = [parse_match_detail(match_id, json.loads(body(match_id))) for match_id in MATCH_IDS]
+    return [match for match, _ in rows], [p for _, participants in rows for p in participants]
+
+
+def test_saves_match_row_last(tables):
+    matches, participants = parsed_matches()
+    assert database.save_matches_to_db(matches, participants) == 2
+    assert tables.order == [
+        'participant details', 'participant traits', 'participant units', 'unit items', 'meta aggregates', 'match details',
+    ]
+
+
+@pytest.mark.parametrize('failing', ['participant details', 'participant units', 'unit items'])
+def test_failed_rows_leave_match_unknown(tables, failing):
+    tables.failing.add(failing)
+    matches, participants = parsed_matches()
+    assert database.save_matches_to_db(matches, participants) == 0
+    assert tables.aggregated == []
+    assert tables.known_match_ids() == set()
+
+
+def test_failed_aggregates_leave_match_unknown(tables):
+    tables.aggregate_fails = True
+    matches, participants = parsed_matches()
+    assert database.save_matches_to_db(matches, participants) == 0
+    assert tables.known_match_ids() == set()
+
+
+def test_failed_participant_save_is_fetched_again(tables, monkeypatch):
+    fetched = []
+
+    async def fetch_match_detail_raw(session, match_id):
+        fetched.append(match_id)
+        return body(match_id)
+
+    monkeypatch.setattr(data_collector, 'fetch_match_detail_raw', fetch_match_detail_raw)
+    monkeypatch.setattr(data_collector, 'fetch_known_match_ids', tables.known_match_ids)
+
+    tables.failing.add('participant details')
+    asyncio.run(data_collector.collect_challenger_match_details(MATCH_IDS, parse_workers=0))
+    assert tables.known_match_ids() == set()
+
+    # 다음 실행에서는 저장되지 않은 매치를 다시 받아 저장합니다.
+    tables.failing.clear()
+    asyncio.run(data_collector.collect_challenger_match_details(MATCH_IDS, parse_workers=0))
+    assert sorted(fetched) == sorted(MATCH_IDS * 2)
+    assert tables.known_match_ids() == set(MATCH_IDS)
+
+    # 모두 저장된 매치는 더 받지 않습니다.
+    asyncio.run(data_collector.collect_challenger_match_details(MATCH_IDS, parse_workers=0))
+    assert len(fetched) == 4
+
+
+def test_writer_reports_failed_flush(tables):
+    matches, participants = parsed_matches()
+    tables.failing.add('participant details')
+    flushes = []
+
+    async def run():
+        queue = asyncio.Queue()
+        writer = asyncio.create_task(data_collector._match_writer(
+            queue, batch_size=10, on_flush=lambda m, p, ok: flushes.append((len(m), len(p), ok))))
+        for match in matches:
+            await queue.put((match, [p for p in participants if p.match_id == match.match_id], b''))
+        await queue.put(None)
+        return await writer
+
+    assert asyncio.run(run()) == 0
+    assert flushes == [(2, len(participants), False)]
+
+
+def test_participant_json_matches_response(tables):
+    matches, participants = parsed_matches()
+    database.save_matches_to_db(matches, participants)
+    response = json.loads(body(MATCH_IDS[0]))['info']['participants'][0]
+    row = tables.rows['participant details'][0]
+    assert row[:2] == (MATCH_IDS[0], response['puuid'])
+    assert json.loads(row[8]) == response['traits']
+    # 유닛의 name은 응답에서 항상 빈 문자열이므로 저장하지 않습니다.
+    assert json.loads(row[9]) == [{key: value for key, value in unit.items() if key != 'name'} for unit in response['units']]
@@ -0,0 +1,41 @@
+# tft/tests/test_stats.py
+
+import pandas as pd
+import pytest
+
+from app.services.stats import aggregate_placements, _comp_name
+
+
+def counts(rows):
+    return pd.DataFrame(rows, columns=['unit_id', 'play_count', 'placement_sum', 'top4_count'])
+
+
+def test_rates_from_summed_counts():
+    stats = aggregate_placements(counts([(1, 4, 10, 3), (2, 2, 12, 0)]), ['unit_id'], total_boards=8)
+    assert stats['unit_id'].tolist() == [1, 2]
+    assert stats['avg_placement'].tolist() == [2.5, 6.0]
+    assert stats['top4_rate'].tolist() == [0.75, 0.0]
+    assert stats['pick_rate'].tolist() == [0.5, 0.25]
+
+
+def test_sorts_by_avg_placement_then_play_count():
+    stats = aggregate_placements(counts([(1, 2, 8, 1), (2, 4, 16, 2), (3, 1, 1, 1)]), ['unit_id'], total_boards=10)
+    assert stats['unit_id'].tolist() == [3, 2, 1]
+
+
+def test_filters_by_min_play_count():
+    stats = aggregate_placements(counts([(1, 4, 10, 3), (2, 2, 12, 0)]), ['unit_id'], total_boards=8, min_play_count=3)
+    assert stats['unit_id'].tolist() == [1]
+
+
+def test_empty_and_no_boards():
+    empty = aggregate_placements(counts([]), ['unit_id'], total_boards=0)
+    assert empty.empty
+    assert list(empty.columns) == ['unit_id', 'play_count', 'avg_placement', 'top4_rate', 'pick_rate']
+    stats = aggregate_placements(counts([(1, 1, 1, 1)]), ['unit_id'], total_boards=0)
+    assert stats['pick_rate'].tolist() == [0.0]
+
+
+def test_comp_name():
+    assert _comp_name('3:1,7:2', {3: 'Mage', 7: 'Bruiser'}) == 'Mage 1, Bruiser 2'
+    assert _comp_name('9:1', {}) == '9 1'